@@ -0,0 +1,963 @@
+import argparse
+import concurrent.futures
+import csv
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+import main as gameEngine
+
+# Batch analyses of the solver.
+#
+#   python analysis.py openers --top 20 --sort entropy
+#   python analysis.py openers --word crane
+#   python analysis.py sweep --top 100 --rank-by entropy --plot sweep.png
+#   python analysis.py exact --opener salet --breadth 50
+#   python analysis.py tournament --strategy medium --strategy hard --strategy expert
+#   python analysis.py blimp --max-size 8 15 25 --pair-fraction 0.25 0.5 --plot blimp.png
+#   python analysis.py montecarlo --games 1000000 --random-opener
+#
+# Results are cached under CACHE_DIR in files keyed to a hash of the word lists,
+# so they are computed once per pair of lists and reused by the notebook and CLI.
+
+CACHE_DIR = "analysis_cache"
+OPENER_COLUMNS = ["word", "expected_remaining", "largest_bucket", "entropy", "is_answer"]
+OPENER_SORT_KEYS = {   # column -> True if larger is better
+    "expected_remaining": False,
+    "largest_bucket": False,
+    "entropy": True,
+}
+OPENER_CHUNK = 1024   # guesses per worker task
+SWEEP_COLUMNS = ["opener", "avg_steps", "dnf", "steps_1", "steps_2", "steps_3", "steps_4", "steps_5", "steps_6", "dnf_words"]
+SWEEP_SORT_KEYS = ["avg_steps", "dnf", "worst"]
+_FOLLOW_UP_CACHE_MAX = 100_000   # candidate sets remembered per worker process before the memo is cleared
+_UNSOLVABLE = 10 ** 9   # cost of a state that cannot be solved in the guesses left
+BLIMP_SWEEP_GRID = {"max_size": [8, 15, 25], "fixed_positions": [1, 2, 3], "unshared_letters": [1, 2],
+                    "pair_fraction": [0.25, 0.5, 1.0]}
+BLIMP_SWEEP_COLUMNS = list(gameEngine.BLIMP_DEFAULTS) + ["avg_steps", "dnf", "blimp_moves", "ms_per_game", "wall_seconds"]
+TOURNAMENT_CHUNKS_PER_WORKER = 4   # answer chunks per worker and strategy, so slow strategies spread out
+
+
+def _cache_path(name, answers, guesses, extension="csv"):
+    key = f"{gameEngine.word_list_hash(answers)}-{gameEngine.word_list_hash(guesses)}"
+    return os.path.join(CACHE_DIR, f"{name}-{key}.{extension}")
+
+def _score_openers(guesses, answers, word_length):
+    """Worker: expected remaining answers, largest bucket and entropy of each guess as an opener."""
+    np = gameEngine.np
+    patterns = gameEngine.feedback_code_matrix(guesses, answers, word_length)
+    pattern_count = 3 ** word_length
+    block = patterns.astype(np.int64) + np.arange(len(guesses), dtype=np.int64)[:, None] * pattern_count
+    counts = np.bincount(block.ravel(), minlength=len(guesses) * pattern_count).reshape(len(guesses), pattern_count)
+    n = len(answers)
+    sizes = np.arange(n + 1, dtype=np.float64)
+    expected = (counts.astype(np.float64) ** 2).sum(axis=1) / n
+    entropy = np.log2(n) - (sizes * np.log2(np.maximum(sizes, 1)))[counts].sum(axis=1) / n
+    return list(zip(guesses, expected.tolist(), counts.max(axis=1).tolist(), entropy.tolist()))
+
+def _score_openers_python(guesses, answers, word_length):   #same scores without numpy
+    rows = []
+    n = len(answers)
+    for guess in guesses:
+        bucket_sizes = {}
+        for answer in answers:
+            code = gameEngine.get_feedback_code(guess, answer)
+            bucket_sizes[code] = bucket_sizes.get(code, 0) + 1
+        sizes = bucket_sizes.values()
+        rows.append((guess, sum(size * size for size in sizes) / n, max(sizes),
+                     -sum(size / n * math.log2(size / n) for size in sizes)))
+    return rows
+
+def rank_openers(sort="expected_remaining", workers=None, refresh=False, answers=None, guesses=None):
+    """
+    Scores every allowed guess (wordsAllowed plus words.txt) as the first guess: expected
+    remaining answers, largest bucket and entropy. The table is computed in parallel and
+    vectorized, cached on disk for these word lists, and returned as a list of dicts
+    sorted by `sort`.
+    """
+    if sort not in OPENER_SORT_KEYS:
+        raise ValueError(f"'sort' must be one of: {', '.join(OPENER_SORT_KEYS)}.")
+    answers = list(gameEngine.GLOBAL_PERMANENT_ANSWERS if answers is None else answers)
+    guesses = list(gameEngine.get_guess_index().words if guesses is None else guesses)
+    path = _cache_path("openers", answers, guesses)
+
+    if refresh or not os.path.exists(path):
+        word_length = gameEngine.get_word_length(answers)
+        score = _score_openers if gameEngine.NUMPY_AVAILABLE else _score_openers_python
+        chunks = [guesses[i:i + OPENER_CHUNK] for i in range(0, len(guesses), OPENER_CHUNK)]
+        workers = workers or os.cpu_count() or 1
+        if workers > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(score, chunks, [answers] * len(chunks), [word_length] * len(chunks))
+                scored = [row for rows in results for row in rows]
+        else:
+            scored = [row for chunk in chunks for row in score(chunk, answers, word_length)]
+        answer_set = set(answers)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(OPENER_COLUMNS)
+            for word, expected, largest, entropy in scored:
+                writer.writerow([word, f"{expected:.4f}", largest, f"{entropy:.4f}", int(word in answer_set)])
+        os.replace(temp_path, path)
+
+    with open(path, "r", newline="") as f:
+        table = [{"word": row["word"], "expected_remaining": float(row["expected_remaining"]),
+                  "largest_bucket": int(row["largest_bucket"]), "entropy": float(row["entropy"]),
+                  "is_answer": row["is_answer"] == "1"} for row in csv.DictReader(f)]
+    larger_is_better = OPENER_SORT_KEYS[sort]
+    table.sort(key=lambda row: (-row[sort] if larger_is_better else row[sort], row["word"]))
+    for rank, row in enumerate(table, 1):
+        row["rank"] = rank
+    return table
+
+def best_opener(sort="expected_remaining"):
+    return rank_openers(sort)[0]["word"]
+
+_follow_up_guesses = {}   # (index, strategy, candidate bits) -> guess, shared by every opener a worker plays
+_follow_up_params = None  # the isBlimp thresholds _follow_up_guesses was filled under
+
+def _sync_follow_up_params():   #drops the memo once gameEngine.set_blimp_params() has changed the thresholds
+    global _follow_up_params
+    if _follow_up_params != gameEngine.BLIMP_PARAMS:
+        _follow_up_guesses.clear()
+        _follow_up_params = dict(gameEngine.BLIMP_PARAMS)
+
+def _follow_up_guess(index, bits, strategy):
+    key = (index, strategy, bits)   # bits are word ids of index, so sweeps of other answer lists never share a pick
+    guess = _follow_up_guesses.get(key)
+    if guess is None:
+        if len(_follow_up_guesses) >= _FOLLOW_UP_CACHE_MAX:
+            _follow_up_guesses.clear()
+        candidates = gameEngine.CandidateSet(index, bits)
+        if strategy == "hard" and gameEngine.NUMPY_AVAILABLE and gameEngine.isBlimp(candidates):
+            table = gameEngine.get_pattern_table(index)   # same pick as blimpSearch, vectorized
+            guess = table.guess_index.words[gameEngine.blimp_search_choice(table, list(candidates.ids()))]
+        else:
+            guess = gameEngine.HELPER_STRATEGIES[strategy](candidates)[0]
+        _follow_up_guesses[key] = guess
+    return guess
+
+def _sweep_opener(opener, answers, strategy, costs=None, blimp_params=None):
+    """
+    Worker: steps to solve every answer after `opener`, the same games as the Mode 5 simulation.
+    The games are played as one tree: answers that get the same feedback share the next guess,
+    which is picked once per candidate set and reused by later openers reaching the same set.
+    If a `costs` dict is given, it adds up the moves, blimp moves and pick seconds of all games
+    (a pick shared by n games counts n times). blimp_params are the isBlimp thresholds to
+    play under, for worker processes that do not inherit the parent's.
+    """
+    if blimp_params is not None and blimp_params != gameEngine.BLIMP_PARAMS:
+        gameEngine.set_blimp_params(**blimp_params)
+    _sync_follow_up_params()
+    index = gameEngine.get_word_index(answers)
+    if strategy == "hard" and gameEngine.NUMPY_AVAILABLE:
+        gameEngine.get_pattern_table(index).precompute()   # built once per worker process, then every blimp pick is a lookup
+    steps = {}
+    nodes = [(opener, index.all_bits, 1)]
+    while nodes:
+        guess, bits, depth = nodes.pop()
+        buckets = {}
+        for answer_id in index.ids(bits):
+            answer = index.words[answer_id]
+            if answer == guess:
+                steps[answer] = depth
+            elif depth == 6:
+                steps[answer] = 7   # DNF
+            else:
+                code = gameEngine.get_feedback_code(guess, answer)
+                buckets[code] = buckets.get(code, 0) | (1 << answer_id)
+        for bucket_bits in buckets.values():
+            pick_start = time.perf_counter()
+            guess = _follow_up_guess(index, bucket_bits, strategy)
+            if costs is not None:
+                games = bucket_bits.bit_count()
+                costs["moves"] += games
+                costs["pick_seconds"] += games * (time.perf_counter() - pick_start)
+                costs["blimp_moves"] += games * gameEngine.isBlimp(gameEngine.CandidateSet(index, bucket_bits))
+            nodes.append((guess, bucket_bits, depth + 1))
+    counts = [0] * 8
+    for step in steps.values():
+        counts[step] += 1
+    solved = len(answers) - counts[7]
+    return {"opener": opener,
+            "avg_steps": sum(step for step in steps.values() if step <= 6) / solved if solved else 0.0,
+            "dnf": counts[7], **{f"steps_{i}": counts[i] for i in range(1, 7)},
+            "dnf_words": " ".join(sorted(word for word, step in steps.items() if step == 7))}
+
+def _open_results(path, columns):
+    """
+    Opens a results CSV for appending rows one at a time: a new file gets the header, and a
+    last line cut off by an interrupted run is ended so the next row starts on its own line.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+    cut_off = False
+    if not is_new:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            cut_off = f.read(1) != b"\n"
+    f = open(path, "a", newline="")
+    writer = csv.DictWriter(f, columns)
+    if is_new:
+        writer.writeheader()
+    elif cut_off:
+        f.write("\n")
+    return f, writer
+
+def _read_sweep(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", newline="") as f:
+        rows = {}
+        for row in csv.DictReader(f):
+            try:
+                row["avg_steps"] = float(row["avg_steps"])
+                for column in SWEEP_COLUMNS[2:-1]:
+                    row[column] = int(row[column])
+            except (TypeError, ValueError):   # a row cut off by an interrupted sweep, simulated again
+                continue
+            rows[row["opener"]] = row
+        return rows
+
+def sweep_openers(top=50, rank_by="expected_remaining", strategy="hard", workers=None, openers=None, answers=None):
+    """
+    Runs the full Mode 5 evaluation (average steps, DNFs, distribution) for the `top` openers
+    of rank_openers(rank_by), or for the given `openers`, across all cores. Each finished opener
+    is appended to a CSV under CACHE_DIR right away, so an interrupted sweep resumes where it
+    stopped. Returns the rows of the requested openers, in sweep order.
+    """
+    if strategy not in gameEngine.HELPER_STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}'. Use one of: {', '.join(gameEngine.HELPER_STRATEGIES)}.")
+    answers = list(gameEngine.GLOBAL_PERMANENT_ANSWERS if answers is None else answers)
+    guesses = gameEngine.get_guess_index().words
+    if openers is None:
+        openers = [row["word"] for row in rank_openers(rank_by, workers, answers=answers)[:top]]
+    # results under non-default isBlimp thresholds go to a file of their own
+    blimp_tag = "".join(f"-{name}{value:g}" for name, value in gameEngine.BLIMP_PARAMS.items()
+                        if value != gameEngine.BLIMP_DEFAULTS[name])
+    path = _cache_path(f"sweep-{strategy}{blimp_tag}", answers, guesses)
+    done = _read_sweep(path)
+    todo = [opener for opener in dict.fromkeys(openers) if opener not in done]
+    print(f"Opener sweep ({strategy}): {len(openers) - len(todo)} cached, {len(todo)} to simulate -> {path}")
+
+    if todo:
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        start = time.perf_counter()
+        f, writer = _open_results(path, SWEEP_COLUMNS)
+        with f:
+            def record(row):
+                writer.writerow({**row, "avg_steps": f"{row['avg_steps']:.4f}"})
+                f.flush()
+                done[row["opener"]] = row
+                if len(done) % 10 == 0 or len(todo) <= 10:
+                    print(f"... {row['opener']}: {row['avg_steps']:.4f} avg, {row['dnf']} DNF "
+                          f"({time.perf_counter() - start:.0f} s)")
+            if workers > 1:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(_sweep_opener, opener, answers, strategy, None, dict(gameEngine.BLIMP_PARAMS))
+                               for opener in todo]
+                    for future in concurrent.futures.as_completed(futures):
+                        record(future.result())
+            else:
+                for opener in todo:
+                    record(_sweep_opener(opener, answers, strategy))
+    return [done[opener] for opener in dict.fromkeys(openers)]
+
+def sort_sweep(rows, sort="avg_steps"):
+    """Best first: lowest average steps, fewest DNFs, or fewest games needing 5+ guesses ('worst')."""
+    if sort not in SWEEP_SORT_KEYS:
+        raise ValueError(f"'sort' must be one of: {', '.join(SWEEP_SORT_KEYS)}.")
+    keys = {"avg_steps": lambda row: (row["avg_steps"], row["dnf"]),
+            "dnf": lambda row: (row["dnf"], row["avg_steps"]),
+            "worst": lambda row: (row["dnf"], row["steps_6"], row["steps_5"], row["avg_steps"])}
+    return sorted(rows, key=lambda row: (keys[sort](row), row["opener"]))
+
+def print_sweep_table(rows):
+    print(f"{'opener':8}{'avg':>8}{'DNF':>5}" + "".join(f"{i:>6}" for i in range(1, 7)))
+    for row in rows:
+        print(f"{row['opener']:8}{row['avg_steps']:>8.4f}{row['dnf']:>5}"
+              + "".join(f"{row[f'steps_{i}']:>6}" for i in range(1, 7)))
+
+def plot_sweep(rows, path=None):
+    """Overlays the steps-to-solve distributions of the given sweep rows (one line per opener)."""
+    try:
+        import matplotlib
+        if path:
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not found, no chart drawn.")
+        return
+    labels = [str(i) for i in range(1, 7)] + ["DNF"]
+    plt.figure(figsize=(10, 6))
+    for row in rows:
+        counts = [row[f"steps_{i}"] for i in range(1, 7)] + [row["dnf"]]
+        plt.plot(range(1, 8), counts, marker="o", alpha=0.8, label=f"{row['opener']} ({row['avg_steps']:.3f})")
+    plt.title("Steps to Solve by Opener")
+    plt.xlabel("Steps to Solve")
+    plt.ylabel("Number of Games")
+    plt.xticks(range(1, 8), labels)
+    plt.grid(axis="y", linestyle="--", alpha=0.7)
+    plt.legend(fontsize="small", ncol=2)
+    if path:
+        plt.savefig(path, bbox_inches="tight")
+        print(f"Chart written to {path}")
+    else:
+        plt.show()
+
+def _blimp_setting_key(params):
+    return tuple(float(params[name]) for name in gameEngine.BLIMP_DEFAULTS)
+
+def _sweep_blimp_setting(params, opener, answers):
+    """Worker: one full Hard-strategy simulation under the given isBlimp thresholds."""
+    gameEngine.set_blimp_params(**params)
+    index = gameEngine.get_word_index(answers)
+    if gameEngine.NUMPY_AVAILABLE:
+        gameEngine.get_pattern_table(index).precompute()   # one-time build per worker, not part of the timing
+    costs = {"moves": 0, "blimp_moves": 0, "pick_seconds": 0.0}
+    start = time.perf_counter()
+    row = _sweep_opener(opener, answers, "hard", costs)
+    return {**params, "avg_steps": row["avg_steps"], "dnf": row["dnf"], "blimp_moves": costs["blimp_moves"],
+            "ms_per_game": costs["pick_seconds"] / len(answers) * 1000, "wall_seconds": time.perf_counter() - start}
+
+def _read_blimp_sweep(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", newline="") as f:
+        rows = {}
+        for row in csv.DictReader(f):
+            try:
+                row = {column: float(row[column]) for column in BLIMP_SWEEP_COLUMNS}
+            except (TypeError, ValueError):   # cut off by an interrupted sweep
+                continue
+            for column in ("min_size", "max_size", "fixed_positions", "unshared_letters", "dnf", "blimp_moves"):
+                row[column] = int(row[column])
+            rows[_blimp_setting_key(row)] = row
+        return rows
+
+def sweep_blimp(grid=None, opener=None, workers=None, answers=None):
+    """
+    Runs the Hard strategy over every answer for each combination of isBlimp thresholds in
+    `grid` (parameter -> values; missing parameters keep their defaults), across all cores.
+    Each row has the average steps, DNFs, blimp moves, pick time per game (ms, the latency
+    the helper adds over a game) and the wall-clock seconds of the simulation, and is appended
+    to a CSV under CACHE_DIR as it finishes, so a sweep resumes where it stopped. Rows on the
+    speed/quality Pareto front get "pareto": True.
+    """
+    grid = {**BLIMP_SWEEP_GRID, **(grid or {})}
+    unknown = set(grid) - set(gameEngine.BLIMP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown isBlimp parameter '{sorted(unknown)[0]}'. Use: {', '.join(gameEngine.BLIMP_DEFAULTS)}.")
+    gameEngine._initialize_word_lists()
+    answers = list(gameEngine.GLOBAL_PERMANENT_ANSWERS if answers is None else answers)
+    opener = opener or gameEngine.default_opener(answers)
+    settings = [dict(gameEngine.BLIMP_DEFAULTS)]
+    for name, values in grid.items():
+        settings = [{**setting, name: value} for setting in settings for value in values]
+    path = _cache_path(f"blimp-{opener}", answers, gameEngine.get_guess_index().words)
+    done = _read_blimp_sweep(path)
+    todo = [setting for setting in settings if _blimp_setting_key(setting) not in done]
+    print(f"isBlimp sweep after '{opener}': {len(settings) - len(todo)} cached, {len(todo)} to simulate -> {path}")
+
+    if todo:
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        start = time.perf_counter()
+        f, writer = _open_results(path, BLIMP_SWEEP_COLUMNS)
+        with f:
+            def record(row):
+                writer.writerow({**row, "avg_steps": f"{row['avg_steps']:.4f}", "ms_per_game": f"{row['ms_per_game']:.3f}",
+                                 "wall_seconds": f"{row['wall_seconds']:.2f}"})
+                f.flush()
+                done[_blimp_setting_key(row)] = row
+                if len(done) % 10 == 0 or len(todo) <= 10:
+                    print(f"... {len(done)} settings done, max_size {row['max_size']}: {row['avg_steps']:.4f} avg, "
+                          f"{row['ms_per_game']:.2f} ms/game ({time.perf_counter() - start:.0f} s)")
+            if workers > 1:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(_sweep_blimp_setting, setting, opener, answers) for setting in todo]
+                    for future in concurrent.futures.as_completed(futures):
+                        record(future.result())
+            else:
+                for setting in todo:
+                    record(_sweep_blimp_setting(setting, opener, answers))
+            gameEngine.set_blimp_params()
+
+    rows = [dict(done[_blimp_setting_key(setting)]) for setting in settings]
+    for row in rows:
+        row["pareto"] = not any((other["dnf"], other["avg_steps"], other["ms_per_game"]) != (row["dnf"], row["avg_steps"], row["ms_per_game"])
+                                and other["dnf"] <= row["dnf"] and other["avg_steps"] <= row["avg_steps"]
+                                and other["ms_per_game"] <= row["ms_per_game"] for other in rows)
+    return rows
+
+def print_blimp_table(rows):
+    names = list(gameEngine.BLIMP_DEFAULTS)
+    print("".join(f"{name:>17}" for name in names) + f"{'avg':>8}{'DNF':>5}{'blimp':>7}{'ms/game':>9}{'wall s':>8}  pareto")
+    for row in rows:
+        print("".join(f"{row[name]:>17g}" for name in names) + f"{row['avg_steps']:>8.4f}{row['dnf']:>5}"
+              f"{row['blimp_moves']:>7}{row['ms_per_game']:>9.2f}{row['wall_seconds']:>8.1f}  {'*' if row['pareto'] else ''}")
+
+def plot_blimp_sweep(rows, path=None):
+    """Average steps against pick time per game for every setting, with the Pareto front joined up."""
+    try:
+        import matplotlib
+        if path:
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not found, no chart drawn.")
+        return
+    plt.figure(figsize=(10, 6))
+    plt.scatter([row["ms_per_game"] for row in rows], [row["avg_steps"] for row in rows], color="skyblue", edgecolor="black")
+    front = sorted((row for row in rows if row["pareto"]), key=lambda row: row["ms_per_game"])
+    plt.plot([row["ms_per_game"] for row in front], [row["avg_steps"] for row in front], color="red", marker="o", label="Pareto front")
+    for row in front:
+        plt.annotate(" ".join(f"{row[name]:g}" for name in ("max_size", "fixed_positions", "unshared_letters", "pair_fraction")),
+                     (row["ms_per_game"], row["avg_steps"]), fontsize="small", xytext=(4, 4), textcoords="offset points")
+    plt.title("isBlimp Thresholds: Speed vs. Quality (labels: max_size fixed_positions unshared_letters pair_fraction)")
+    plt.xlabel("Pick time per game (ms)")
+    plt.ylabel("Average steps (on success)")
+    plt.grid(linestyle="--", alpha=0.5)
+    plt.legend()
+    if path:
+        plt.savefig(path, bbox_inches="tight")
+        print(f"Chart written to {path}")
+    else:
+        plt.show()
+
+class ExactSolver:
+    """
+    Depth-first search for the strategy with the fewest total guesses over a set of answers
+    under a guess limit. A state is the sorted array of remaining answer ids; its cost is the
+    total guesses still needed to solve every answer in it. The search keeps
+
+      - a memo of exact costs (and best guess) and of proven lower bounds per (state, guesses left),
+      - the admissible bound 3n - buckets - solved for a guess (each answer pays this guess,
+        and a bucket of m answers needs at least 2m - 1 more), used to order and cut guesses,
+      - one representative per group of guesses giving identical feedback on every remaining
+        answer, since they split the state the same way.
+
+    breadth keeps only that many guesses per state (best bound first). The result is then an
+    upper bound; with breadth=None and pool="all" it is exact.
+    """
+
+    def __init__(self, table, max_guesses=6, breadth=None, pool="all"):
+        np = gameEngine.np
+        self.table = table
+        self.matrix = table.full()
+        self.max_guesses = max_guesses
+        self.breadth = breadth
+        self.pool = pool
+        guess_ids = table.guess_index.word_ids
+        self.answer_guess_ids = np.array([guess_ids[word] for word in table.answer_index.words], dtype=np.int64)
+        self.in_pool = np.ones(len(table.guess_index.words), dtype=bool)
+        if pool == "answers":
+            self.in_pool[:] = False
+            self.in_pool[self.answer_guess_ids] = True
+        self.solved_code = 3 ** table.word_length - 1
+        self.exact = {}    # (state, guesses left) -> (cost, guess id)
+        self.lower = {}    # (state, guesses left) -> proven lower bound
+        self.nodes = 0
+
+    def cost(self, ids, guesses_left, limit=_UNSOLVABLE):
+        """
+        Exact cost of the state if it is below limit; otherwise some lower bound >= limit.
+        ids must be sorted answer ids (np.int32).
+        """
+        np = gameEngine.np
+        n = len(ids)
+        if n == 1:
+            return 1
+        if guesses_left <= 1:
+            return _UNSOLVABLE
+        if n == 2:
+            return 3
+        key = (ids.tobytes(), guesses_left)
+        known = self.exact.get(key)
+        if known is not None:
+            return known[0]
+        lower = max(2 * n - 1, self.lower.get(key, 0))
+        if lower >= limit:
+            return lower
+        self.nodes += 1
+
+        # a candidate that tells all the others apart reaches the bound 2n - 1
+        candidate_rows = np.sort(self.matrix[self.answer_guess_ids[ids]][:, ids], axis=1)
+        separating = np.flatnonzero((np.diff(candidate_rows, axis=1) != 0).all(axis=1))
+        if len(separating):
+            self.exact[key] = (2 * n - 1, int(self.answer_guess_ids[ids[separating[0]]]))
+            return 2 * n - 1
+
+        patterns = np.take(self.matrix, ids, axis=1)
+        ordered = np.sort(patterns, axis=1)
+        buckets = 1 + (np.diff(ordered, axis=1) != 0).sum(axis=1)
+        solved = ordered[:, -1] == self.solved_code
+        bounds = 3 * n - buckets - solved
+        useful = self.in_pool & ((buckets > 1) | solved)
+        if guesses_left == 2:   # the next guess must be the last one for every answer left
+            useful &= buckets == n
+        guess_ids = np.flatnonzero(useful)
+        if len(guess_ids) == 0:
+            self.exact[key] = (_UNSOLVABLE, None)
+            return _UNSOLVABLE
+        # guesses with the same feedback on every remaining answer are interchangeable
+        rows = np.ascontiguousarray(patterns[guess_ids])
+        _, first = np.unique(rows.view(np.dtype((np.void, rows.shape[1] * rows.itemsize))), return_index=True)
+        guess_ids = guess_ids[first]
+        guess_ids = guess_ids[np.lexsort((~solved[guess_ids], bounds[guess_ids]))]
+        if self.breadth is not None:
+            guess_ids = guess_ids[:self.breadth]
+
+        best, best_guess = limit, None
+        for guess_id in guess_ids.tolist():
+            if bounds[guess_id] >= best:
+                break
+            codes = patterns[guess_id]
+            order = np.argsort(codes, kind="stable")
+            splits = np.flatnonzero(np.diff(codes[order])) + 1
+            children = [ids[part] for part in np.split(order, splits) if codes[part[0]] != self.solved_code]
+            children.sort(key=len, reverse=True)
+            total = n
+            remaining = sum(2 * len(child) - 1 for child in children)
+            for child in children:
+                remaining -= 2 * len(child) - 1
+                total += self.cost(np.sort(child), guesses_left - 1, best - total - remaining)
+                if total + remaining >= best:
+                    break
+            else:
+                best, best_guess = total, guess_id
+        if best_guess is None:
+            if limit >= _UNSOLVABLE:
+                self.exact[key] = (_UNSOLVABLE, None)
+            else:
+                self.lower[key] = max(lower, limit)
+            return max(lower, limit)
+        self.exact[key] = (best, best_guess)
+        return best
+
+    def tree(self, ids, guesses_left):
+        """The solved strategy for a state as a DecisionTree node (call cost() on it first)."""
+        np = gameEngine.np
+        words = self.table.answer_index.words
+        if len(ids) == 1:
+            return words[ids[0]]
+        if len(ids) == 2:
+            return [words[ids[0]], {gameEngine.get_guess_colors(words[ids[0]], words[ids[1]]): words[ids[1]]}]
+        known = self.exact.get((ids.tobytes(), guesses_left))
+        if known is None or known[1] is None:
+            raise ValueError("State is not solved; call cost() first.")
+        guess = self.table.guess_index.words[known[1]]
+        codes = self.matrix[known[1]][ids]
+        children = {}
+        for code in np.unique(codes).tolist():
+            if code != self.solved_code:
+                colors = gameEngine.code_to_feedback(code, self.table.word_length).translate(gameEngine._STATE_TO_COLORS)
+                children[colors] = self.tree(ids[codes == code], guesses_left - 1)
+        return [guess, children]
+
+_exact_solver = None   # one per worker process, so its memo is reused across the buckets it solves
+
+def _solve_exact_bucket(ids, guesses_left, breadth, pool):
+    global _exact_solver
+    if _exact_solver is None or (_exact_solver.breadth, _exact_solver.pool, _exact_solver.max_guesses) != (breadth, pool, guesses_left + 1):
+        _exact_solver = ExactSolver(gameEngine.get_pattern_table(), guesses_left + 1, breadth, pool)
+    cost = _exact_solver.cost(ids, guesses_left)
+    return cost, (_exact_solver.tree(ids, guesses_left) if cost < _UNSOLVABLE else None), _exact_solver.nodes
+
+def solve_exact(opener=None, breadth=None, pool="all", max_guesses=6, workers=None, path=None):
+    """
+    Solves the standard answer list after `opener` (default: the engine's opener) for the fewest
+    expected guesses within max_guesses. The opener's feedback buckets are independent and are
+    solved in parallel, largest first. The tree is written to `path` (default under CACHE_DIR)
+    and returned as a DecisionTree, ready for gameEngine.use_decision_tree().
+    """
+    if not gameEngine.NUMPY_AVAILABLE:
+        raise RuntimeError("The exact solver needs numpy.")
+    if pool not in ("all", "answers"):
+        raise ValueError("'pool' must be 'all' or 'answers'.")
+    np = gameEngine.np
+    table = gameEngine.get_pattern_table()
+    answers = table.answer_index.words
+    opener = (opener or gameEngine.default_opener()).lower().strip()
+    if opener not in table.guess_index.word_ids:
+        raise ValueError(f"'{opener}' is not in the list of allowed words.")
+    table.full()   # built before the workers start, so forked workers share it
+    codes = table.row(table.guess_index.word_ids[opener])
+    solved_code = 3 ** table.word_length - 1
+    buckets = [np.flatnonzero(codes == code).astype(np.int32) for code in np.unique(codes).tolist() if code != solved_code]
+    buckets.sort(key=len, reverse=True)
+    limits = ([f"breadth {breadth}"] if breadth is not None else []) + (["answer words only"] if pool == "answers" else [])
+    print(f"Exact search after '{opener}': {len(buckets)} buckets, largest {len(buckets[0])}, "
+          f"{', '.join(limits) if limits else 'exact'}")
+
+    start = time.perf_counter()
+    args = ([bucket, max_guesses - 1, breadth, pool] for bucket in buckets)
+    workers = min(workers or os.cpu_count() or 1, len(buckets))
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_solve_exact_bucket, *zip(*args)))
+    else:
+        results = [_solve_exact_bucket(*arg) for arg in args]
+
+    total = len(answers)   # the opener
+    children = {}
+    for bucket, (cost, node, _) in zip(buckets, results):
+        if node is None:
+            raise ValueError(f"'{opener}' cannot solve every answer within {max_guesses} guesses.")
+        total += cost
+        colors = gameEngine.code_to_feedback(int(codes[bucket[0]]), table.word_length).translate(gameEngine._STATE_TO_COLORS)
+        children[colors] = node
+    tree = gameEngine.DecisionTree([opener, children], table.answer_index, max_guesses, breadth is None and pool == "all")
+    assert tree.total_guesses == total
+    path = path or _cache_path(f"tree-{opener}", answers, table.guess_index.words, "json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tree.save(path)
+    print(f"{total} guesses over {len(answers)} answers = {total / len(answers):.4f} average, "
+          f"worst case {tree.worst_case} ({time.perf_counter() - start:.1f} s). Tree written to {path}")
+    return tree
+
+def _play_tournament_chunk(strategy, words, hard_mode, seed, tree=None):
+    """
+    Worker: steps and per-move pick times for each word of one chunk, plus the CPU seconds used.
+    tree is (root, max_guesses, exact) of the decision tree the "optimal" strategy plays.
+    """
+    index = gameEngine.get_word_index(gameEngine.GLOBAL_PERMANENT_ANSWERS)
+    if tree is not None:
+        current = gameEngine._decision_tree
+        if current is None or current.index is not index or current.root != tree[0]:
+            # a spawned worker starts without the parent's tree: rebuild it on this process's index
+            gameEngine.use_decision_tree(gameEngine.DecisionTree(tree[0], index, tree[1], tree[2]))
+    cpu_start = time.process_time()
+    steps, move_times = [], []
+    for word in words:
+        gameEngine.random.seed(f"{seed}:{word}")   # Easy's random picks repeat for any chunking
+        steps.append(gameEngine._solve_specific_word_for_stats(word, gameEngine, index, hard_mode, strategy, move_times))
+    return steps, move_times, time.process_time() - cpu_start
+
+def tournament(strategies=None, workers=None, hard_mode=False, seed=1):
+    """
+    Plays every answer with each of `strategies` (default: all of gameEngine.GAME_STRATEGIES)
+    across all cores. Returns one row per strategy with the Mode 5 statistics (average steps,
+    DNF words, distribution), the per-move pick latency percentiles and the CPU seconds spent.
+    """
+    strategies = list(dict.fromkeys(strategies or gameEngine.GAME_STRATEGIES))
+    unknown = [strategy for strategy in strategies if strategy not in gameEngine.GAME_STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategy '{unknown[0]}'. Use one of: {', '.join(gameEngine.GAME_STRATEGIES)}.")
+    gameEngine._initialize_word_lists()
+    answers = gameEngine.GLOBAL_PERMANENT_ANSWERS
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, math.ceil(len(answers) / (workers * TOURNAMENT_CHUNKS_PER_WORKER)))
+    tree = gameEngine._decision_tree
+    tree = (tree.root, tree.max_guesses, tree.exact) if tree is not None else None
+    tasks = [(strategy, answers[i:i + chunk_size], hard_mode, seed, tree if strategy == "optimal" else None)
+             for strategy in strategies for i in range(0, len(answers), chunk_size)]
+    print(f"Tournament: {', '.join(strategies)} on {len(answers)} answers{' (hard mode)' if hard_mode else ''}, "
+          f"{min(workers, len(tasks))} workers")
+
+    start = time.perf_counter()
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            results = list(executor.map(_play_tournament_chunk, *zip(*tasks)))
+    else:
+        results = [_play_tournament_chunk(*task) for task in tasks]
+    wall_seconds = time.perf_counter() - start
+
+    rows = {strategy: {"steps": [], "move_times": [], "cpu_seconds": 0.0} for strategy in strategies}
+    for task, (steps, move_times, cpu_seconds) in zip(tasks, results):
+        row = rows[task[0]]
+        row["steps"].extend(steps)
+        row["move_times"].extend(move_times)
+        row["cpu_seconds"] += cpu_seconds
+    report = []
+    for strategy, row in rows.items():
+        counts = [row["steps"].count(i) for i in range(8)]
+        solved = len(answers) - counts[7]
+        report.append({"strategy": strategy,
+                       "avg_steps": sum(step for step in row["steps"] if step <= 6) / solved if solved else 0.0,
+                       "dnf": counts[7], **{f"steps_{i}": counts[i] for i in range(1, 7)},
+                       "dnf_words": [word for word, step in zip(answers, row["steps"]) if step == 7],
+                       "moves": len(row["move_times"]), "latency_ms": gameEngine.latency_percentiles(row["move_times"]),
+                       "cpu_seconds": row["cpu_seconds"]})
+    print(f"Done in {wall_seconds:.1f} s wall time.")
+    return report
+
+def print_tournament_table(rows):
+    print(f"{'strategy':10}{'avg':>8}{'DNF':>5}" + "".join(f"{i:>6}" for i in range(1, 7))
+          + f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'CPU s':>9}")
+    for row in rows:
+        latency = row["latency_ms"]
+        print(f"{row['strategy']:10}{row['avg_steps']:>8.4f}{row['dnf']:>5}"
+              + "".join(f"{row[f'steps_{i}']:>6}" for i in range(1, 7))
+              + "".join(f"{latency[key]:>9.2f}" for key in (50, 90, 99, "max")) + f"{row['cpu_seconds']:>9.1f}")
+    for row in rows:
+        if row["dnf_words"]:
+            print(f"{row['strategy']} failed: {', '.join(row['dnf_words'])}")
+
+_answer_patterns = None   # (answers, answers x answers feedback codes), built once per worker process
+
+def _answer_pattern_matrix(answers):
+    global _answer_patterns
+    if _answer_patterns is None or _answer_patterns[0] != answers:
+        _answer_patterns = (answers, gameEngine.feedback_code_matrix(answers, answers, len(answers[0])))
+    return _answer_patterns[1]
+
+def _monte_carlo_targets(target_ids, games, answers, opener, seed):
+    """
+    Worker: steps histogram (index 1-6, 7 = DNF) of `games` Easy games per target, each guess
+    drawn uniformly from the remaining candidates. Games of one target that reach the same
+    candidate set are advanced together: their picks are drawn at once and grouped by the
+    candidate set they lead to, so the work grows with distinct states rather than with games.
+    """
+    np = gameEngine.np
+    patterns = _answer_pattern_matrix(answers)
+    all_ids = np.arange(len(answers))
+    opener_codes = None if opener is None else gameEngine.feedback_code_matrix([opener], answers, len(opener))[0]
+    histograms = []
+    for target in target_ids:
+        rng = np.random.default_rng([seed, target])
+        histogram = np.zeros(8, dtype=np.int64)
+        if opener is None:
+            level, first_step = {b"": (all_ids, games)}, 1
+        elif opener == answers[target]:
+            histogram[1] = games
+            histograms.append(histogram)
+            continue
+        else:
+            level, first_step = {b"": (all_ids[opener_codes == opener_codes[target]], games)}, 2
+        for step in range(first_step, 7):
+            next_level = {}
+            for ids, count in level.values():
+                if len(ids) == 1:   # only the target is left
+                    histogram[step] += count
+                    continue
+                if count == 1:   # a lone game: no grouping needed
+                    guess = ids[rng.integers(len(ids))]
+                    if guess == target:
+                        histogram[step] += 1
+                        continue
+                    row = patterns[guess]
+                    child = ids[row[ids] == row[target]]
+                    key = child.tobytes()
+                    previous = next_level.get(key)
+                    next_level[key] = (child, 1 + (previous[1] if previous else 0))
+                    continue
+                picks, counts = np.unique(rng.integers(len(ids), size=count), return_counts=True)
+                guesses = ids[picks]
+                solved = guesses == target
+                histogram[step] += counts[solved].sum()
+                guesses, counts = guesses[~solved], counts[~solved]
+                if not len(guesses):
+                    continue
+                keep = patterns[np.ix_(guesses, ids)] == patterns[guesses, target][:, None]
+                for row, child_count in zip(keep, counts.tolist()):
+                    child = ids[row]
+                    key = child.tobytes()
+                    previous = next_level.get(key)
+                    next_level[key] = (child, child_count + (previous[1] if previous else 0))
+            level = next_level
+        histogram[7] = sum(count for _, count in level.values())
+        histograms.append(histogram)
+    return [histogram.tolist() for histogram in histograms]
+
+def _monte_carlo_targets_python(target_ids, games, answers, opener, seed):   #same games without numpy, one at a time
+    histograms = []
+    for target in target_ids:
+        rng = random.Random(f"{seed}:{target}")
+        answer = answers[target]
+        histogram = [0] * 8
+        for _ in range(games):
+            candidates, step = answers, 1
+            guess = opener if opener is not None else rng.choice(answers)
+            while guess != answer and step < 6:
+                code = gameEngine.get_feedback_code(guess, answer)
+                candidates = [word for word in candidates if gameEngine.get_feedback_code(guess, word) == code]
+                guess = rng.choice(candidates)
+                step += 1
+            histogram[step if guess == answer else 7] += 1
+        histograms.append(histogram)
+    return histograms
+
+def _proportion_interval(successes, trials, z):   #(p, low, high), Wilson score interval
+    if not trials:
+        return 0.0, 0.0, 0.0
+    p = successes / trials
+    centre = (p + z * z / (2 * trials)) / (1 + z * z / trials)
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / (1 + z * z / trials)
+    return p, max(0.0, centre - half), min(1.0, centre + half)
+
+def monte_carlo(games=1_000_000, opener=None, random_opener=False, seed=1, workers=None, confidence=0.95):
+    """
+    Plays about `games` seeded games of the Easy strategy (random remaining candidate),
+    spread evenly over every answer, across all cores. The first guess is `opener` (default:
+    the engine's opener, as the Easy AI in Mode 3 plays) or, with random_opener, a random
+    answer too. Returns the step distribution with confidence intervals: Wilson intervals for
+    the win rate and each step count, a normal interval for the average steps on success.
+    """
+    gameEngine._initialize_word_lists()
+    answers = list(gameEngine.GLOBAL_PERMANENT_ANSWERS)
+    if random_opener:
+        opener = None
+    else:
+        opener = (opener or gameEngine.default_opener(answers)).lower().strip()
+        if opener not in gameEngine.get_guess_index().word_ids:
+            raise ValueError(f"'{opener}' is not in the list of allowed words.")
+    per_target = max(1, math.ceil(games / len(answers)))
+    worker = _monte_carlo_targets if gameEngine.NUMPY_AVAILABLE else _monte_carlo_targets_python
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, math.ceil(len(answers) / (workers * TOURNAMENT_CHUNKS_PER_WORKER)))
+    chunks = [list(range(i, min(i + chunk_size, len(answers)))) for i in range(0, len(answers), chunk_size)]
+    print(f"Monte-Carlo: {per_target * len(answers):,} Easy games ({per_target} per answer), "
+          f"first guess {'random' if opener is None else repr(opener)}, seed {seed}")
+
+    start = time.perf_counter()
+    args = [(chunk, per_target, answers, opener, seed) for chunk in chunks]
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            results = list(executor.map(worker, *zip(*args)))
+    else:
+        results = [worker(*arg) for arg in args]
+    seconds = time.perf_counter() - start
+
+    per_answer = [histogram for histograms in results for histogram in histograms]
+    counts = [sum(histogram[step] for histogram in per_answer) for step in range(8)]
+    total = sum(counts)
+    solved = total - counts[7]
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    mean = sum(step * counts[step] for step in range(1, 7)) / solved if solved else 0.0
+    variance = sum(counts[step] * (step - mean) ** 2 for step in range(1, 7)) / (solved - 1) if solved > 1 else 0.0
+    half = z * math.sqrt(variance / solved) if solved else 0.0
+    hardest = sorted(range(len(answers)), key=lambda i: (-per_answer[i][7], -per_answer[i][6], answers[i]))[:10]
+    return {"games": total, "confidence": confidence, "seconds": seconds, "games_per_sec": total / seconds,
+            "counts": counts[1:], "avg_steps": (mean, mean - half, mean + half),
+            "win_rate": _proportion_interval(solved, total, z),
+            "distribution": [_proportion_interval(count, total, z) for count in counts[1:]],
+            "hardest": [(answers[i], per_answer[i][7] / per_target) for i in hardest]}
+
+def print_monte_carlo(report):
+    level = f"{report['confidence'] * 100:g}%"
+    print(f"{report['games']:,} games in {report['seconds']:.1f} s ({report['games_per_sec']:,.0f} games/sec)")
+    mean, low, high = report["avg_steps"]
+    print(f"Average steps (on success): {mean:.4f}  {level} CI [{low:.4f}, {high:.4f}]")
+    p, low, high = report["win_rate"]
+    print(f"Win rate: {p * 100:.3f}%  {level} CI [{low * 100:.3f}%, {high * 100:.3f}%]")
+    print("Distribution of guesses:")
+    for step, (count, (p, low, high)) in enumerate(zip(report["counts"], report["distribution"]), 1):
+        label = "DNF (7)" if step == 7 else f"{step} Steps"
+        print(f"  {label:8} {count:>12,}  {p * 100:7.3f}%  [{low * 100:7.3f}%, {high * 100:7.3f}%]")
+    print("Hardest answers (DNF rate): " + ", ".join(f"{word} {rate * 100:.1f}%" for word, rate in report["hardest"]))
+
+def print_opener_table(rows):
+    print(f"{'rank':>5}  {'word':8}{'exp. left':>10}{'largest':>9}{'entropy':>9}  answer")
+    for row in rows:
+        print(f"{row['rank']:>5}  {row['word']:8}{row['expected_remaining']:>10.2f}{row['largest_bucket']:>9}"
+              f"{row['entropy']:>9.3f}  {'yes' if row['is_answer'] else ''}")
+
+
+def run_command(args):   #runs one parsed command line
+    if args.command == "openers":
+        ranking = rank_openers(args.sort, args.workers, args.refresh)
+        if args.word:
+            wanted = {word.lower() for word in args.word}
+            print_opener_table([row for row in ranking if row["word"] in wanted])
+        else:
+            print_opener_table(ranking[:args.top])
+    elif args.command == "sweep":
+        openers = [word.lower() for word in args.opener] if args.opener else None
+        rows = sort_sweep(sweep_openers(args.top, args.rank_by, args.strategy, args.workers, openers), args.sort)
+        print_sweep_table(rows[:args.show])
+        if args.plot:
+            plot_sweep(rows[:args.show], args.plot)
+    elif args.command == "exact":
+        try:
+            solve_exact(args.opener, args.breadth, args.pool, args.max_guesses, args.workers, args.out)
+        except ValueError as e:
+            print(e)
+    elif args.command == "blimp":
+        grid = {name: getattr(args, name) for name in gameEngine.BLIMP_DEFAULTS if getattr(args, name) is not None}
+        rows = sweep_blimp(grid, args.opener and args.opener.lower(), args.workers)
+        rows.sort(key=lambda row: (row["dnf"], row["avg_steps"], row["ms_per_game"]))
+        print_blimp_table([row for row in rows if row["pareto"]] if args.pareto else rows)
+        if args.plot:
+            plot_blimp_sweep(rows, args.plot)
+    elif args.command == "montecarlo":
+        try:
+            print_monte_carlo(monte_carlo(args.games, args.opener, args.random_opener, args.seed, args.workers, args.confidence))
+        except ValueError as e:
+            print(e)
+    elif args.command == "tournament":
+        strategies = args.strategy
+        if args.tree:
+            gameEngine._initialize_word_lists()
+            gameEngine.use_decision_tree(gameEngine.load_decision_tree(args.tree))
+            strategies = (strategies or list(gameEngine.GAME_STRATEGIES)) + ["optimal"]
+        print_tournament_table(tournament(strategies, args.workers, args.hard_mode, args.seed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch analyses of the Wordle AI.")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"write pstats and collapsed stacks of the run to {gameEngine.PROFILE_DIR}/")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    openers_parser = subparsers.add_parser("openers", help="rank every allowed guess as the first guess")
+    openers_parser.add_argument("--sort", choices=list(OPENER_SORT_KEYS), default="expected_remaining")
+    openers_parser.add_argument("--top", type=int, default=20, help="rows to print")
+    openers_parser.add_argument("--word", action="append", help="show the rank of this word (repeatable)")
+    openers_parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    openers_parser.add_argument("--refresh", action="store_true", help="recompute even if a cached table exists")
+    sweep_parser = subparsers.add_parser("sweep", help="full simulation of the top-ranked openers")
+    sweep_parser.add_argument("--top", type=int, default=50, help="openers to simulate")
+    sweep_parser.add_argument("--rank-by", choices=list(OPENER_SORT_KEYS), default="expected_remaining")
+    sweep_parser.add_argument("--opener", action="append", help="simulate this opener instead (repeatable)")
+    sweep_parser.add_argument("--strategy", choices=list(gameEngine.HELPER_STRATEGIES), default="hard")
+    sweep_parser.add_argument("--sort", choices=SWEEP_SORT_KEYS, default="avg_steps")
+    sweep_parser.add_argument("--show", type=int, default=20, help="rows to print")
+    sweep_parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    sweep_parser.add_argument("--plot", help="write an overlay chart of the --show best openers to this PNG file")
+    exact_parser = subparsers.add_parser("exact", help="fewest-expected-guesses decision tree for one opener")
+    exact_parser.add_argument("--opener", help="first guess (default: the engine's opener)")
+    exact_parser.add_argument("--breadth", type=int, help="guesses tried per state, best bound first (default: all, exact)")
+    exact_parser.add_argument("--pool", choices=["all", "answers"], default="all", help="guesses the search may use")
+    exact_parser.add_argument("--max-guesses", type=int, default=6)
+    exact_parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    exact_parser.add_argument("--out", help="where to write the tree (default: under analysis_cache/)")
+    blimp_parser = subparsers.add_parser("blimp", help="Hard-strategy simulations over a grid of isBlimp thresholds")
+    blimp_parser.add_argument("--min-size", type=int, nargs="+", help="values to try (default: keep the default)")
+    blimp_parser.add_argument("--max-size", type=int, nargs="+", help=f"values to try (default: {BLIMP_SWEEP_GRID['max_size']})")
+    blimp_parser.add_argument("--fixed-positions", type=int, nargs="+", help=f"values to try (default: {BLIMP_SWEEP_GRID['fixed_positions']})")
+    blimp_parser.add_argument("--unshared-letters", type=int, nargs="+", help=f"values to try (default: {BLIMP_SWEEP_GRID['unshared_letters']})")
+    blimp_parser.add_argument("--pair-fraction", type=float, nargs="+", help=f"values to try (default: {BLIMP_SWEEP_GRID['pair_fraction']})")
+    blimp_parser.add_argument("--opener", help="first guess (default: the engine's opener)")
+    blimp_parser.add_argument("--pareto", action="store_true", help="print only the Pareto-best settings")
+    blimp_parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    blimp_parser.add_argument("--plot", help="write the speed/quality chart to this PNG file")
+    montecarlo_parser = subparsers.add_parser("montecarlo", help="many seeded games of the random Easy strategy, with confidence intervals")
+    montecarlo_parser.add_argument("--games", type=int, default=1_000_000, help="games in total, spread evenly over the answers")
+    montecarlo_parser.add_argument("--opener", help="first guess (default: the engine's opener)")
+    montecarlo_parser.add_argument("--random-opener", action="store_true", help="draw the first guess at random too")
+    montecarlo_parser.add_argument("--seed", type=int, default=1)
+    montecarlo_parser.add_argument("--confidence", type=float, default=0.95)
+    montecarlo_parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    tournament_parser = subparsers.add_parser("tournament", help="play every answer with several strategies side by side")
+    tournament_parser.add_argument("--strategy", action="append", choices=list(gameEngine.GAME_STRATEGIES),
+                                   help="strategy to enter (repeatable, default: all)")
+    tournament_parser.add_argument("--tree", help="also enter 'optimal', playing this decision tree JSON")
+    tournament_parser.add_argument("--hard-mode", action="store_true", help="every guess must use the hints so far")
+    tournament_parser.add_argument("--seed", type=int, default=1, help="seed for the Easy strategy's random picks")
+    tournament_parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    args = parser.parse_args()
+
+    if args.profile:
+        if getattr(args, "workers", 0) is None:   # only this process is profiled, so keep the work in it
+            args.workers = 1
+        strategy, opener = getattr(args, "strategy", None), getattr(args, "opener", None)
+        metadata = {"strategy": "+".join(strategy) if isinstance(strategy, list) else strategy, "command": " ".join(sys.argv[1:])}
+        if isinstance(opener, str):   # a single opener (sweep takes a list)
+            metadata["opener"] = opener.lower()
+        gameEngine.profile_run(run_command, args, label=f"analysis-{args.command}", metadata=metadata)
+    else:
+        run_command(args)
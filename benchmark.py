@@ -0,0 +1,395 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+import main as gameEngine
+
+# Throughput benchmarks for the helper API.
+#
+#   python benchmark.py batch --states 2000 --seed 1
+#   python benchmark.py multiboard --boards 2 4 8 --games 200 --seed 1
+#   python benchmark.py reverse --grids 5000 --seed 1
+#   python benchmark.py scaling --sizes 10000 50000 100000 --word-length 5 --plot scaling.png
+#   python benchmark.py kernels --save baseline.json
+#   python benchmark.py kernels --baseline baseline.json --threshold 0.1 --kernel-threshold mode5.sample=0.25
+#
+# Histories are generated by playing seeded helper games, so the states are the
+# kind a replayed archive or a burst of users would send (many share a prefix).
+# The scaling benchmark runs each kernel on synthetic dictionaries whose letters
+# follow English letter frequencies. The kernel suite times the engine's building
+# blocks on fixed, seeded workloads drawn from words.txt; it needs no display or
+# network, and exits with status 1 when a run is slower than its baseline.
+
+# approximate English letter frequencies (percent), used to build synthetic dictionaries
+LETTER_WEIGHTS = {"a": 8.2, "b": 1.5, "c": 2.8, "d": 4.3, "e": 12.7, "f": 2.2, "g": 2.0, "h": 6.1, "i": 7.0,
+                  "j": 0.2, "k": 0.8, "l": 4.0, "m": 2.4, "n": 6.7, "o": 7.5, "p": 1.9, "q": 0.1, "r": 6.0,
+                  "s": 6.3, "t": 9.1, "u": 2.8, "v": 1.0, "w": 2.4, "x": 0.2, "y": 2.0, "z": 0.1}
+# word families that share all but one letter, the sets isBlimp and blimpSearch exist for
+BLIMP_FAMILIES = ["bight eight fight light might night right sight tight wight",
+                  "bound found hound mound pound round sound wound",
+                  "batch catch hatch latch match patch watch",
+                  "baste caste haste paste taste waste",
+                  "cower lower mower power rower sower tower",
+                  "krill shill skill spill still swill trill"]
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.10   # a kernel more than 10% slower than its baseline is a regression
+
+
+def generate_histories(count, seed=1, word_list=None, max_turns=4):
+    """Plays seeded helper games and returns `count` (guess, feedback) histories taken from them."""
+    index = gameEngine.get_word_index(gameEngine.GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+    rng = random.Random(seed)
+    histories = []
+    while len(histories) < count:
+        answer = rng.choice(index.words)
+        history = []
+        for _ in range(rng.randint(0, max_turns)):
+            result = gameEngine.suggest_for_history(history, index)
+            if result.suggestion is None or result.suggestion == answer:
+                break
+            history.append((result.suggestion, gameEngine.get_guess_colors(result.suggestion, answer)))
+        histories.append(history)
+    gameEngine._history_caches.pop((index, "hard"), None)   # the benchmark starts from a cold cache
+    return histories
+
+def bench_batch(states=2000, seed=1, word_list=None):
+    index = gameEngine.get_word_index(gameEngine.GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+    histories = generate_histories(states, seed, index)
+    unique = len(set(tuple(history) for history in histories))
+    print(f"{states} helper states ({unique} distinct), seed {seed}")
+
+    start = time.perf_counter()
+    sequential = [gameEngine.suggest_for_history(history, index) for history in histories]
+    sequential_time = time.perf_counter() - start
+    gameEngine._history_caches.pop((index, "hard"), None)
+
+    if gameEngine.NUMPY_AVAILABLE:
+        gameEngine.get_pattern_table(index).full()   # one-time table build, reported separately
+    start = time.perf_counter()
+    batched = gameEngine.suggest_batch(histories, index)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(a.suggestion != b.suggestion for a, b in zip(sequential, batched))
+    print(f"  suggest_for_history : {sequential_time:8.2f} s  {states / sequential_time:10.1f} suggestions/sec")
+    print(f"  suggest_batch       : {batch_time:8.2f} s  {states / batch_time:10.1f} suggestions/sec")
+    print(f"  speedup x{sequential_time / batch_time:.1f}, {mismatches} differing suggestions")
+    return {"states": states, "sequential_seconds": sequential_time, "batch_seconds": batch_time,
+            "mismatches": mismatches}
+
+def bench_multi_board(board_counts=(2, 4, 8), games=200, seed=1):
+    """Full multi-board simulation over sampled board tuples, one line per board count."""
+    results = []
+    for num_boards in board_counts:
+        stats = gameEngine.simulate_multi_board(num_boards, games, seed)
+        name = gameEngine.MULTI_BOARD_NAMES.get(num_boards, f"{num_boards}-board")
+        print(f"  {name:9s} {stats['games']:5d} games  win rate {stats['win_rate'] * 100:6.2f}%  "
+              f"avg guesses {stats['avg_guesses_on_win']:.3f}  {stats['games_per_sec']:7.2f} games/sec")
+        results.append(stats)
+    return results
+
+def synthetic_shares(count, answer, seed=1):
+    """Pasted text of `count` share grids for one answer, from players guessing random allowed words."""
+    rng = random.Random(seed)
+    allowed = gameEngine.GLOBAL_WORDS_ALLOWED
+    shares = []
+    for _ in range(count):
+        rows = []
+        for guess in rng.sample(allowed, rng.randint(1, 5)) + [answer]:
+            rows.append(gameEngine.format_colors_to_emoji(gameEngine.get_guess_colors(guess, answer)))
+            if guess == answer:
+                break
+        shares.append(f"Wordle 1,000 {len(rows)}/6\n\n" + "\n".join(rows))
+    return "\n\n".join(shares)
+
+def bench_reverse(grids=5000, seed=1, days=5):
+    """Reverse-solves `days` synthetic days of `grids` shares each; reports grids/sec and accuracy."""
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    gameEngine.get_reverse_index()
+    print(f"  inverse index built in {time.perf_counter() - start:.2f} s")
+    correct = 0
+    total_time = 0.0
+    for day in range(days):
+        answer = rng.choice(gameEngine.GLOBAL_PERMANENT_ANSWERS)
+        text = synthetic_shares(grids, answer, seed + day)
+        start = time.perf_counter()
+        solution = gameEngine.reverse_solve(text)
+        elapsed = time.perf_counter() - start
+        total_time += elapsed
+        correct += solution.answers[:1] == [answer]
+        print(f"  day {day + 1}: {grids} grids in {elapsed:.3f} s, answer {answer!r}, "
+              f"top guess {solution.answers[0]!r} of {len(solution.answers)} consistent")
+    print(f"  {days * grids / total_time:,.0f} grids/sec, {correct}/{days} days solved")
+    return {"grids_per_sec": days * grids / total_time, "correct": correct, "days": days}
+
+def synthetic_words(count, word_length=5, seed=1):
+    """Returns `count` distinct random words of word_length letters, drawn with English letter frequencies."""
+    if count > 26 ** word_length:
+        raise ValueError(f"Cannot make {count} distinct {word_length}-letter words.")
+    rng = random.Random(seed)
+    letters, weights = list(LETTER_WEIGHTS), list(LETTER_WEIGHTS.values())
+    words = {}
+    while len(words) < count:
+        for _ in range(count - len(words)):
+            words.setdefault("".join(rng.choices(letters, weights, k=word_length)))
+    return list(words)
+
+def _time(function, *args, repeat=3):   #best of `repeat` runs, in seconds
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def _index_bytes(index):   #rough memory held by the bitset postings of a WordIndex
+    postings = list(index.count_bits.values())
+    for position in index.position_bits:
+        postings.extend(position.values())
+    return sum(sys.getsizeof(bits) for bits in postings)
+
+def bench_scaling(sizes=(10000, 50000, 100000), word_length=5, seed=1, plot_path=None):
+    """Times every solver kernel on synthetic dictionaries of the given sizes and charts the growth."""
+    kernels = {}
+    rng = random.Random(seed)
+    for size in sizes:
+        words = synthetic_words(size, word_length, seed)
+        answer = rng.choice(words)
+        guess = rng.choice(words)
+        colors = gameEngine.get_guess_colors(guess, answer)
+        constraint = gameEngine.FeedbackConstraint.from_feedback(guess, colors)
+
+        timings = {}
+        timings["WordIndex build"] = _time(gameEngine.WordIndex, words, word_length, repeat=1)
+        index = gameEngine.WordIndex(words, word_length)
+        timings["feedback filter (bitset)"] = _time(index.mask, constraint)
+        timings["feedback filter (list scan)"] = _time(constraint.apply, words)
+        timings["getMaxValue1 (all words)"] = _time(gameEngine.getMaxValue1, gameEngine.CandidateSet(index))
+        if gameEngine.NUMPY_AVAILABLE:
+            table = gameEngine.PatternTable(index, index)
+            masks = gameEngine.np.zeros((100, size), dtype=bool)
+            for row in masks:
+                row[rng.sample(range(size), max(1, size // 100))] = True
+            timings["pattern row (1 guess)"] = _time(gameEngine.feedback_code_matrix, [guess], words, word_length)
+            timings["max_value_choice (100 states)"] = _time(gameEngine.max_value_choice, table, masks)
+            timings["blimp_search_choice (10 candidates)"] = _time(
+                gameEngine.blimp_search_choice, table, rng.sample(range(size), 10), repeat=1)
+        else:
+            print("(numpy not installed: vectorized kernels skipped)")
+
+        print(f"\n{size} words of {word_length} letters, index postings ~{_index_bytes(index) / 2 ** 20:.1f} MB")
+        for name, seconds in timings.items():
+            print(f"  {name:38s} {seconds * 1000:10.2f} ms")
+            kernels.setdefault(name, []).append(seconds)
+
+    if plot_path:
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+        except ImportError:
+            print("matplotlib not found, no chart written.")
+            return kernels
+        plt.figure(figsize=(10, 6))
+        for name, seconds in kernels.items():
+            plt.plot(sizes[:len(seconds)], [s * 1000 for s in seconds], marker="o", label=name)
+        plt.xscale("log")
+        plt.yscale("log")
+        plt.title(f"Kernel scaling ({word_length}-letter synthetic dictionaries)")
+        plt.xlabel("Dictionary size (words)")
+        plt.ylabel("Time (ms, best of runs)")
+        plt.grid(True, which="both", linestyle="--", alpha=0.5)
+        plt.legend()
+        plt.savefig(plot_path, bbox_inches="tight")
+        print(f"\nChart written to {plot_path}")
+    return kernels
+
+def kernel_workloads(seed=1, mode5_answers=30):
+    """
+    Fixed, seeded workloads on the standard word lists: name -> (function, list of argument
+    tuples). One operation is one call; candidate lists come from real games after the opener.
+    """
+    answers = gameEngine.GLOBAL_PERMANENT_ANSWERS
+    rng = random.Random(seed)
+    opener = gameEngine.default_opener(answers)
+    pairs = [(rng.choice(gameEngine.GLOBAL_WORDS_ALLOWED), rng.choice(answers)) for _ in range(2000)]
+    after_opener = [gameEngine.filter_words(answers, opener, answer) for answer in rng.sample(answers, 20)]
+    filter_pairs = [(rng.choice(gameEngine.GLOBAL_WORDS_ALLOWED), rng.choice(answers)) for _ in range(20)]
+    answer_set = set(answers)
+    families = [[word for word in family.split() if word in answer_set] for family in BLIMP_FAMILIES]
+    families = [family for family in families if len(family) >= 2]
+    index = gameEngine.get_word_index(answers)
+    return {
+        "get_guess_colors": (gameEngine.get_guess_colors, pairs),
+        "filter_words.full": (gameEngine.filter_words, [(answers, guess, answer) for guess, answer in filter_pairs]),
+        "filter_words.opener": (gameEngine.filter_words, [(words, guess, rng.choice(words))
+                                                          for words, (guess, _) in zip(after_opener, filter_pairs)]),
+        "gameFilter.full": (gameEngine.gameFilter, [(guess, gameEngine.normalize_feedback(gameEngine.get_guess_colors(guess, answer)), answers)
+                                                    for guess, answer in filter_pairs]),
+        "gameFilter.index": (gameEngine.gameFilter, [(guess, gameEngine.normalize_feedback(gameEngine.get_guess_colors(guess, answer)), "none")
+                                                     for guess, answer in filter_pairs]),
+        "isBlimp.families": (gameEngine.isBlimp, [(family,) for family in families]),
+        "isBlimp.random10": (gameEngine.isBlimp, [(rng.sample(answers, 10),) for _ in range(50)]),
+        "blimpSearch.families": (gameEngine.blimpSearch, [(family,) for family in families]),
+        "getMaxValue1.full": (gameEngine.getMaxValue1, [(answers,)]),
+        "getMaxValue1.opener": (gameEngine.getMaxValue1, [(words,) for words in after_opener]),
+        "mode5.sample": (gameEngine._solve_specific_word_for_stats,
+                         [(answer, gameEngine, index) for answer in rng.sample(answers, mode5_answers)]),
+    }
+
+def bench_kernels(seed=1, repeat=5, mode5_answers=30, only=None):
+    """
+    Times every kernel workload: one warm-up call, then `repeat` rounds over all its calls.
+    Returns a baseline dict (median and best seconds per operation for each kernel).
+    """
+    gameEngine._initialize_word_lists()
+    workloads = kernel_workloads(seed, mode5_answers)
+    results = {}
+    print(f"{'kernel':24}{'ops':>6}{'median':>14}{'best':>14}")
+    for name, (function, calls) in workloads.items():
+        if only and name not in only:
+            continue
+        function(*calls[0])
+        rounds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for args in calls:
+                function(*args)
+            rounds.append((time.perf_counter() - start) / len(calls))
+        results[name] = {"ops": len(calls), "seconds_per_op": statistics.median(rounds), "best_seconds_per_op": min(rounds)}
+        print(f"{name:24}{len(calls):>6}{_format_seconds(results[name]['seconds_per_op']):>14}"
+              f"{_format_seconds(results[name]['best_seconds_per_op']):>14}")
+    return {"version": BASELINE_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "seed": seed, "repeat": repeat, "mode5_answers": mode5_answers,
+            "answers_hash": gameEngine.word_list_hash(gameEngine.GLOBAL_PERMANENT_ANSWERS),
+            "guesses_hash": gameEngine.word_list_hash(gameEngine.GLOBAL_WORDS_ALLOWED),
+            "environment": {"python": platform.python_version(), "machine": platform.machine(),
+                            "numpy": gameEngine.NUMPY_AVAILABLE, "cpus": os.cpu_count()},
+            "results": results}
+
+def _format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+def save_baseline(run, path):
+    with open(path, "w") as f:
+        json.dump(run, f, indent=1)
+    print(f"Baseline written to {path}")
+
+def load_baseline(path):
+    with open(path, "r") as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported benchmark baseline version {baseline.get('version')}.")
+    return baseline
+
+def compare_to_baseline(run, baseline, threshold=DEFAULT_THRESHOLD, kernel_thresholds=None):
+    """
+    Compares median seconds per operation with a stored baseline. A kernel is a regression when
+    it is more than its threshold slower (kernel_thresholds overrides `threshold` per kernel).
+    Returns the names of the regressed kernels.
+    """
+    kernel_thresholds = kernel_thresholds or {}
+    for key in ("answers_hash", "guesses_hash", "seed", "mode5_answers"):
+        if baseline.get(key) != run.get(key):
+            print(f"Warning: baseline {key} differs ({baseline.get(key)} vs {run.get(key)}), workloads are not the same.")
+    if baseline.get("environment") != run.get("environment"):
+        print(f"Warning: baseline was recorded on {baseline.get('environment')}, this run on {run.get('environment')}.")
+    regressions = []
+    print(f"\n{'kernel':24}{'baseline':>14}{'now':>14}{'change':>9}  status")
+    for name, result in run["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:24}{'-':>14}{_format_seconds(result['seconds_per_op']):>14}{'':>9}  new")
+            continue
+        limit = kernel_thresholds.get(name, threshold)
+        change = result["seconds_per_op"] / base["seconds_per_op"] - 1
+        status = "REGRESSION" if change > limit else "faster" if change < -limit else "ok"
+        if status == "REGRESSION":
+            regressions.append(name)
+        print(f"{name:24}{_format_seconds(base['seconds_per_op']):>14}{_format_seconds(result['seconds_per_op']):>14}"
+              f"{change * 100:>+8.1f}%  {status}")
+    print(f"\n{len(regressions)} regression(s)" + (f": {', '.join(regressions)}" if regressions else ""))
+    return regressions
+
+def _parse_kernel_threshold(text):   #'name=0.25' -> ('name', 0.25)
+    name, _, value = text.partition("=")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=FRACTION, got '{text}'")
+
+
+def run_command(args):   #runs one parsed command line
+    if args.command == "batch":
+        gameEngine._initialize_word_lists()
+        bench_batch(args.states, args.seed)
+    elif args.command == "multiboard":
+        gameEngine._initialize_word_lists()
+        bench_multi_board(args.boards, args.games, args.seed)
+    elif args.command == "reverse":
+        gameEngine._initialize_word_lists()
+        bench_reverse(args.grids, args.seed, args.days)
+    elif args.command == "scaling":
+        bench_scaling(args.sizes, args.word_length, args.seed, args.plot)
+    elif args.command == "kernels":
+        run = bench_kernels(args.seed, args.repeat, args.mode5_answers, args.only)
+        if args.save:
+            save_baseline(run, args.save)
+        if args.baseline:
+            try:
+                regressions = compare_to_baseline(run, load_baseline(args.baseline), args.threshold, dict(args.kernel_threshold))
+            except (OSError, ValueError) as e:
+                print(e)
+                sys.exit(2)
+            sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput benchmarks for the Wordle AI helper.")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"write pstats and collapsed stacks of the run to {gameEngine.PROFILE_DIR}/")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    batch_parser = subparsers.add_parser("batch", help="sequential vs batched suggestions per second")
+    batch_parser.add_argument("--states", type=int, default=2000, help="number of helper states to answer")
+    batch_parser.add_argument("--seed", type=int, default=1)
+    multi_parser = subparsers.add_parser("multiboard", help="Dordle/Quordle/Octordle simulation")
+    multi_parser.add_argument("--boards", type=int, nargs="+", default=[2, 4, 8])
+    multi_parser.add_argument("--games", type=int, default=200)
+    multi_parser.add_argument("--seed", type=int, default=1)
+    reverse_parser = subparsers.add_parser("reverse", help="reverse-solve synthetic days of share grids")
+    reverse_parser.add_argument("--grids", type=int, default=5000, help="share grids per day")
+    reverse_parser.add_argument("--days", type=int, default=5)
+    reverse_parser.add_argument("--seed", type=int, default=1)
+    scaling_parser = subparsers.add_parser("scaling", help="kernel timings on synthetic dictionaries")
+    scaling_parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+    scaling_parser.add_argument("--word-length", type=int, default=5)
+    scaling_parser.add_argument("--seed", type=int, default=1)
+    scaling_parser.add_argument("--plot", help="write a log-log chart of the timings to this PNG file")
+    kernels_parser = subparsers.add_parser("kernels", help="microbenchmarks of the engine kernels, with baseline comparison")
+    kernels_parser.add_argument("--seed", type=int, default=1)
+    kernels_parser.add_argument("--repeat", type=int, default=5, help="timed rounds per kernel (the median counts)")
+    kernels_parser.add_argument("--mode5-answers", type=int, default=30, help="answers in the end-to-end Mode 5 sample")
+    kernels_parser.add_argument("--only", nargs="+", help="run only these kernels")
+    kernels_parser.add_argument("--save", help="write this run as a JSON baseline")
+    kernels_parser.add_argument("--baseline", help="compare against this JSON baseline (exit status 1 on regression)")
+    kernels_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, as a fraction")
+    kernels_parser.add_argument("--kernel-threshold", type=_parse_kernel_threshold, action="append", default=[],
+                                metavar="NAME=FRACTION", help="allowed slowdown for one kernel (repeatable)")
+    args = parser.parse_args()
+
+    if args.profile:
+        gameEngine.profile_run(run_command, args, label=f"benchmark-{args.command}", metadata={"command": " ".join(sys.argv[1:])})
+    else:
+        run_command(args)
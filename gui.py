@@ -29,8 +29,10 @@ class WordleApp:
 
         try:
             gameEngine._initialize_word_lists()
-            self.permanent_answers = gameEngine.permanent_answers[:]
-            self.all_allowed_words = list(set(gameEngine.wordsAllowed + self.permanent_answers))
+            self.permanent_answers = gameEngine.permanent_answers
+            self.all_allowed_words = gameEngine.get_guess_index().word_ids   # allowed words and answers, shared with the engine
+            self.answer_index = gameEngine.get_word_index(self.permanent_answers)
+            self.word_length = self.answer_index.word_length
             if not self.permanent_answers or not self.all_allowed_words:
                 raise FileNotFoundError
         except FileNotFoundError:
@@ -45,20 +47,22 @@ class WordleApp:
         self.mode3_tab = Mode3Tab(self.notebook, self)
         self.mode4_tab = Mode4Tab(self.notebook, self)
         self.mode5_tab = Mode5Tab(self.notebook, self)
+        self.mode7_tab = AdversarialTab(self.notebook, self)
         
         self.notebook.add(self.mode1_tab, text="Mode 1: AI vs. Random")
         self.notebook.add(self.mode2_tab, text="Mode 2: AI vs. Specific")
         self.notebook.add(self.mode3_tab, text="Mode 3: Human vs. AI")
         self.notebook.add(self.mode4_tab, text="Mode 4: AI Helper")
         self.notebook.add(self.mode5_tab, text="Mode 5: Full Simulation")
+        self.notebook.add(self.mode7_tab, text="Mode 7: Adversarial")
         
         self.notebook.pack(expand=True, fill="both", padx=10, pady=10)
 
-def create_grid(parent_frame):
+def create_grid(parent_frame, word_length=5, rows=6):
     grid_labels = []
-    for r in range(6):
+    for r in range(rows):
         row_labels = []
-        for c in range(5):
+        for c in range(word_length):
             label = tk.Label(parent_frame, text="", width=4, height=2, 
                              bg=COLOR_DEFAULT, relief="solid", borderwidth=1,
                              font=GRID_FONT, fg=COLOR_BLACK)
@@ -69,7 +73,7 @@ def create_grid(parent_frame):
 
 def update_grid_row(grid_labels, row, guess, colors_str):
     color_map = {'G': COLOR_GREEN, 'Y': COLOR_YELLOW, 'B': COLOR_GRAY}
-    for i in range(5):
+    for i in range(len(guess)):
         char = guess[i].upper()
         color_char = colors_str[i]
         bg_color = color_map.get(color_char, COLOR_DEFAULT)
@@ -78,8 +82,8 @@ def update_grid_row(grid_labels, row, guess, colors_str):
         label.config(text=char, bg=bg_color, fg=COLOR_WHITE)
 
 def clear_grid(grid_labels):
-    for r in range(6):
-        for c in range(5):
+    for r in range(len(grid_labels)):
+        for c in range(len(grid_labels[r])):
             grid_labels[r][c].config(text="", bg=COLOR_DEFAULT, fg=COLOR_BLACK)
 
 
@@ -173,7 +177,7 @@ class AIGameTab(ScrollableTab):
         self.grid_frame = ttk.Frame(self.scrollable_frame)
         self.grid_frame.pack(pady=10)
         
-        self.ai_grid_labels = create_grid(self.grid_frame)
+        self.ai_grid_labels = create_grid(self.grid_frame, self.app.word_length)
         
         self.status_label = ttk.Label(self.scrollable_frame, text="Start a game to begin.", font=STATUS_FONT)
         self.status_label.pack(pady=10)
@@ -189,14 +193,14 @@ class AIGameTab(ScrollableTab):
 
     def start_game_logic(self, target_word):
         if not target_word or target_word not in self.app.permanent_answers:
-            messagebox.showerror("Word Error", f"'{target_word}' is not a valid 5-letter answer word.")
+            messagebox.showerror("Word Error", f"'{target_word}' is not a valid {self.app.word_length}-letter answer word.")
             return False
             
         self.game_over = False
         self.target_word = target_word
         self.ai_row = 0
         self.ai_guesses = []
-        self.ai_available_words = self.app.permanent_answers[:]
+        self.ai_available_words = gameEngine.CandidateSet(self.app.answer_index)
         
         clear_grid(self.ai_grid_labels)
         self.status_label.config(text=f"Target word set. Press 'Next Step' for AI's first guess.")
@@ -208,7 +212,7 @@ class AIGameTab(ScrollableTab):
             return
 
         if self.ai_row == 0:
-            ai_guess = "salet"
+            ai_guess = gameEngine.default_opener(self.app.answer_index)
         else:
             if not self.ai_available_words:
                 self.status_label.config(text="Error: AI has no possible words left.")
@@ -216,9 +220,7 @@ class AIGameTab(ScrollableTab):
                 return
                 
             last_ai_guess = self.ai_guesses[-1]
-            self.ai_available_words = gameEngine.filter_words(
-                self.ai_available_words, last_ai_guess, self.target_word
-            )
+            self.ai_available_words.narrow_by_guess(last_ai_guess, self.target_word)
             
             if not self.ai_available_words:
                 self.status_label.config(text="Error: AI has no possible words left after filtering.")
@@ -314,8 +316,8 @@ class Mode3Tab(ScrollableTab):
         self.ai_grid_frame = tk.Frame(self.ai_frame, bg=COLOR_BG)
         self.ai_grid_frame.pack(pady=5)
 
-        self.human_grid_labels = create_grid(self.human_grid_frame)
-        self.ai_grid_labels = create_grid(self.ai_grid_frame)
+        self.human_grid_labels = create_grid(self.human_grid_frame, self.app.word_length)
+        self.ai_grid_labels = create_grid(self.ai_grid_frame, self.app.word_length)
 
         self.input_frame = tk.Frame(self.scrollable_frame, bg=COLOR_BG)
         self.input_frame.pack(pady=10)
@@ -329,12 +331,17 @@ class Mode3Tab(ScrollableTab):
         self.difficulty_selector = ttk.Combobox(
             self.difficulty_frame, 
             textvariable=self.difficulty_var,
-            values=["Easy", "Medium", "Hard"],
+            values=["Easy", "Medium", "Hard", "Expert", "Lookahead"],
             state="readonly",
             width=10
         )
         self.difficulty_selector.pack(side=tk.LEFT, padx=5)
 
+        self.hard_mode_var = tk.BooleanVar(value=False)
+        self.hard_mode_check = tk.Checkbutton(self.difficulty_frame, text="Hard Mode", variable=self.hard_mode_var,
+                                              font=STATUS_FONT, bg=COLOR_BG)
+        self.hard_mode_check.pack(side=tk.LEFT, padx=5)
+
         self.vision_frame = tk.Frame(self.scrollable_frame, bg=COLOR_BG)
         self.vision_frame.pack(pady=5)
         
@@ -419,7 +426,9 @@ class Mode3Tab(ScrollableTab):
         self.human_row = 0
         self.ai_row = 0
         self.ai_guesses = []
-        self.ai_available_words = self.app.permanent_answers[:]
+        self.ai_available_words = gameEngine.CandidateSet(self.app.answer_index)
+        self.human_hard_guesses = gameEngine.HardModeGuesses()
+        self.ai_hard_guesses = gameEngine.HardModeGuesses()
         
         clear_grid(self.human_grid_labels)
         clear_grid(self.ai_grid_labels)
@@ -430,6 +439,7 @@ class Mode3Tab(ScrollableTab):
         self.guess_entry.focus()
         self.difficulty_selector.config(state="readonly")
         self.vision_selector.config(state="readonly")
+        self.hard_mode_check.config(state=tk.NORMAL)
         self.start_turn_timer()
 
     def on_human_guess(self, event=None):
@@ -439,21 +449,26 @@ class Mode3Tab(ScrollableTab):
         if self.human_row == 0:
             self.difficulty_selector.config(state=tk.DISABLED)
             self.vision_selector.config(state=tk.DISABLED)
+            self.hard_mode_check.config(state=tk.DISABLED)
 
         guess = self.guess_entry.get().lower().strip()
         self.guess_entry.delete(0, tk.END)
 
-        if len(guess) != 5:
-            self.status_label.config(text="Guess must be 5 letters.")
+        if len(guess) != self.app.word_length:
+            self.status_label.config(text=f"Guess must be {self.app.word_length} letters.")
             return
         if guess not in self.app.all_allowed_words:
             self.status_label.config(text=f"'{guess}' is not in the word list.")
             return
+        if self.hard_mode_var.get() and self.human_hard_guesses.violation(guess):
+            self.status_label.config(text=self.human_hard_guesses.violation(guess))
+            return
 
         # Valid guess, so stop the timer
         self.stop_turn_timer()
 
         colors_str = gameEngine.get_guess_colors(guess, self.target_word)
+        self.human_hard_guesses.add(guess, colors_str)
         update_grid_row(self.human_grid_labels, self.human_row, guess, colors_str)
         self.human_row += 1
 
@@ -479,21 +494,26 @@ class Mode3Tab(ScrollableTab):
             if difficulty == "Easy":
                 ai_guess = random.choice(self.ai_available_words)
             else:
-                ai_guess = "salet"
+                ai_guess = gameEngine.default_opener(self.app.answer_index)
         else:
             last_ai_guess = self.ai_guesses[-1]
-            self.ai_available_words = gameEngine.filter_words(
-                self.ai_available_words, last_ai_guess, self.target_word
-            )
+            self.ai_available_words.narrow_by_guess(last_ai_guess, self.target_word)
             
             if not self.ai_available_words:
-                ai_guess = "salet"
+                ai_guess = gameEngine.default_opener(self.app.answer_index)
             elif len(self.ai_available_words) == 1:
                 ai_guess = self.ai_available_words[0]
             
+            elif difficulty == "Expert":
+                guess_pool = self.ai_hard_guesses if self.hard_mode_var.get() else None
+                ai_guess = gameEngine.get_expert_guess(self.ai_available_words, guess_pool)
+            elif difficulty == "Lookahead":
+                guess_pool = self.ai_hard_guesses if self.hard_mode_var.get() else None
+                ai_guess = gameEngine.get_lookahead_guess(self.ai_available_words, guess_pool)
             elif difficulty == "Hard":
                 if gameEngine.isBlimp(self.ai_available_words):
-                    ai_guess = gameEngine.blimpSearch(self.ai_available_words)
+                    guess_pool = self.ai_hard_guesses if self.hard_mode_var.get() else None
+                    ai_guess = gameEngine.blimpSearch(self.ai_available_words, guess_pool)
                 else:
                     ai_guess = gameEngine.getMaxValue1(self.ai_available_words)
             else:
@@ -501,11 +521,12 @@ class Mode3Tab(ScrollableTab):
         
         self.ai_guesses.append(ai_guess)
         ai_colors_str = gameEngine.get_guess_colors(ai_guess, self.target_word)
+        self.ai_hard_guesses.add(ai_guess, ai_colors_str)
         
         if vision == "Full Vision":
             update_grid_row(self.ai_grid_labels, self.ai_row, ai_guess, ai_colors_str)
         elif vision == "Half Blind":
-            all_gray_colors = "B" * 5
+            all_gray_colors = "B" * len(ai_guess)
             update_grid_row(self.ai_grid_labels, self.ai_row, ai_guess, all_gray_colors)
         elif vision == "Blind":
             pass
@@ -548,7 +569,7 @@ class Mode4Tab(ScrollableTab):
         self.grid_frame = ttk.Frame(self.scrollable_frame)
         self.grid_frame.pack(pady=10)
         
-        self.helper_grid_labels = create_grid(self.grid_frame)
+        self.helper_grid_labels = create_grid(self.grid_frame, self.app.word_length)
         self.tile_feedback = []
         
         self.status_label = ttk.Label(self.scrollable_frame, text="", font=STATUS_FONT)
@@ -562,6 +583,13 @@ class Mode4Tab(ScrollableTab):
 
         self.reset_button = ttk.Button(self.control_frame, text="New Game", command=self.start_new_helper)
         self.reset_button.pack(side=tk.LEFT, padx=10)
+
+        ttk.Label(self.control_frame, text="Strategy:").pack(side=tk.LEFT, padx=5)
+        self.strategy_var = tk.StringVar(value="Hard")
+        self.strategy_selector = ttk.Combobox(self.control_frame, textvariable=self.strategy_var,
+                                              values=["Hard", "Expert", "Lookahead"], state="readonly", width=10)
+        self.strategy_selector.pack(side=tk.LEFT, padx=5)
+        self.strategy_selector.bind("<<ComboboxSelected>>", lambda e: self.start_new_helper())
         
         self.list_frame = ttk.LabelFrame(self.scrollable_frame, text="Possible Words", padding=10)
         self.list_frame.pack(expand=True, fill='both', padx=10, pady=10)
@@ -574,8 +602,11 @@ class Mode4Tab(ScrollableTab):
     def start_new_helper(self):
         self.game_over = False
         self.turn = 0
-        self.ai_guess = "salet"
-        self.ai_available_words = self.app.permanent_answers[:]
+        self.feedback_history = []
+        helper_result = gameEngine.suggest_for_history(self.feedback_history, self.app.answer_index,
+                                                       self.strategy_var.get().lower())
+        self.ai_guess = helper_result.suggestion
+        self.ai_available_words = helper_result.candidates
         
         clear_grid(self.helper_grid_labels)
         self.update_list_text(f"{len(self.ai_available_words)} words remaining.")
@@ -588,7 +619,7 @@ class Mode4Tab(ScrollableTab):
         
         self.status_label.config(text=f"AI Suggests: {self.ai_guess.upper()}. Click tiles to set colors.")
         
-        for c in range(5):
+        for c in range(self.app.word_length):
             label = self.helper_grid_labels[self.turn][c]
             label.config(text=self.ai_guess[c].upper(), bg=COLOR_GRAY, fg=COLOR_WHITE)
             label.bind("<Button-1>", lambda e, r=self.turn, col=c: self.on_tile_click(r, col))
@@ -623,16 +654,16 @@ class Mode4Tab(ScrollableTab):
         
         feedback_byg = "".join(self.tile_feedback)
         
-        if feedback_byg.count('B') == 5:
+        if feedback_byg.count('B') == self.app.word_length:
              if not messagebox.askyesno("Submit Feedback?", "You have marked all letters as Black (Gray). Is this correct?"):
                  return
         
         feedback_num = feedback_byg.replace('B', '0').replace('Y', '1').replace('G', '2')
 
-        for c in range(5):
+        for c in range(self.app.word_length):
             self.helper_grid_labels[self.turn][c].unbind("<Button-1>")
             
-        if feedback_byg == "GGGGG":
+        if feedback_byg == "G" * self.app.word_length:
             self.status_label.config(text=f"Congratulations! Solved in {self.turn + 1} turns.")
             self.update_list_text("Solved!")
             self.end_helper_game()
@@ -646,7 +677,10 @@ class Mode4Tab(ScrollableTab):
             return
 
         try:
-            self.ai_available_words = gameEngine.gameFilter(self.ai_guess, feedback_num, self.ai_available_words)
+            self.feedback_history.append((self.ai_guess, feedback_num))
+            helper_result = gameEngine.suggest_for_history(self.feedback_history, self.app.answer_index,
+                                                       self.strategy_var.get().lower())
+            self.ai_available_words = helper_result.candidates
             count = len(self.ai_available_words)
             
             if count == 0:
@@ -660,13 +694,7 @@ class Mode4Tab(ScrollableTab):
             else:
                 self.update_list_text(f"{count} words remaining.")
 
-            if count == 1:
-                self.ai_guess = self.ai_available_words[0]
-            elif gameEngine.isBlimp(self.ai_available_words):
-                self.status_label.config(text="Blimp condition detected. Finding filter word...")
-                self.ai_guess = gameEngine.blimpSearch(self.ai_available_words)
-            else:
-                self.ai_guess = gameEngine.getMaxValue1(self.ai_available_words)
+            self.ai_guess = helper_result.suggestion
                 
             self.display_ai_guess()
 
@@ -678,11 +706,11 @@ class Mode4Tab(ScrollableTab):
         self.game_over = True
         self.submit_button.config(state=tk.DISABLED)
         if self.turn < 6:
-            for c in range(5):
+            for c in range(self.app.word_length):
                 self.helper_grid_labels[self.turn][c].unbind("<Button-1>")
 
     def reset_row_feedback(self):
-        self.tile_feedback = ['B'] * 5 
+        self.tile_feedback = ['B'] * self.app.word_length 
         
     def update_list_text(self, message):
         self.word_list_text.config(state=tk.NORMAL)
@@ -699,6 +727,12 @@ class Mode5Tab(TextOutputTab):
         
         self.run_button = ttk.Button(top_frame, text="Run Full Simulation & Plot", command=self.run_sim)
         self.run_button.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(top_frame, text="Strategy:").pack(side=tk.LEFT, padx=5)
+        self.strategy_var = tk.StringVar(value="Hard")
+        self.strategy_selector = ttk.Combobox(top_frame, textvariable=self.strategy_var,
+                                              values=["Hard", "Expert", "Lookahead"], state="readonly", width=10)
+        self.strategy_selector.pack(side=tk.LEFT, padx=5)
         
         ttk.Label(top_frame, text="WARNING: This takes several minutes.", foreground="red").pack(side=tk.LEFT, padx=10)
         
@@ -715,7 +749,7 @@ class Mode5Tab(TextOutputTab):
             return
 
         self.run_button.config(state=tk.DISABLED, text="Running...")
-        self.run_function_in_thread(gameEngine.run_full_simulation_and_plot)
+        self.run_function_in_thread(gameEngine.run_full_simulation_and_plot, self.strategy_var.get().lower())
         self.output_text.bind("<<ThreadDone>>", self.on_thread_done_mode5)
 
     def on_thread_done_mode5(self, event=None):
@@ -723,6 +757,105 @@ class Mode5Tab(TextOutputTab):
         self.run_button.config(state=tk.NORMAL, text="Run Full Simulation & Plot")
 
 
+class AdversarialTab(ScrollableTab):
+    GRID_ROWS = 10
+
+    def __init__(self, parent, app):
+        super().__init__(parent)
+        self.app = app
+
+        self.title_label = tk.Label(self.scrollable_frame, text="ADVERSARIAL WORDLE", font=TITLE_FONT, bg=COLOR_BG, fg=COLOR_BLACK)
+        self.title_label.pack(pady=10)
+        tk.Label(self.scrollable_frame, text="No fixed answer: the host always picks the feedback that keeps the most words.",
+                 font=STATUS_FONT, bg=COLOR_BG).pack()
+
+        self.grid_frame = tk.Frame(self.scrollable_frame, bg=COLOR_BG)
+        self.grid_frame.pack(pady=10)
+        self.grid_labels = create_grid(self.grid_frame, self.app.word_length, self.GRID_ROWS)
+
+        self.input_frame = tk.Frame(self.scrollable_frame, bg=COLOR_BG)
+        self.input_frame.pack(pady=10)
+        tk.Label(self.input_frame, text="Enter Guess:", font=STATUS_FONT, bg=COLOR_BG).pack(side=tk.LEFT, padx=5)
+        self.guess_entry = tk.Entry(self.input_frame, width=7, font=GRID_FONT, justify='center')
+        self.guess_entry.pack(side=tk.LEFT, padx=5)
+        self.guess_entry.bind("<Return>", self.on_guess)
+
+        self.status_label = tk.Label(self.scrollable_frame, text="", font=STATUS_FONT, bg=COLOR_BG, fg=COLOR_BLACK)
+        self.status_label.pack(pady=5)
+
+        self.button_frame = ttk.Frame(self.scrollable_frame)
+        self.button_frame.pack(pady=10)
+        self.reset_button = ttk.Button(self.button_frame, text="New Game", command=self.start_new_game)
+        self.reset_button.pack(side=tk.LEFT, padx=5)
+        self.difficulty_var = tk.StringVar(value="Hard")
+        self.difficulty_selector = ttk.Combobox(self.button_frame, textvariable=self.difficulty_var,
+                                                values=["Easy", "Medium", "Hard"], state="readonly", width=10)
+        self.difficulty_selector.pack(side=tk.LEFT, padx=5)
+        self.ai_button = ttk.Button(self.button_frame, text="Watch AI Play", command=self.watch_ai)
+        self.ai_button.pack(side=tk.LEFT, padx=5)
+
+        self.start_new_game()
+
+    def start_new_game(self):
+        self.host = gameEngine.AdversarialHost(self.app.answer_index)
+        self.row = 0
+        clear_grid(self.grid_labels)
+        self.guess_entry.config(state=tk.NORMAL)
+        self.guess_entry.delete(0, tk.END)
+        self.status_label.config(text=f"{len(self.host.candidates)} words possible. Enter your first guess.")
+
+    def show_reply(self, guess, colors):
+        if self.row < len(self.grid_labels):
+            update_grid_row(self.grid_labels, self.row, guess, colors)
+        else:   # past the last row: scroll the grid up by one
+            for r in range(len(self.grid_labels) - 1):
+                for c, label in enumerate(self.grid_labels[r + 1]):
+                    self.grid_labels[r][c].config(text=label.cget("text"), bg=label.cget("bg"), fg=label.cget("fg"))
+            update_grid_row(self.grid_labels, len(self.grid_labels) - 1, guess, colors)
+        self.row += 1
+
+    def on_guess(self, event=None):
+        if self.host.solved():
+            return
+        guess = self.guess_entry.get().lower().strip()
+        self.guess_entry.delete(0, tk.END)
+        if len(guess) != self.app.word_length:
+            self.status_label.config(text=f"Guess must be {self.app.word_length} letters.")
+            return
+        if guess not in self.app.all_allowed_words:
+            self.status_label.config(text=f"'{guess}' is not in the word list.")
+            return
+
+        colors = self.host.respond(guess)
+        self.show_reply(guess, colors)
+        if self.host.solved():
+            self.status_label.config(text=f"You pinned it down in {self.row} guesses! 🎉")
+            self.guess_entry.config(state=tk.DISABLED)
+        else:
+            self.status_label.config(text=f"{len(self.host.candidates)} words still possible.")
+
+    def watch_ai(self):
+        self.start_new_game()
+        self.guess_entry.config(state=tk.DISABLED)
+        difficulty = self.difficulty_var.get().lower()
+        self.ai_candidates = self.host.candidates.copy()
+        self.ai_strategy = gameEngine.ADVERSARIAL_STRATEGIES[difficulty]
+        self.ai_button.config(state=tk.DISABLED)
+        self.app.root.after(300, self.run_ai_step, gameEngine.default_opener(self.app.answer_index))
+
+    def run_ai_step(self, guess):
+        colors = self.host.respond(guess)
+        self.show_reply(guess, colors)
+        if self.host.solved() or self.row >= gameEngine.ADVERSARIAL_MAX_TURNS:
+            result = f"solved in {self.row} guesses" if self.host.solved() else "gave up"
+            self.status_label.config(text=f"AI ({self.difficulty_var.get()}) {result} against the adversarial host.")
+            self.ai_button.config(state=tk.NORMAL)
+            return
+        self.status_label.config(text=f"{len(self.host.candidates)} words still possible. AI is thinking...")
+        self.ai_candidates.narrow(gameEngine.FeedbackConstraint.from_feedback(guess, colors))
+        self.app.root.after(500, self.run_ai_step, self.ai_strategy(self.ai_candidates))
+
+
 if __name__ == "__main__":
     root = tk.Tk()
     
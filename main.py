@@ -1,9 +1,27 @@
 import random
 import threading
+import functools
+import itertools
+import collections
+import cProfile
+import datetime
+import hashlib
+import json
 import math
+import os
 import re
 import time
 import sys
+import inspect
+import tracemalloc
+import weakref
+
+# numpy powers the vectorized feedback kernels; every kernel has a pure-Python fallback
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 # packages for Mode 5
 try:
@@ -21,9 +39,13 @@ YELLOW = "🟨"
 GREEN = "🟩"
 
 # --- Global Word Lists ---
+def _read_master_list(path):   #one word per line, as in the bundled word files
+    with open(path, "r") as f:
+        return [i[:-1] for i in f.readlines()]
+
 try:
-    GLOBAL_PERMANENT_ANSWERS = [i[:-1] for i in open("words.txt", "r").readlines()]
-    GLOBAL_WORDS_ALLOWED = [i[:-1] for i in open("wordsAllowed.txt", "r").readlines()]
+    GLOBAL_PERMANENT_ANSWERS = _read_master_list("words.txt")
+    GLOBAL_WORDS_ALLOWED = _read_master_list("wordsAllowed.txt")
 except FileNotFoundError:
     print("FATAL ERROR: words.txt or wordsAllowed.txt not found.")
     print("Please make sure the word list files are in the same directory as main.py")
@@ -35,14 +57,80 @@ permanent_answers = []
 wordsAllowed = []
 
 def _initialize_word_lists():
-    """Resets the global game lists from the master lists."""
+    """
+    Resets the global game lists from the master lists. Nothing mutates them (games narrow
+    CandidateSets instead), so they share the master lists rather than copying them.
+    """
     global available_words, permanent_answers, wordsAllowed
-    available_words = GLOBAL_PERMANENT_ANSWERS[:]
-    permanent_answers = GLOBAL_PERMANENT_ANSWERS[:]
-    wordsAllowed = GLOBAL_WORDS_ALLOWED[:]
+    available_words = GLOBAL_PERMANENT_ANSWERS
+    permanent_answers = GLOBAL_PERMANENT_ANSWERS
+    wordsAllowed = GLOBAL_WORDS_ALLOWED
     
     if not permanent_answers or not wordsAllowed:
         raise FileNotFoundError("Word lists could not be initialized. Check file paths.")
+
+def _read_word_file(path, word_length=None):   #lowercase alphabetic words of one length, in file order, without duplicates
+    with open(path, "r") as f:
+        words = [line.strip().lower() for line in f]
+    words = [word for word in words if word.isascii() and word.isalpha()]
+    if word_length is None and words:
+        word_length = collections.Counter(len(word) for word in words).most_common(1)[0][0]
+    return list(dict.fromkeys(word for word in words if len(word) == word_length)), word_length
+
+def load_word_lists(answers_path, allowed_path=None, word_length=None):
+    """
+    Replaces the master word lists, e.g. with a 4- to 8-letter variant or a large dictionary.
+    Only words of word_length letters are kept (default: the most common length in the answers
+    file). Without an allowed file every answer is also the only allowed guess. Returns the word length.
+    """
+    global GLOBAL_PERMANENT_ANSWERS, GLOBAL_WORDS_ALLOWED, _guess_index
+    answers, word_length = _read_word_file(answers_path, word_length)
+    allowed = _read_word_file(allowed_path, word_length)[0] if allowed_path else answers
+    if not answers:
+        raise ValueError(f"No {word_length}-letter words found in {answers_path}.")
+    GLOBAL_PERMANENT_ANSWERS = answers
+    GLOBAL_WORDS_ALLOWED = allowed
+    _guess_index = None
+    _openers.clear()
+    _initialize_word_lists()
+    return word_length
+
+def get_word_length(word_list=None):   #word length of a word store (default: the master answer list)
+    word_list = GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list
+    if isinstance(word_list, WordIndex):
+        return word_list.word_length
+    return len(word_list[0]) if word_list else 5
+
+_openers = {}
+_configured_opener = os.environ.get("WORDLE_OPENER", "").lower().strip() or None
+
+def set_opener(word=None):
+    """
+    Sets the first guess used by every mode (None restores the default). The word must be
+    an allowed guess; see analysis.py openers for a ranking of every candidate. Cached helper
+    suggestions start from the opener, so they are dropped too.
+    """
+    global _configured_opener
+    if word is not None:
+        word = word.lower().strip()
+        if word not in get_guess_index().word_ids:
+            raise ValueError(f"'{word}' is not in the list of allowed words.")
+    _configured_opener = word
+    _openers.clear()
+    _history_caches.clear()
+
+def default_opener(word_list=None):   #first guess: the configured opener, else 'salet' for the standard lists, else the best letter-frequency word
+    index = get_word_index(GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+    opener = _openers.get(index)
+    if opener is None:
+        if _configured_opener and len(_configured_opener) == index.word_length:
+            opener = _configured_opener
+        elif "salet" in get_guess_index().word_ids or not index.words:
+            opener = "salet"
+        else:
+            opener = getMaxValue1(CandidateSet(index))
+        _openers[index] = opener
+    return opener
         
 
 def get_letter_dictionary(word_list):   #gets a letter dictionary of the each letter and the number of times it appears in the word list
@@ -80,72 +168,26 @@ def repetition_filter(char, num_repetitions, wordList, exact):  #filters out wor
     return return_list
 
 def filter_words(return_list, guess, answer):   #returns a list of possible words left, given a guess and an answer
-    current_list = return_list[:]
     colors = get_guess_colors(guess, answer)
-    
-    exact_counts = {}
-    min_counts = {}
-    
-    for i in range(5):
-        char = guess[i]
-        
-        gy_count = 0
-        for j in range(5):
-            if guess[j] == char and colors[j] in ('G', 'Y'):
-                gy_count += 1
-        if gy_count > 0:
-            min_counts[char] = max(min_counts.get(char, 0), gy_count)
-            
-        if colors[i] == 'B' and char in min_counts:
-            exact_counts[char] = min_counts[char]
-            
-    temp_list = []
-    for word in current_list:
-        valid = True
-        
-        for i in range(5):
-            char = guess[i]
-            color = colors[i]
-            
-            if color == 'G':
-                if word[i] != char:
-                    valid = False
-                    break
-            elif color == 'Y':
-                if word[i] == char or char not in word:
-                    valid = False
-                    break
-            elif color == 'B':
-                if char not in min_counts and char in word:
-                    valid = False
-                    break
-                pass
-        
-        if not valid:
-            continue
-            
-        for char, count in min_counts.items():
-            if char in exact_counts:
-                if word.count(char) != exact_counts[char]:
-                    valid = False
-                    break
-            elif word.count(char) < count:
-                valid = False
-                break
-                
-        if valid:
-            temp_list.append(word)
-            
-    return temp_list
+    return FeedbackConstraint.from_feedback(guess, colors).apply(return_list)
 
 def filter(filterChar, position="any", repetitions="any", wordList="none"):
     returnList = []
     if type(position) == int:
-        if position < 0 or position > 4:
+        if position < 0 or position >= get_word_length(permanent_answers if wordList == "none" else wordList):
             raise RuntimeError("InvalidCharacterPosition")
     
     if wordList == "none":
-        wordList = permanent_answers[:] 
+        answer_index = get_word_index(permanent_answers)
+        if position != "any":
+            bits = answer_index.at_position(filterChar, position)
+            if repetitions != "any":
+                bits &= answer_index.exactly(filterChar, repetitions)
+        elif repetitions != "any":
+            bits = answer_index.exactly(filterChar, repetitions) & answer_index.containing(filterChar)
+        else:
+            bits = answer_index.containing(filterChar)
+        return answer_index.words_of(bits)
 
     for word in wordList:
         if position != "any":
@@ -163,7 +205,8 @@ def filter(filterChar, position="any", repetitions="any", wordList="none"):
 def inverseFilter(filterChar, wordList="none"): 
     returnList = []
     if wordList == "none":
-        wordList = permanent_answers[:]
+        answer_index = get_word_index(permanent_answers)
+        return answer_index.words_of(answer_index.all_bits & ~answer_index.containing(filterChar))
         
     for word in wordList:
         if filterChar not in word:
@@ -173,7 +216,8 @@ def inverseFilter(filterChar, wordList="none"):
 def wrongPositionFilter(filterChar, index, wordList="none"):
     returnList = []
     if wordList == "none":
-        wordList = permanent_answers[:]
+        answer_index = get_word_index(permanent_answers)
+        return answer_index.words_of(answer_index.all_bits & ~answer_index.at_position(filterChar, index))
         
     for word in wordList:
         if filterChar != word[index]:
@@ -184,7 +228,7 @@ def word_state_repetition_filter(word, wordState, word_list):
     repeatedChars = {i: word.count(i) for i in list(set(word)) if word.count(i) > 1}
     charRepetitions = {i: 0 for i in repeatedChars.keys()}
     for char in repeatedChars.keys():
-        for i in range(5):
+        for i in range(len(word)):
             if word[i] == char and wordState[i] != "0":
                 repeatedChars[char] -= 1
                 charRepetitions[char] += 1
@@ -201,15 +245,37 @@ def get_word_value(word, letter_dictionary, counted_word=""):
             counted_letters.append(letter)
     return value
 
-def isBlimp(wordList):
+# isBlimp thresholds: the candidate counts it considers, the positions every candidate must
+# share, how many letters a pair of candidates may differ in, and the share of pairs that
+# must have the same letters. Changed with set_blimp_params.
+BLIMP_DEFAULTS = {"min_size": 2, "max_size": 15, "fixed_positions": 2, "unshared_letters": 2, "pair_fraction": 0.5}
+BLIMP_PARAMS = dict(BLIMP_DEFAULTS)
+
+def set_blimp_params(**params):
+    """
+    Sets isBlimp thresholds for every strategy (no arguments restores BLIMP_DEFAULTS) and
+    drops cached helper suggestions made under the old ones. Returns the settings in use.
+    """
+    unknown = set(params) - set(BLIMP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown isBlimp parameter '{sorted(unknown)[0]}'. Use: {', '.join(BLIMP_DEFAULTS)}.")
+    BLIMP_PARAMS.clear()
+    BLIMP_PARAMS.update(BLIMP_DEFAULTS, **params)
+    _history_caches.clear()
+    return dict(BLIMP_PARAMS)
+
+def isBlimp(wordList, params=None):   #params: thresholds to use instead of BLIMP_PARAMS
+    params = BLIMP_PARAMS if params is None else params
     list_len = len(wordList)
-    if list_len < 2 or list_len > 15:
+    if list_len < max(2, params["min_size"]) or list_len > params["max_size"]:
         return False
+    if isinstance(wordList, CandidateSet):
+        wordList = wordList.words()
 
     if list_len > 1:
         fixed_positions = 0
         first_word = wordList[0]
-        for i in range(5):
+        for i in range(len(first_word)):
             letter = first_word[i]
             is_fixed = True
             for word in wordList[1:]:
@@ -219,20 +285,20 @@ def isBlimp(wordList):
             if is_fixed:
                 fixed_positions += 1
         
-        if fixed_positions >= 2:
+        if fixed_positions >= params["fixed_positions"]:
             return True
 
     if list_len < 3:
         return False
         
-    threshold = math.floor(list_len/2)
+    threshold = math.floor(list_len * params["pair_fraction"])
     commonLettersDict = {}
     for word1 in wordList:
         for word2 in wordList:
             if word2 == word1:
                 continue
             shared_letters = list(set(word1) & set(word2))
-            if len(shared_letters) >= 3: 
+            if len(shared_letters) >= len(word1) - params["unshared_letters"]:
                 commonLetters = ""
                 for letter in shared_letters:
                     commonLetters += letter
@@ -246,36 +312,46 @@ def isBlimp(wordList):
                     
     return False
     
-def blimpSearch(wordList):
+def blimpSearch(wordList, guess_pool=None):   #guess_pool: e.g. a HardModeGuesses set, default every allowed word
     global wordsAllowed
+    if isinstance(wordList, CandidateSet):
+        wordList = wordList.words()
+    if not wordList:
+        return getMaxValue1(wordList)
+
     best_guess = ""
     min_max_remaining_size = len(wordList) + 1
     avg_for_best = float(len(wordList) + 1)
 
-    candidate_guesses = list(set(wordsAllowed + wordList))
-
-    if not candidate_guesses:
-        return getMaxValue1(wordList) 
+    # Guessing 'candidate' against 'potential_answer' leaves exactly the words that share
+    # the answer's color pattern, so each outcome size is read off a partition of wordList
+    # instead of re-filtering a copy of it.
+    candidate_words = set(wordList)
+    # the guess index starts with wordsAllowed, so its ids below len(wordsAllowed) stand in for a second index
+    allowed_ids = (get_guess_index() if wordsAllowed is GLOBAL_WORDS_ALLOWED else get_word_index(wordsAllowed)).word_ids
+    allowed_count = len(wordsAllowed)
+    extra_guesses = [word for word in wordList if allowed_ids.get(word, allowed_count) >= allowed_count]
+
+    if guess_pool is None:
+        guesses = itertools.chain(wordsAllowed, extra_guesses)
+    else:
+        guesses = itertools.chain(guess_pool, [word for word in extra_guesses if word not in guess_pool])
 
-    for candidate in candidate_guesses:
-        max_remaining_size = 0
-        possible_outcome_sizes = []
-        
+    evaluated = 0
+    for candidate in guesses:
+        evaluated += 1
+        bucket_sizes = {}
+        patterns = []
         for potential_answer in wordList:
-            simulated_remaining_list = filter_words(wordList[:], candidate, potential_answer)
-            outcome_size = len(simulated_remaining_list)
-            possible_outcome_sizes.append(outcome_size)
+            colors = get_guess_colors(candidate, potential_answer)
+            patterns.append(colors)
+            bucket_sizes[colors] = bucket_sizes.get(colors, 0) + 1
 
-            if outcome_size > max_remaining_size:
-                max_remaining_size = outcome_size
-            
-            if max_remaining_size > min_max_remaining_size:
-                break
-        
+        max_remaining_size = max(bucket_sizes.values())
         if max_remaining_size > min_max_remaining_size:
             continue
 
-        current_avg = sum(possible_outcome_sizes) / len(possible_outcome_sizes)
+        current_avg = sum(bucket_sizes[colors] for colors in patterns) / len(patterns)
 
         if max_remaining_size < min_max_remaining_size:
             min_max_remaining_size = max_remaining_size
@@ -287,9 +363,12 @@ def blimpSearch(wordList):
                 avg_for_best = current_avg
                 best_guess = candidate
             elif current_avg == avg_for_best:
-                if (best_guess not in wordList) and (candidate in wordList):
+                if (best_guess not in candidate_words) and (candidate in candidate_words):
                     best_guess = candidate
 
+    if _stats_enabled:
+        _stats_counters["blimpSearch guesses evaluated"] += evaluated
+        _stats_counters["blimpSearch feedback computations"] += evaluated * len(wordList)
     if not best_guess:
         print("Warning: BlimpSearch fallback triggered.")
         return getMaxValue1(wordList) 
@@ -298,77 +377,460 @@ def blimpSearch(wordList):
 
 def getMaxValue1(wordList): #returns highest word by letter frequency
     if not wordList:
-        return "salet"
-    letterDictionary = get_letter_dictionary(wordList)
-    wordValues = {word:get_word_value(word, letterDictionary) for word in wordList}
-    if not wordValues: 
-        return wordList[0] 
-    return max(wordValues, key=wordValues.get)
+        return default_opener()
+    if isinstance(wordList, CandidateSet):
+        letterDictionary = wordList.letter_dictionary()
+    else:
+        letterDictionary = get_letter_dictionary(wordList)
+    return max(wordList, key=lambda word: get_word_value(word, letterDictionary))
+
+# --- Compiled Feedback Constraints ---
+
+_FEEDBACK_TO_STATE = str.maketrans("BYGbyg", "012012")
+
+def normalize_feedback(feedback):   #converts 'B'/'Y'/'G' colors to the numeric '0'/'1'/'2' word state used by gameFilter
+    return feedback.translate(_FEEDBACK_TO_STATE)
+
+def feedback_to_code(feedback):   #packs a feedback into one int (base 3, position 0 is the lowest digit)
+    return int(normalize_feedback(feedback)[::-1], 3)
+
+def code_to_feedback(code, word_length=5):   #inverse of feedback_to_code, returns the numeric word state
+    word_state = ""
+    for i in range(word_length):
+        word_state += "012"[code % 3]
+        code //= 3
+    return word_state
+
+class FeedbackConstraint:
+    """
+    Compiled form of one or more (guess, feedback) observations.
+    Keeps the required letter per position, the forbidden letters per position
+    and the min/exact count of each letter, so a word list is checked in a few
+    passes without re-deriving the rules per word.
+    """
+
+    def __init__(self, word_length=5):
+        self.word_length = word_length
+        self.required = {}       # position -> letter (green)
+        self.forbidden = {}      # position -> set of letters (yellow or gray)
+        self.min_counts = {}     # letter -> minimum number of occurrences
+        self.exact_counts = {}   # letter -> exact number of occurrences (0 = letter not in word)
+        self.history = []        # (guess, word_state) pairs compiled into this constraint
+        self.impossible = False
+        self._compiled = None
+
+    @classmethod
+    def from_feedback(cls, guess, feedback):
+        return cls(len(guess)).add(guess, feedback)
+
+    @classmethod
+    def from_history(cls, history, word_length=5):
+        constraint = cls(word_length)
+        for guess, feedback in history:
+            constraint.add(guess, feedback)
+        return constraint
+
+    def add(self, guess, feedback):
+        """Adds one guess and its feedback ('BYG' colors or '012' state). Returns self."""
+        word_state = normalize_feedback(feedback)
+        if len(guess) != self.word_length or len(word_state) != self.word_length:
+            raise ValueError(f"Guess and feedback must both be {self.word_length} characters long.")
+        if any(state not in "012" for state in word_state):
+            raise ValueError(f"Invalid feedback '{feedback}'. Use B/Y/G or 0/1/2.")
+
+        seen_counts = {}
+        gray_letters = set()
+        for i in range(self.word_length):
+            char = guess[i]
+            state = word_state[i]
+            if state == "2":
+                if self.required.get(i, char) != char:
+                    self.impossible = True
+                self.required[i] = char
+            else:
+                self.forbidden.setdefault(i, set()).add(char)
+            if state == "0":
+                gray_letters.add(char)
+            else:
+                seen_counts[char] = seen_counts.get(char, 0) + 1
+
+        for char, count in seen_counts.items():
+            self.min_counts[char] = max(self.min_counts.get(char, 0), count)
+        for char in gray_letters:
+            count = seen_counts.get(char, 0)
+            if self.exact_counts.get(char, count) != count:
+                self.impossible = True
+            self.exact_counts[char] = count
+
+        self.history.append((guess, word_state))
+        self._compiled = None
+        return self
+
+    def combine(self, other):
+        """Returns a new constraint holding the observations of both constraints."""
+        combined = FeedbackConstraint.from_history(self.history, self.word_length)
+        for guess, word_state in other.history:
+            combined.add(guess, word_state)
+        return combined
+
+    def copy(self):
+        return FeedbackConstraint.from_history(self.history, self.word_length)
+
+    def _compile(self):
+        absent = "".join(sorted(char for char, count in self.exact_counts.items() if count == 0))
+        required = tuple(sorted(self.required.items()))
+        forbidden = []
+        for i, letters in sorted(self.forbidden.items()):
+            letters = "".join(sorted(letters - set(absent)))
+            if i not in self.required and letters:
+                forbidden.append((i, letters))
+        counts = []
+        for char in sorted(set(self.min_counts) | set(self.exact_counts)):
+            minimum = self.min_counts.get(char, 0)
+            exact = self.exact_counts.get(char)
+            if exact is not None and minimum > exact:
+                self.impossible = True
+            if exact != 0:
+                counts.append((char, minimum, exact))
+        self._compiled = (absent, required, tuple(forbidden), tuple(counts))
+        return self._compiled
+
+    def matches(self, word):
+        absent, required, forbidden, counts = self._compiled or self._compile()
+        if self.impossible:
+            return False
+        for char in absent:
+            if char in word:
+                return False
+        for i, char in required:
+            if word[i] != char:
+                return False
+        for i, letters in forbidden:
+            if word[i] in letters:
+                return False
+        for char, minimum, exact in counts:
+            count = word.count(char)
+            if count < minimum or (exact is not None and count != exact):
+                return False
+        return True
+
+    def apply(self, word_list):
+        """
+        Returns the words of word_list consistent with every observation, in order. Each
+        check is its own list comprehension over the words left by the previous ones, most
+        selective first, so no per-word function call is made.
+        """
+        absent, required, forbidden, counts = self._compiled or self._compile()
+        if self.impossible:
+            return []
+        words = list(word_list)
+        for i, char in required:
+            words = [word for word in words if word[i] == char]
+        for char, minimum, exact in counts:
+            if exact is not None:
+                words = [word for word in words if word.count(char) == exact]
+            elif minimum == 1:
+                words = [word for word in words if char in word]
+            else:
+                words = [word for word in words if word.count(char) >= minimum]
+        for i, letters in forbidden:
+            words = [word for word in words if word[i] not in letters]
+        for char in absent:
+            words = [word for word in words if char not in word]
+        return words
+
+# --- Word Index (bitset postings) ---
+
+def _ids_to_bits(word_ids, size):   #packs a list of word ids into a bitset int (bit n set = word n present)
+    packed = bytearray((size + 7) // 8)
+    for word_id in word_ids:
+        packed[word_id >> 3] |= 1 << (word_id & 7)
+    return int.from_bytes(packed, "little")
+
+class WordIndex:
+    """
+    Inverted index over one word store, built once. Every posting is a Python int
+    used as a bitset (bit n = n-th word), so a feedback query is a handful of
+    AND / AND-NOT operations instead of a scan over the words.
+    """
+
+    def __init__(self, words, word_length=5):
+        self.words = tuple(words)
+        self.word_length = word_length
+        if any(len(word) != word_length for word in self.words):
+            raise ValueError(f"Every word in a word store must be {word_length} letters long.")
+        self.word_ids = {word: i for i, word in enumerate(self.words)}
+        self.all_bits = (1 << len(self.words)) - 1
+
+        position_ids = [{} for _ in range(word_length)]
+        count_ids = {}
+        for word_id, word in enumerate(self.words):
+            for i in range(word_length):
+                position_ids[i].setdefault(word[i], []).append(word_id)
+            for char in set(word):
+                for k in range(1, word.count(char) + 1):
+                    count_ids.setdefault((char, k), []).append(word_id)
+
+        size = len(self.words)
+        self.position_bits = [{char: _ids_to_bits(ids, size) for char, ids in postings.items()}
+                              for postings in position_ids]   # [position][letter] -> letter X at position i
+        self.count_bits = {key: _ids_to_bits(ids, size) for key, ids in count_ids.items()}   # (letter, k) -> X appears >= k times
+        self.letter_bits = {char: bits for (char, k), bits in self.count_bits.items() if k == 1}   # letter -> X anywhere
+        self._feedback_masks = {}   # (guess, colors) -> mask, shared by every game played on this store
+
+    def at_position(self, char, position):
+        return self.position_bits[position].get(char, 0)
+
+    def containing(self, char):
+        return self.letter_bits.get(char, 0)
+
+    def at_least(self, char, count):
+        if count <= 0:
+            return self.all_bits
+        return self.count_bits.get((char, count), 0)
+
+    def exactly(self, char, count):
+        return self.at_least(char, count) & ~self.at_least(char, count + 1)
+
+    def mask(self, constraint, bits=None):
+        """Returns the bitset of words (within bits, default all) consistent with the constraint."""
+        absent, required, forbidden, counts = constraint._compiled or constraint._compile()
+        if bits is None:
+            bits = self.all_bits
+        if constraint.impossible:
+            return 0
+        for i, char in required:
+            bits &= self.at_position(char, i)
+        for char in absent:
+            bits &= ~self.containing(char)
+        for i, letters in forbidden:
+            for char in letters:
+                bits &= ~self.at_position(char, i)
+        for char, minimum, exact in counts:
+            bits &= self.at_least(char, minimum)
+            if exact is not None:
+                bits &= ~self.at_least(char, exact + 1)
+        return bits
+
+    def hard_mode_mask(self, constraint, bits=None):
+        """Words (within bits) allowed by hard mode: revealed greens kept in place and every revealed letter reused."""
+        absent, required, forbidden, counts = constraint._compiled or constraint._compile()
+        if bits is None:
+            bits = self.all_bits
+        for i, char in required:
+            bits &= self.at_position(char, i)
+        for char, minimum, exact in counts:
+            bits &= self.at_least(char, minimum)
+        return bits
+
+    def feedback_mask(self, guess, colors):   #mask of words that give 'colors' for 'guess', cached per store
+        key = (guess, colors)
+        bits = self._feedback_masks.get(key)
+        if bits is None:
+            if len(self._feedback_masks) >= _FEEDBACK_MASK_CACHE_SIZE:
+                self._feedback_masks.clear()
+            bits = self.mask(FeedbackConstraint.from_feedback(guess, colors))
+            self._feedback_masks[key] = bits
+        return bits
+
+    def count(self, bits):
+        return bits.bit_count()
+
+    def ids(self, bits):   #yields the word ids set in bits, in word-store order
+        binary = bin(bits)[:1:-1]
+        word_id = binary.find("1")
+        while word_id != -1:
+            yield word_id
+            word_id = binary.find("1", word_id + 1)
+
+    def words_of(self, bits):
+        words = self.words
+        return [words[word_id] for word_id in self.ids(bits)]
+
+    def bits_of(self, word_list):
+        word_ids = self.word_ids
+        return _ids_to_bits([word_ids[word] for word in word_list if word in word_ids], len(self.words))
+
+_word_indexes = {}        # tuple of words -> WordIndex, least recently used first
+_word_index_stores = {}   # id(word store) -> (word store, WordIndex), so a store seen before is not hashed again
+_WORD_INDEX_CACHE_SIZE = 16
+_FEEDBACK_MASK_CACHE_SIZE = 50000
+_guess_index = None
+
+def get_word_index(word_list):   #returns the WordIndex for a word store, building it only the first time the store is seen
+    if isinstance(word_list, WordIndex):
+        return word_list
+    stored = _word_index_stores.get(id(word_list))
+    if stored is not None and stored[0] is word_list and len(word_list) == len(stored[1].words):   # word stores are never mutated
+        return stored[1]
+    key = tuple(word_list)
+    index = _word_indexes.pop(key, None)
+    if index is None:
+        _drop_word_indexes(_WORD_INDEX_CACHE_SIZE - 1)
+        index = WordIndex(key, len(key[0]) if key else 5)
+    _word_indexes[key] = index
+    if len(_word_index_stores) >= _WORD_INDEX_CACHE_SIZE:
+        _word_index_stores.pop(next(iter(_word_index_stores), None), None)
+    _word_index_stores[id(word_list)] = (word_list, index)
+    return index
+
+def _word_indexes_in_use():   #indexes tables, caches and sessions are keyed on: dropping them would only build duplicates
+    in_use = {_guess_index, getattr(_decision_tree, "index", None)}
+    in_use.update(index for key in list(_pattern_tables) for index in key)
+    in_use.update(index for index, _ in list(_history_caches))
+    in_use.update(list(_reverse_indexes))
+    in_use.update(store.answer_index for store in list(_session_stores))
+    stored = _word_index_stores.get(id(GLOBAL_PERMANENT_ANSWERS))
+    if stored is not None and stored[0] is GLOBAL_PERMANENT_ANSWERS:
+        in_use.add(stored[1])
+    return in_use
+
+def _drop_word_indexes(keep=0):   #forgets the least recently used indexes not in use until at most `keep` are cached
+    in_use = _word_indexes_in_use()
+    for key, index in list(_word_indexes.items()):
+        if len(_word_indexes) <= keep:
+            break
+        if index not in in_use:
+            _word_indexes.pop(key, None)
+            for store_id, (_, stored_index) in list(_word_index_stores.items()):
+                if stored_index is index:
+                    _word_index_stores.pop(store_id, None)
+
+def get_guess_index():   #WordIndex over every valid guess: wordsAllowed, then the answers missing from it
+    global _guess_index
+    if _guess_index is None:
+        allowed = set(GLOBAL_WORDS_ALLOWED)
+        _guess_index = get_word_index(GLOBAL_WORDS_ALLOWED + [word for word in GLOBAL_PERMANENT_ANSWERS if word not in allowed])
+    return _guess_index
+
+def word_list_hash(word_list):   #short fingerprint of a word store, used to key saved files to the lists they came from
+    return hashlib.sha1("\n".join(word_list).encode("utf-8")).hexdigest()[:16]
+
+class CandidateSet:
+    """
+    The remaining candidates of one game, as a bitset of word ids over a WordIndex.
+    It is passed by reference and narrowed in place; words are only looked up when
+    iterated, indexed or printed, so a game allocates no word lists of its own.
+    """
+
+    __slots__ = ("index", "bits")
+
+    def __init__(self, index, bits=None):
+        self.index = index
+        self.bits = index.all_bits if bits is None else bits
+
+    def narrow(self, constraint):
+        self.bits = self.index.mask(constraint, self.bits)
+        return self
+
+    def narrow_by_guess(self, guess, answer):   #same result as filter_words(list, guess, answer)
+        self.bits &= self.index.feedback_mask(guess, get_guess_colors(guess, answer))
+        return self
+
+    def copy(self):
+        return CandidateSet(self.index, self.bits)
+
+    def ids(self):
+        return self.index.ids(self.bits)
+
+    def words(self):
+        return self.index.words_of(self.bits)
+
+    def letter_dictionary(self):   #same counts as get_letter_dictionary(self.words()), read from the count postings
+        bits = self.bits
+        letter_dictionary = {}
+        for letter in "abcdefghijklmnopqrstuvwxyz":
+            total = 0
+            k = 1
+            while (letter, k) in self.index.count_bits:
+                total += (bits & self.index.count_bits[(letter, k)]).bit_count()
+                k += 1
+            letter_dictionary[letter] = total
+        return letter_dictionary
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __iter__(self):
+        words = self.index.words
+        for word_id in self.index.ids(self.bits):
+            yield words[word_id]
+
+    def __contains__(self, word):
+        word_id = self.index.word_ids.get(word)
+        return word_id is not None and (self.bits >> word_id) & 1 == 1
+
+    def __getitem__(self, position):   #n-th remaining word, so random.choice() and [0] work
+        if position < 0:
+            position += len(self)
+        if position < 0:
+            raise IndexError("CandidateSet index out of range")
+        for word in self:
+            if position == 0:
+                return word
+            position -= 1
+        raise IndexError("CandidateSet index out of range")
+
+    def __repr__(self):
+        return f"CandidateSet({len(self)} words)"
+
+class HardModeGuesses(CandidateSet):
+    """
+    The guesses still legal under hard mode, as a bitset over the guess index. Each turn's
+    feedback narrows it in place with a few posting ANDs, so the ~15k-word guess pool is
+    never rescanned.
+    """
+
+    __slots__ = ("constraint",)
+
+    def __init__(self, guess_index=None):
+        super().__init__(guess_index or get_guess_index())
+        self.constraint = FeedbackConstraint(self.index.word_length)
+
+    def add(self, guess, feedback):   #records one guess and its feedback ('BYG' or '012'); returns self
+        self.constraint.add(guess, feedback)
+        self.bits = self.index.hard_mode_mask(self.constraint, self.bits)
+        return self
+
+    def violation(self, guess):   #why guess breaks hard mode, or None if it is allowed
+        if guess in self:
+            return None
+        self.constraint._compiled or self.constraint._compile()
+        for i, char in sorted(self.constraint.required.items()):
+            if guess[i] != char:
+                return f"Hard mode: letter {i + 1} must be '{char.upper()}'."
+        for char, minimum in sorted(self.constraint.min_counts.items()):
+            if guess.count(char) < minimum:
+                return f"Hard mode: guess must contain '{char.upper()}'" + (f" {minimum} times." if minimum > 1 else ".")
+        return f"'{guess}' is not in the list of allowed words."
+
+    def copy(self):
+        copied = HardModeGuesses(self.index)
+        copied.constraint = self.constraint.copy()
+        copied.bits = self.bits
+        return copied
 
 def gameFilter(word, wordState, word_list):   #filters words using game output information
-    first_letter = int(wordState[0])
-    second_letter = int(wordState[1])
-    third_letter = int(wordState[2])
-    fourth_letter = int(wordState[3])
-    fifth_letter = int(wordState[4])
-    lettersInWord = [word[i] for i in range(0, 5) if wordState[i] == "1" or wordState[i] == "2"]
-    if first_letter == 0:
-        if word[0] not in lettersInWord:
-            word_list = inverseFilter(word[0], word_list)
-    elif first_letter == 1:
-        word_list = filter(word[0], wordList=word_list)
-        word_list = wrongPositionFilter(word[0], 0, word_list)
-    elif first_letter == 2:
-        word_list = filter(word[0], position=0, wordList=word_list)
-    if second_letter == 0:
-        if word[1] not in lettersInWord:
-            word_list = inverseFilter(word[1], word_list)
-    elif second_letter == 1:
-        word_list = filter(word[1], wordList=word_list)
-        word_list = wrongPositionFilter(word[1], 1, word_list)
-    elif second_letter == 2:
-        word_list = filter(word[1], position=1, wordList=word_list)
-    if third_letter == 0:
-        if word[2] not in lettersInWord:
-            word_list = inverseFilter(word[2], word_list)
-    elif third_letter == 1:
-        word_list = filter(word[2], wordList=word_list)
-        word_list = wrongPositionFilter(word[2], 2, word_list)
-    elif third_letter == 2:
-        word_list = filter(word[2], position=2, wordList=word_list)
-    if fourth_letter == 0:
-        if word[3] not in lettersInWord:
-            word_list = inverseFilter(word[3], word_list)
-    elif fourth_letter == 1:
-        word_list = filter(word[3], wordList=word_list)
-        word_list = wrongPositionFilter(word[3], 3, word_list)
-    elif fourth_letter == 2:
-        word_list = filter(word[3], position=3, wordList=word_list)
-    if fifth_letter == 0:
-        if word[4] not in lettersInWord:
-            word_list = inverseFilter(word[4], word_list)
-    elif fifth_letter == 1:
-        word_list = filter(word[4], wordList=word_list)
-        word_list = wrongPositionFilter(word[4], 4, word_list)
-    elif fifth_letter == 2:
-        word_list = filter(word[4], position=4, wordList=word_list)
-    if len(set(list(word))) != len(word):
-        word_list = word_state_repetition_filter(word, wordState, word_list)
-    return word_list
+    constraint = FeedbackConstraint.from_feedback(word, wordState)
+    if word_list == "none":
+        answer_index = get_word_index(permanent_answers)
+        return answer_index.words_of(answer_index.mask(constraint))
+    return constraint.apply(word_list)
 
 def get_guess_colors(guess, target_word):
-    if len(guess) != 5 or len(target_word) != 5:
+    word_length = len(target_word)
+    if len(guess) != word_length:
         return "Error"
 
-    colors = [''] * 5
+    colors = [''] * word_length
     target_list = list(target_word) 
 
-    for i in range(5):
+    for i in range(word_length):
         if guess[i] == target_list[i]:
             colors[i] = 'G'
             target_list[i] = None 
 
-    for i in range(5):
+    for i in range(word_length):
         if colors[i] == '':
             if guess[i] in target_list:
                 colors[i] = 'Y'
@@ -383,9 +845,652 @@ def format_colors_to_emoji(color_string):
     return "".join(emoji_map.get(char, char) for char in color_string)
 
 
+# --- Feedback Pattern Kernels ---
+
+_PATTERN_CHUNK_ROWS = 512   # guesses per vectorized block, keeps temporaries around 30 MB
+_FULL_TABLE_MAX_CELLS = 50_000_000   # build the whole guess x answer table up front when it is at most this big
+_PAIRWISE_MAX_CANDIDATES = 12   # up to this many candidates, comparing codes pairwise beats a bincount per guess
+
+def get_feedback_code(guess, answer):   #feedback of guess against answer as one int, see feedback_to_code
+    return feedback_to_code(get_guess_colors(guess, answer))
+
+def _letter_array(words, word_length):
+    return np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(len(words), word_length)
+
+def _pattern_dtype(word_length):
+    return np.uint8 if 3 ** word_length <= 256 else np.uint16
+
+def feedback_code_matrix(guesses, answers, word_length=5):
+    """
+    Feedback codes of every guess (rows) against every answer (columns), vectorized with numpy.
+    Same values as get_feedback_code, including Wordle's left-to-right handling of repeated letters.
+    """
+    dtype = _pattern_dtype(word_length)
+    guess_letters = _letter_array(guesses, word_length)
+    answer_columns = [_letter_array(answers, word_length)[None, :, k] for k in range(word_length)]
+    codes = np.zeros((len(guesses), len(answers)), dtype=dtype)
+    for start in range(0, len(guesses), _PATTERN_CHUNK_ROWS):
+        g = guess_letters[start:start + _PATTERN_CHUNK_ROWS]
+        same = [[g[:, i, None] == answer_columns[k] for k in range(word_length)] for i in range(word_length)]
+        not_green = [~same[k][k] for k in range(word_length)]
+        block = np.zeros((g.shape[0], len(answers)), dtype=dtype)
+        for i in range(word_length):
+            # a non-green letter is yellow while the answer still has unused copies of it:
+            # copies outside green positions, minus the non-green guesses of it further left
+            supply = np.zeros(block.shape, dtype=np.uint8)
+            for k in range(word_length):
+                supply += same[i][k] & not_green[k]
+            earlier = np.zeros(block.shape, dtype=np.uint8)
+            for j in range(i):
+                earlier += (g[:, j] == g[:, i])[:, None] & not_green[j]
+            yellow = not_green[i] & (earlier < supply)
+            block += (same[i][i].astype(dtype) * dtype(2) + yellow) * dtype(3 ** i)
+        codes[start:start + block.shape[0]] = block
+    return codes
+
+class PatternTable:
+    """
+    Feedback codes between a guess store and an answer store. Rows are computed on demand
+    (numpy when available, pure Python otherwise); full() builds the whole matrix at once,
+    precompute() only when it fits _FULL_TABLE_MAX_CELLS and the memory budget.
+    """
+
+    def __init__(self, guess_index, answer_index):
+        self.guess_index = guess_index
+        self.answer_index = answer_index
+        self.word_length = answer_index.word_length
+        self.matrix = None
+        self.on_demand = False   # set once the whole table is too big for the budget; rows stay on demand
+        self._rows = {}
+        self._answer_guess_ids = None
+        if NUMPY_AVAILABLE:
+            answer_letters = _letter_array(answer_index.words, self.word_length)
+            one_hot = answer_letters[:, :, None] == np.arange(ord("a"), ord("z") + 1, dtype=np.uint8)
+            # answers x 26, for getMaxValue1; float64 so the products run through BLAS (exact below 2**53)
+            self.letter_counts = one_hot.sum(axis=1).astype(np.float64)
+            self.letter_presence = (self.letter_counts > 0).astype(np.float64)
+
+    def full(self):
+        if self.matrix is None:
+            if NUMPY_AVAILABLE:
+                self.matrix = feedback_code_matrix(self.guess_index.words, self.answer_index.words, self.word_length)
+            else:
+                self.matrix = [self.row(guess_id) for guess_id in range(len(self.guess_index.words))]
+            self._rows = {}
+        return self.matrix
+
+    def precompute(self):   #full() if the table is small enough and fits the memory budget; returns whether it is built
+        if self.matrix is None and not self.on_demand:
+            cells = len(self.guess_index.words) * len(self.answer_index.words)
+            if cells <= _FULL_TABLE_MAX_CELLS and memory_budget_allows(cells if NUMPY_AVAILABLE else cells * 8):
+                self.full()
+            else:
+                self.on_demand = True
+        return self.matrix is not None
+
+    # the matrix is read into a local once: enforce_memory_budget() may drop it from another thread
+    def row(self, guess_id):
+        matrix = self.matrix
+        if matrix is not None:
+            return matrix[guess_id]
+        row = self._rows.get(guess_id)
+        if row is None:
+            guess = self.guess_index.words[guess_id]
+            if NUMPY_AVAILABLE:
+                row = feedback_code_matrix([guess], self.answer_index.words, self.word_length)[0]
+            else:
+                row = [get_feedback_code(guess, answer) for answer in self.answer_index.words]
+            self._rows[guess_id] = row
+        return row
+
+    def rows(self, guess_ids):   #numpy matrix of the given rows, in order
+        matrix = self.matrix
+        if matrix is not None:
+            return matrix[np.asarray(guess_ids, dtype=np.int64)]
+        return np.stack([self.row(guess_id) for guess_id in guess_ids])
+
+    def answer_guess_ids(self):   #guess id of every answer (numpy array, -1 if the answer is not a valid guess)
+        if self._answer_guess_ids is None:
+            guess_ids = self.guess_index.word_ids
+            self._answer_guess_ids = np.array([guess_ids.get(word, -1) for word in self.answer_index.words], dtype=np.int64)
+        return self._answer_guess_ids
+
+    def columns(self, answer_ids):   #every guess against the given answers (guesses x k)
+        matrix = self.matrix
+        if matrix is not None:
+            return np.take(matrix, np.asarray(answer_ids, dtype=np.int64), axis=1)   # much faster than fancy indexing
+        # a guesses x k block is cheap even when the full table would not fit in memory
+        return feedback_code_matrix(self.guess_index.words, [self.answer_index.words[i] for i in answer_ids],
+                                    self.word_length)
+
+_pattern_tables = {}
+
+def get_pattern_table(answer_index=None, guess_index=None):
+    answer_index = get_word_index(GLOBAL_PERMANENT_ANSWERS) if answer_index is None else get_word_index(answer_index)
+    guess_index = get_guess_index() if guess_index is None else get_word_index(guess_index)
+    key = (guess_index, answer_index)
+    table = _pattern_tables.get(key)
+    if _stats_enabled:
+        _stats_counters["pattern table hits" if table is not None else "pattern table misses"] += 1
+    if table is None:
+        table = _pattern_tables.setdefault(key, PatternTable(guess_index, answer_index))
+    return table
+
+def max_value_choice(table, masks):
+    """
+    Vectorized getMaxValue1 for many candidate masks at once (rows of a bool matrix over the
+    answers). Returns the chosen answer id per row, the first highest-valued word like max().
+    """
+    masks = np.atleast_2d(masks)
+    letter_dictionaries = masks.astype(np.float64) @ table.letter_counts   # states x 26
+    values = table.letter_presence @ letter_dictionaries.T                # answers x states
+    values = np.where(masks.T, values, -1)
+    return values.argmax(axis=0)
+
+def _bucket_count_blocks(table, candidate_ids):   #yields (first guess id, guesses x patterns bucket sizes) per block
+    patterns = table.columns(candidate_ids)
+    pattern_count = 3 ** table.word_length
+    offsets = np.arange(_PATTERN_CHUNK_ROWS, dtype=np.int64)[:, None] * pattern_count
+    for start in range(0, patterns.shape[0], _PATTERN_CHUNK_ROWS):
+        block = patterns[start:start + _PATTERN_CHUNK_ROWS]
+        block = block + offsets[:block.shape[0]]
+        counts = np.bincount(block.ravel(), minlength=block.shape[0] * pattern_count)
+        yield start, counts.reshape(block.shape[0], pattern_count)
+
+def partition_sizes(table, candidate_ids):
+    """
+    For every guess, the sum of squared bucket sizes it splits the candidates into
+    (sum over buckets of size**2), counted with one bincount per block of guesses.
+    Divided by the candidate count it is the expected number of candidates left.
+    """
+    squares = np.zeros(len(table.guess_index.words), dtype=np.int64)
+    for start, counts in _bucket_count_blocks(table, candidate_ids):
+        squares[start:start + counts.shape[0]] = (counts ** 2).sum(axis=1)
+    return squares
+
+def guess_entropies(table, candidate_ids):
+    """Expected information (bits) of every guess's feedback over the candidates, from the same bincounts."""
+    n = len(candidate_ids)
+    entropies = np.zeros(len(table.guess_index.words), dtype=np.float64)
+    sizes = np.arange(n + 1, dtype=np.float64)
+    size_log_size = sizes * np.log2(np.maximum(sizes, 1))   # lookup of c*log2(c) for every possible bucket size
+    for start, counts in _bucket_count_blocks(table, candidate_ids):
+        entropies[start:start + counts.shape[0]] = np.log2(n) - size_log_size[counts].sum(axis=1) / n
+    return entropies
+
+def entropy_choice(table, candidate_ids, pool_bits=None):
+    """
+    The guess id with the most expected information over the candidates; among equally
+    informative guesses one that could itself be the answer wins, then the lowest id.
+    pool_bits (a bitset over the guess index, e.g. hard mode) limits the guesses considered.
+    """
+    entropies = guess_entropies(table, candidate_ids)
+    guess_ids = table.guess_index.word_ids
+    is_candidate = np.zeros(len(entropies), dtype=bool)
+    for answer_id in candidate_ids:
+        guess_id = guess_ids.get(table.answer_index.words[answer_id])
+        if guess_id is not None:
+            is_candidate[guess_id] = True
+    if pool_bits is not None:
+        in_pool = np.zeros(len(entropies), dtype=bool)
+        in_pool[list(table.guess_index.ids(pool_bits))] = True
+        entropies = np.where(in_pool | is_candidate, entropies, -1.0)
+    best = np.flatnonzero(entropies >= entropies.max() - 1e-9)
+    preferred = best[is_candidate[best]]
+    return int(preferred[0]) if len(preferred) else int(best[0])
+
+def blimp_search_choice(table, candidate_ids):
+    """
+    Vectorized blimpSearch: scores every guess by the largest and the total bucket size it
+    leaves over the candidates, with blimpSearch's order and tie-breaking.
+    """
+    candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+    patterns = table.columns(candidate_ids)                                # guesses x k
+    bucket_sizes = (patterns[:, :, None] == patterns[:, None, :]).sum(axis=2)
+    worst = bucket_sizes.max(axis=1)
+    total = bucket_sizes.sum(axis=1)
+
+    guess_ids = table.guess_index.word_ids
+    candidate_words = [table.answer_index.words[answer_id] for answer_id in candidate_ids]
+    # blimpSearch draws from wordsAllowed plus the candidates themselves; the default guess
+    # index is exactly wordsAllowed followed by the answers missing from it
+    pool_size = len(GLOBAL_WORDS_ALLOWED) if table.guess_index is get_guess_index() else len(table.guess_index.words)
+    in_pool = np.zeros(len(table.guess_index.words), dtype=bool)
+    in_pool[:pool_size] = True
+    is_candidate = np.zeros(len(table.guess_index.words), dtype=bool)
+    for word in candidate_words:
+        if word in guess_ids:
+            in_pool[guess_ids[word]] = True
+            is_candidate[guess_ids[word]] = True
+
+    worst = np.where(in_pool, worst, np.iinfo(np.int64).max)
+    best = np.flatnonzero((worst == worst.min()) & in_pool)
+    best = best[total[best] == total[best].min()]
+    preferred = best[is_candidate[best]]
+    return int(preferred[0]) if len(preferred) else int(best[0])
+
+
+# --- Engine Stats (hot-path counters and timers) ---
+
+# Off by default, and free while off: enable_stats() swaps the functions below for timed
+# wrappers (the engine calls them by name, so the swap reaches every caller) and turns on
+# the counters kept at the cache lookups. Times are inclusive of nested timed calls.
+STATS_FUNCTIONS = {   # function -> position of the argument whose length counts as words scanned
+    "filter_words": 0,
+    "gameFilter": 2,
+    "CandidateSet.narrow_by_guess": 0,
+    "isBlimp": 0,
+    "blimpSearch": 0,
+    "getMaxValue1": 0,
+    "get_expert_guess": 0,
+    "get_lookahead_guess": 0,
+}
+STATS_CACHES = ["history", "pattern table", "lookahead pick", "lookahead bucket"]   # counted as "<name> hits" / "<name> misses"
+STATS_CACHE_SUFFIXES = (" hits", " misses")
+_stats_enabled = False
+_stats_functions = {}   # name -> [calls, seconds, words scanned, True results]
+_stats_counters = collections.Counter()
+_stats_originals = {}   # name -> the unwrapped function, while stats are on
+
+def _timed(name, function, words_position):
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        words = args[words_position] if len(args) > words_position else None
+        words = len(words) if words is not None and not isinstance(words, str) else 0
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        entry = _stats_functions.setdefault(name, [0, 0.0, 0, 0])
+        entry[0] += 1
+        entry[1] += time.perf_counter() - start
+        entry[2] += words
+        entry[3] += result is True
+        return result
+    return timed
+
+def enable_stats(reset=True):
+    """Starts counting calls, words scanned, candidates evaluated, cache hits and time per function."""
+    global _stats_enabled
+    if reset:
+        reset_stats()
+    if _stats_enabled:
+        return
+    for name, words_position in STATS_FUNCTIONS.items():
+        owner, _, attribute = name.rpartition(".")
+        namespace = globals()[owner] if owner else this_module
+        _stats_originals[name] = getattr(namespace, attribute)
+        setattr(namespace, attribute, _timed(name, _stats_originals[name], words_position))
+    _stats_enabled = True
+
+def disable_stats():
+    """Restores the plain functions; the numbers collected so far stay readable."""
+    global _stats_enabled
+    for name, function in _stats_originals.items():
+        owner, _, attribute = name.rpartition(".")
+        setattr(globals()[owner] if owner else this_module, attribute, function)
+    _stats_originals.clear()
+    _stats_enabled = False
+
+def reset_stats():
+    _stats_functions.clear()
+    _stats_counters.clear()
+
+def stats_snapshot():
+    """
+    The numbers collected since the last reset: {"enabled", "functions": {name: {"calls",
+    "seconds", "ms_per_call", "words_scanned"}}, "counters": {name: count}, "caches": {name:
+    {"hits", "misses", "hit_rate"}}}.
+    """
+    functions = {name: {"calls": calls, "seconds": seconds, "ms_per_call": seconds / calls * 1000 if calls else 0.0,
+                        "words_scanned": words}
+                 for name, (calls, seconds, words, _) in sorted(_stats_functions.items(), key=lambda item: -item[1][1])}
+    counters = {name: count for name, count in _stats_counters.items() if not name.endswith(STATS_CACHE_SUFFIXES)}
+    if "isBlimp" in _stats_functions:
+        counters["blimp mode triggered"] = _stats_functions["isBlimp"][3]
+    caches = {name: (_stats_counters[name + STATS_CACHE_SUFFIXES[0]], _stats_counters[name + STATS_CACHE_SUFFIXES[1]])
+              for name in STATS_CACHES}
+    return {"enabled": _stats_enabled, "functions": functions, "counters": counters,
+            "caches": {name: {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+                       for name, (hits, misses) in caches.items() if hits + misses}}
+
+def format_stats(snapshot=None):
+    snapshot = stats_snapshot() if snapshot is None else snapshot
+    lines = ["--- Engine Stats ---", f"{'function':30}{'calls':>10}{'total s':>10}{'ms/call':>10}{'words scanned':>15}"]
+    for name, entry in snapshot["functions"].items():
+        lines.append(f"{name:30}{entry['calls']:>10}{entry['seconds']:>10.2f}{entry['ms_per_call']:>10.3f}{entry['words_scanned']:>15}")
+    for name, count in snapshot["counters"].items():
+        lines.append(f"{name}: {count}")
+    for name, cache in snapshot["caches"].items():
+        lines.append(f"{name} cache: {cache['hits']} hits, {cache['misses']} misses ({cache['hit_rate'] * 100:.1f}% hit rate)")
+    return "\n".join(lines)
+
+# --- Profiling (pstats and collapsed stacks for flame graphs) ---
+
+PROFILE_DIR = "profiles"
+PROFILE_SAMPLE_INTERVAL = 0.001   # seconds between stack samples
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack at an interval, counting each stack below stop_frame."""
+
+    def __init__(self, thread_id, stop_frame, interval=PROFILE_SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.stop_frame = stop_frame
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.stop_frame:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+def profile_run(function, *args, label="run", metadata=None, directory=PROFILE_DIR, **kwargs):
+    """
+    Calls function(*args, **kwargs) under cProfile while a sampler records its call stacks.
+    Writes <name>.pstats, <name>.collapsed (one "frame;frame;... samples" line per stack, for
+    flamegraph.pl, speedscope and the like; the root frame carries the run label) and
+    <name>.json with the metadata (word-list hashes, opener and whatever `metadata` adds)
+    to `directory`. Returns (the function's result, {"pstats", "collapsed", "metadata"} paths).
+    """
+    metadata = {"label": label, "answers_hash": word_list_hash(GLOBAL_PERMANENT_ANSWERS),
+                "guesses_hash": word_list_hash(GLOBAL_WORDS_ALLOWED), "opener": default_opener(),
+                "created": datetime.datetime.now().isoformat(timespec="seconds"), **(metadata or {})}
+    tags = [str(metadata[key]) for key in ("strategy", "opener") if metadata.get(key)]
+    name = "-".join([label, *tags, metadata["answers_hash"][:8], datetime.datetime.now().strftime("%Y%m%d-%H%M%S")])
+    paths = {extension: os.path.join(directory, f"{name}.{extension}") for extension in ("pstats", "collapsed", "json")}
+    os.makedirs(directory, exist_ok=True)
+
+    profiler = cProfile.Profile()
+    sampler = _StackSampler(threading.get_ident(), sys._getframe())
+    start = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        result = function(*args, **kwargs)
+    finally:
+        profiler.disable()
+        sampler.stop()
+        metadata["seconds"] = round(time.perf_counter() - start, 3)
+        metadata["samples"] = sum(sampler.stacks.values())
+        profiler.dump_stats(paths["pstats"])
+        root = " ".join(f"{key}={value}" for key, value in metadata.items()
+                        if key in ("label", "strategy", "opener", "answers_hash")).replace(";", ",")
+        with open(paths["collapsed"], "w") as f:
+            for stack, count in sorted(sampler.stacks.items()):
+                f.write(f"{root};{stack} {count}\n")
+        with open(paths["json"], "w") as f:
+            json.dump({**metadata, "files": paths}, f, indent=1)
+        print(f"\nProfile ({metadata['seconds']:.1f} s, {metadata['samples']} stack samples) written to "
+              f"{paths['pstats']} and {paths['collapsed']}")
+    return result, {"pstats": paths["pstats"], "collapsed": paths["collapsed"], "metadata": paths["json"]}
+
+# --- Memory Accounting and Budget ---
+
+# memory_usage() estimates what each subsystem holds from the objects themselves, cheap enough
+# to run between games; memory_report() adds tracemalloc's measurement, charging every live
+# allocation to the innermost function of MEMORY_SUBSYSTEMS in its traceback. With a budget
+# (set_memory_budget() or WORDLE_MEMORY_BUDGET=64MB), enforce_memory_budget() frees caches,
+# cheapest to rebuild first, and whole pattern tables give way to rows computed on demand.
+MEMORY_SUBSYSTEMS = {   # subsystem -> functions whose allocations it owns ("name.py": the whole module)
+    "word store": ["_read_master_list", "_read_word_file", "load_word_lists"],
+    "indexes": ["WordIndex.__init__", "get_word_index", "ReverseIndex.__init__"],
+    "pattern tables": ["PatternTable.__init__", "PatternTable.full", "PatternTable.row", "PatternTable.answer_guess_ids"],
+    "caches": ["WordIndex.feedback_mask", "HistoryCache._node", "ReverseIndex.grid_bits",
+               "_lookahead_search", "get_lookahead_guess"],
+    "sessions": ["sessions.py"],
+}
+MEMORY_EVICTION_ORDER = ["feedback masks", "pattern rows", "reverse grids", "history",
+                         "lookahead", "word indexes", "full tables"]   # cheapest to rebuild first
+MEMORY_CHECK_INTERVAL = 10.0   # seconds between the budget checks made while games run
+MEMORY_TRACE_FRAMES = 25
+MEMORY_WALK_ATTEMPTS = 3   # object walks of caches growing under them before memory_usage() gives up
+_memory_budget = None
+_memory_checked_at = 0.0
+_session_stores = weakref.WeakSet()   # SessionStores reported under "sessions"
+
+def register_session_store(store):   #called by sessions.SessionStore, so its memory shows up in the report
+    _session_stores.add(store)
+
+def _object_bytes(objects, seen):   #size of the objects and of everything inside their dicts, lists, tuples and sets
+    total = 0
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen:   # shared objects are charged once, to the first subsystem holding them
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif NUMPY_AVAILABLE and isinstance(obj, np.ndarray) and obj.base is not None:
+            total += obj.nbytes   # a view (e.g. an on-demand row) keeps its data alive
+    return total
+
+def _index_parts(index):
+    return [index, index.words, index.word_ids, index.position_bits, index.count_bits, index.letter_bits]
+
+def _history_parts(cache):   #every node of a HistoryCache with its bitset and children
+    parts = []
+    with cache._lock:
+        stack = [cache.root]
+        while stack:
+            node = stack.pop()
+            parts += [node, node.bits, node.children]
+            stack.extend(node.children.values())
+    return parts
+
+def _retry_walk(walk):   #walk() again when a cache that server threads are filling changes size under it
+    for attempt in range(MEMORY_WALK_ATTEMPTS):
+        try:
+            return walk()
+        except RuntimeError:   # dictionary changed size during iteration
+            if attempt == MEMORY_WALK_ATTEMPTS - 1:
+                raise
+
+def memory_usage():
+    """
+    Estimated bytes per subsystem: {"word store", "indexes", "pattern tables", "caches",
+    "sessions"}. Objects shared between subsystems count once, for the first of them.
+    Takes tens of milliseconds once the pattern table is built: keep it off event loops.
+    """
+    return _retry_walk(_memory_usage)
+
+def _memory_usage():
+    seen = set()
+    indexes = list(_word_indexes.values())
+    reverse_indexes = list(_reverse_indexes.values())
+    tables = list(_pattern_tables.values())
+    usage = {"word store": _object_bytes([GLOBAL_PERMANENT_ANSWERS, GLOBAL_WORDS_ALLOWED, available_words,
+                                          permanent_answers, wordsAllowed], seen)}
+    usage["indexes"] = _object_bytes([part for index in indexes for part in _index_parts(index)]
+                                     + [part for reverse_index in reverse_indexes for part in (reverse_index, reverse_index.pattern_counts,
+                                                                                               reverse_index.pattern_bits)], seen)
+    usage["pattern tables"] = _object_bytes([part for table in tables for part in (table, table.matrix, table._rows, table._answer_guess_ids,
+                                                                                   getattr(table, "letter_counts", None),
+                                                                                   getattr(table, "letter_presence", None))], seen)
+    caches = [_lookahead_buckets, _lookahead_picks] + [index._feedback_masks for index in indexes]
+    caches += [reverse_index._grid_bits for reverse_index in reverse_indexes]
+    for cache in list(_history_caches.values()):
+        caches += _history_parts(cache)
+    usage["caches"] = _object_bytes(caches, seen)
+    usage["sessions"] = sum(store.memory_usage() for store in list(_session_stores))
+    return usage
+
+def start_memory_tracing(frames=MEMORY_TRACE_FRAMES):
+    """
+    Starts tracemalloc for memory_report(). Only later allocations are traced: run with
+    PYTHONTRACEMALLOC=25 to also see the word lists read at import.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+def stop_memory_tracing():
+    tracemalloc.stop()
+
+def _memory_owners():   #filename -> [(first line, last line, subsystem)] for the entries of MEMORY_SUBSYSTEMS
+    owners = collections.defaultdict(list)
+    for subsystem, names in MEMORY_SUBSYSTEMS.items():
+        for name in names:
+            if name.endswith(".py"):
+                module = sys.modules.get(name[:-3])
+                if module is not None:
+                    owners[module.__file__].append((0, math.inf, subsystem))
+                continue
+            owner, _, attribute = name.rpartition(".")
+            code = inspect.unwrap(getattr(globals()[owner] if owner else this_module, attribute)).__code__
+            lines = [line for _, _, line in code.co_lines() if line is not None]
+            owners[code.co_filename].append((min(lines), max(lines), subsystem))
+    return owners
+
+def _traced_memory():   #live bytes per subsystem according to tracemalloc, "other" for the rest of the process
+    owners = _memory_owners()
+    traced = dict.fromkeys([*MEMORY_SUBSYSTEMS, "other"], 0)
+    for statistic in tracemalloc.take_snapshot().statistics("traceback"):
+        subsystem = "other"
+        for frame in reversed(statistic.traceback):   # most recent call first
+            owner = next((name for first, last, name in owners.get(frame.filename, ()) if first <= frame.lineno <= last), None)
+            if owner is not None:
+                subsystem = owner
+                break
+        traced[subsystem] += statistic.size
+    return traced
+
+def memory_report():
+    """
+    {"estimated": memory_usage(), "traced": tracemalloc's bytes per subsystem (None unless
+    tracing, see start_memory_tracing()), "budget": the budget in bytes or None}.
+    """
+    return {"estimated": memory_usage(), "traced": _traced_memory() if tracemalloc.is_tracing() else None,
+            "budget": _memory_budget}
+
+def _format_bytes(size):
+    return f"{size / 1024 ** 2:.1f} MB"
+
+def format_memory_report(report=None):
+    report = memory_report() if report is None else report
+    traced = report["traced"] or {}
+    lines = ["--- Engine Memory ---", f"{'subsystem':20}{'estimated':>12}" + (f"{'traced':>12}" if traced else "")]
+    for subsystem in dict.fromkeys([*report["estimated"], *traced]):
+        estimated = report["estimated"].get(subsystem)
+        lines.append(f"{subsystem:20}{_format_bytes(estimated) if estimated is not None else '':>12}"
+                     + (f"{_format_bytes(traced[subsystem]):>12}" if traced else ""))
+    total = sum(report["estimated"].values())
+    lines.append(f"{'total (estimated)':20}{_format_bytes(total):>12}")
+    if report["budget"] is not None:
+        lines.append(f"budget: {_format_bytes(report['budget'])} ({total / report['budget'] * 100:.0f}% used)")
+    return "\n".join(lines)
+
+def parse_memory_size(size):   #bytes from 1048576, "512KB", "64MB" or "1.5GB" (units of 1024)
+    if isinstance(size, (int, float)):
+        return int(size)
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMG]?)B?", str(size).strip().upper())
+    if not match:
+        raise ValueError(f"Invalid memory size '{size}'. Use a number of bytes or a size like 64MB.")
+    return int(float(match.group(1)) * {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}[match.group(2)])
+
+def set_memory_budget(budget):
+    """
+    Caps the engine's memory (bytes or a size like "64MB"; None lifts the cap). Caches over it
+    are freed right away and checked again while games run. Returns the caches freed.
+    """
+    global _memory_budget
+    _memory_budget = None if budget is None else parse_memory_size(budget)
+    for table in list(_pattern_tables.values()):
+        table.on_demand = False   # decided again, against the new budget, by the next precompute()
+    return enforce_memory_budget()
+
+def memory_budget_allows(extra_bytes):   #whether allocating extra_bytes more keeps the engine within its budget
+    return _memory_budget is None or sum(memory_usage().values()) + extra_bytes <= _memory_budget
+
+def _cache_parts(name):   #the objects _evict(name) lets go of
+    if name == "feedback masks":
+        return [index._feedback_masks for index in list(_word_indexes.values())]
+    if name == "pattern rows":
+        return [table._rows for table in list(_pattern_tables.values())]
+    if name == "reverse grids":
+        return [reverse_index._grid_bits for reverse_index in list(_reverse_indexes.values())]
+    if name == "history":
+        return [part for cache in list(_history_caches.values()) for part in _history_parts(cache)]
+    if name == "lookahead":
+        return [_lookahead_buckets, _lookahead_picks]
+    if name == "word indexes":
+        in_use = _word_indexes_in_use()
+        return [part for index in list(_word_indexes.values()) if index not in in_use for part in _index_parts(index)]
+    return [table.matrix for table in list(_pattern_tables.values())]   # "full tables"
+
+def _cache_bytes(name):   #what _evict(name) frees; the words it shares with the master lists stay
+    return _retry_walk(lambda: _object_bytes(_cache_parts(name), {id(word) for words in (GLOBAL_PERMANENT_ANSWERS, GLOBAL_WORDS_ALLOWED)
+                                                                   for word in words}))
+
+def _evict(name):   #frees one cache of MEMORY_EVICTION_ORDER
+    if name == "feedback masks":
+        for index in list(_word_indexes.values()):
+            index._feedback_masks.clear()
+    elif name == "pattern rows":
+        for table in list(_pattern_tables.values()):
+            table._rows = {}
+    elif name == "reverse grids":
+        for reverse_index in list(_reverse_indexes.values()):
+            reverse_index._grid_bits.clear()
+    elif name == "history":
+        for cache in list(_history_caches.values()):
+            cache.clear()
+    elif name == "lookahead":
+        _lookahead_buckets.clear()
+        _lookahead_picks.clear()
+    elif name == "word indexes":
+        _drop_word_indexes()
+    elif name == "full tables":   # from here on their rows are computed on demand
+        for table in list(_pattern_tables.values()):
+            if table.matrix is not None:
+                table.matrix = None
+                table.on_demand = True
+
+def enforce_memory_budget(budget=None):
+    """
+    Frees caches in MEMORY_EVICTION_ORDER until memory_usage() fits the budget (default: the
+    one set by set_memory_budget()). Helper sessions count towards the total but are only
+    evicted by their own SessionStore budget. Returns the names of the caches freed.
+    """
+    budget = _memory_budget if budget is None else parse_memory_size(budget)
+    freed = []
+    if budget is None:
+        return freed
+    usage = sum(memory_usage().values())   # walked once; each eviction then subtracts what it frees
+    for name in MEMORY_EVICTION_ORDER:
+        if usage <= budget:
+            break
+        usage -= _cache_bytes(name)
+        _evict(name)
+        freed.append(name)
+    if _stats_enabled:
+        _stats_counters["memory evictions"] += len(freed)
+    return freed
+
+def check_memory_budget():   #enforce_memory_budget() at most every MEMORY_CHECK_INTERVAL seconds; free without a budget
+    global _memory_checked_at
+    if _memory_budget is not None and time.monotonic() - _memory_checked_at >= MEMORY_CHECK_INTERVAL:
+        _memory_checked_at = time.monotonic()
+        enforce_memory_budget()
+
 # --- MODE 1: AI vs. Random Word ---
 
-def run_ai_simulation(n):
+def run_ai_simulation(n, profile=False):   #profile: write pstats and collapsed stacks of the run (see profile_run)
+    if profile:
+        return profile_run(run_ai_simulation, n, label="mode1", metadata={"strategy": "hard", "games": n})[0]
     print(f"\n--- Starting AI Simulation ({n} games) ---")
     game_data = {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0, "6": 0, "DNF": 0}
 
@@ -396,17 +1501,19 @@ def run_ai_simulation(n):
         return
 
     global available_words, permanent_answers, wordsAllowed # Use the lists initialized
+    answer_index = get_word_index(permanent_answers)
     
     for i in range(n):
         print(f"\n--- Game {i+1} ---")
-        current_available_words = permanent_answers[:] 
+        check_memory_budget()
+        current_available_words = CandidateSet(answer_index)
         test_word = random.choice(permanent_answers)
         print(f"Target Word: {test_word}")
         guess_history = []
         steps = 0
 
         # --- First Guess ---
-        guessWord = "salet"
+        guessWord = default_opener()
         steps = 1
         guess_history.append(guessWord)
         colors = get_guess_colors(guessWord, test_word)
@@ -418,7 +1525,7 @@ def run_ai_simulation(n):
             game_data.update({str(steps): game_data[str(steps)] + 1})
             continue 
 
-        current_available_words = filter_words(current_available_words, guessWord, test_word)
+        current_available_words.narrow_by_guess(guessWord, test_word)
         print(f"  Remaining possible words: {len(current_available_words)}")
         if test_word not in current_available_words and len(current_available_words) > 0:
              print(f"  ***Warning: Target word '{test_word}' was filtered out!***")
@@ -451,7 +1558,7 @@ def run_ai_simulation(n):
                 solved = True
                 break 
 
-            current_available_words = filter_words(current_available_words, guessWord, test_word)
+            current_available_words.narrow_by_guess(guessWord, test_word)
             print(f"  Remaining possible words: {len(current_available_words)}")
             if test_word not in current_available_words and len(current_available_words) > 0:
                 print(f"  ***Warning: Target word '{test_word}' was filtered out!***")
@@ -482,7 +1589,7 @@ def run_ai_simulation(n):
 
         print(f"Guess History for game {i+1}: {guess_history}")
         if not solved:
-            print(f"Remaining possibilities: {current_available_words}")
+            print(f"Remaining possibilities: {current_available_words.words()}")
 
     print("\n--- Overall Results ---")
     total_games = sum(game_data.values())
@@ -499,6 +1606,10 @@ def run_ai_simulation(n):
     print(f"Results (Steps: Count): {game_data}")
     print(f"Success Rate: {success_rate * 100:.2f}%")
     print(f"Average Steps (for successful games): {avg_steps:.4f}")
+    if _stats_enabled:
+        print("\n" + format_stats())
+    if _memory_budget is not None or tracemalloc.is_tracing():
+        print("\n" + format_memory_report())
 
 
 # --- MODE 2: AI vs. User-Defined Word ---
@@ -514,8 +1625,8 @@ def solve_specific_word(target_word):
     
     target_word = target_word.lower().strip()
 
-    if len(target_word) != 5:
-        print(f"Error: '{target_word}' is not 5 letters long.")
+    if len(target_word) != get_word_length():
+        print(f"Error: '{target_word}' is not {get_word_length()} letters long.")
         return
 
     if target_word not in permanent_answers:
@@ -523,14 +1634,14 @@ def solve_specific_word(target_word):
         return
 
     # --- Simulation Logic ---
-    current_available_words = permanent_answers[:]
+    current_available_words = CandidateSet(get_word_index(permanent_answers))
     steps = 0
     guess_history = []
 
     print(f"Target Word: {target_word}")
 
     # --- First Guess ---
-    guess = "salet"
+    guess = default_opener()
     steps = 1
     guess_history.append(guess)
     colors = get_guess_colors(guess, target_word) 
@@ -542,10 +1653,10 @@ def solve_specific_word(target_word):
         print(f"History: {guess_history}")
         return
 
-    current_available_words = filter_words(current_available_words, guess, target_word)
+    current_available_words.narrow_by_guess(guess, target_word)
     print(f"  Remaining possible words: {len(current_available_words)}")
     if target_word not in current_available_words and len(current_available_words) > 0:
-         print(f"Warning: Target word '{target_word}' was filtered out! List: {current_available_words[:10]}")
+         print(f"Warning: Target word '{target_word}' was filtered out! List: {current_available_words.words()[:10]}")
 
     # --- Subsequent Guesses (Loop) ---
     for j in range(5):
@@ -573,15 +1684,15 @@ def solve_specific_word(target_word):
             print(f"History: {guess_history}")
             return
 
-        current_available_words = filter_words(current_available_words, guess, target_word)
+        current_available_words.narrow_by_guess(guess, target_word)
         print(f"  Remaining possible words: {len(current_available_words)}")
         if target_word not in current_available_words and len(current_available_words) > 0:
-            print(f"Warning: Target word '{target_word}' was filtered out! List: {current_available_words[:10]}")
+            print(f"Warning: Target word '{target_word}' was filtered out! List: {current_available_words.words()[:10]}")
 
     if steps != -1 and guess != target_word:
         print(f"Failed to solve in 6 steps.")
         print(f"History: {guess_history}")
-        print(f"Remaining possibilities: {current_available_words}")
+        print(f"Remaining possibilities: {current_available_words.words()}")
 
 
 # --- MODE 3: Human VS AI Wordle ---
@@ -593,7 +1704,7 @@ def get_random_guess(wordList):
     This is the "dumbest" strategy.
     """
     if not wordList:
-         return "salet" # Fallback
+         return default_opener() # Fallback
     return random.choice(wordList)
 
 def get_medium_guess(wordList):
@@ -604,27 +1715,238 @@ def get_medium_guess(wordList):
     'blimpSearch' to solve tricky edge cases.
     """
     if not wordList:
-         return "salet" # Fallback
+         return default_opener() # Fallback
     if len(wordList) == 1:
         return wordList[0]
     return getMaxValue1(wordList)
 
-def get_hard_guess(wordList):
+def get_hard_guess(wordList, hard_mode_guesses=None):
     """
     AI STRATEGY: HARD (The original, best algorithm)
     Uses the high-frequency guess (getMaxValue1) and also the
     advanced 'blimpSearch' to handle difficult "blimp" scenarios.
+    Under hard mode, blimpSearch only draws from hard_mode_guesses
+    (the other branches already pick a possible answer, which is always legal).
     """
     if not wordList:
-         return "salet" # Fallback
+         return default_opener() # Fallback
     if len(wordList) == 1:
         return wordList[0]
     if isBlimp(wordList):
          print("(AI detected blimp condition)")
-         return blimpSearch(wordList)
+         return blimpSearch(wordList, hard_mode_guesses)
     else:
          return getMaxValue1(wordList)
 
+def get_expert_guess(wordList, hard_mode_guesses=None):
+    """
+    AI STRATEGY: EXPERT
+    Scores every allowed guess by the expected information (entropy) of its
+    feedback over the remaining answers, using vectorized bincounts over the
+    pattern table, and picks the most informative one. Under hard mode only
+    hard_mode_guesses (and the remaining answers) are considered.
+    """
+    if not wordList:
+         return default_opener() # Fallback
+    if len(wordList) <= 2:
+        return wordList[0]
+    if isinstance(wordList, CandidateSet):
+        candidates = wordList
+    else:
+        index = get_word_index(GLOBAL_PERMANENT_ANSWERS)
+        if not all(word in index.word_ids for word in wordList):
+            index = get_word_index(wordList)
+        candidates = CandidateSet(index, index.bits_of(wordList))
+
+    if not NUMPY_AVAILABLE:   # pure Python: score only the remaining answers
+        def entropy(guess):
+            bucket_sizes = collections.Counter(get_guess_colors(guess, answer) for answer in candidates)
+            return -sum(size * math.log2(size / len(candidates)) for size in bucket_sizes.values())
+        if _stats_enabled:
+            _stats_counters["expert guesses scored"] += len(candidates)
+        return max(candidates, key=entropy)
+
+    table = get_pattern_table(candidates.index)
+    table.precompute()
+    pool_bits = hard_mode_guesses.bits if hard_mode_guesses is not None else None
+    candidate_ids = np.fromiter(candidates.ids(), dtype=np.int64)
+    if _stats_enabled:
+        _stats_counters["expert guesses scored"] += len(table.guess_index.words)
+    return table.guess_index.words[entropy_choice(table, candidate_ids, pool_bits)]
+
+LOOKAHEAD_WIDTH = 40                # first-ply guesses searched per move, most informative first
+LOOKAHEAD_MAX_EVALUATIONS = 400     # node budget: second-ply bucket searches per move
+LOOKAHEAD_MAX_SECONDS = 2.0         # time budget per move
+_LOOKAHEAD_CACHE_SIZE = 200_000
+_lookahead_buckets = {}   # (answer store, bucket, hard mode) -> estimated guesses to solve the bucket
+_lookahead_picks = {}     # (answer store, candidate bits, hard-mode pool bits) -> chosen guess
+lookahead_stats = {"moves": 0, "seconds": 0.0, "evaluations": 0, "cached_moves": 0}
+
+def _estimated_guesses(size):   #rough guesses a state of 'size' candidates still needs: 1, 1.5, then ~1 + log2(size) / 2
+    size = max(size, 1)
+    return max((2 * size - 1) / size, 1 + 0.5 * math.log2(size))
+
+def _reply_cost(table, bucket_ids, hard_mode):
+    """
+    Estimated total guesses to solve every answer of a bucket: the best reply (a reply that
+    is the answer costs just itself) plus _estimated_guesses for each part it leaves.
+    Under hard mode only the bucket's own words are tried as replies.
+    """
+    m = len(bucket_ids)
+    if m <= 2:
+        return 2 * m - 1
+    size_cost = np.array([size * _estimated_guesses(size) for size in range(m + 1)])   # size -> size * guesses
+    answer_guess_ids = table.answer_guess_ids()[bucket_ids]
+    own_rows = np.take(table.rows(answer_guess_ids), bucket_ids, axis=1)
+    sizes = (own_rows[:, :, None] == own_rows[:, None, :]).sum(axis=2)   # part size seen by each answer
+    best = m + (size_cost[sizes] / sizes).sum(axis=1).min() - 1
+    if hard_mode or best <= 2 * m - 1 + 1e-9:   # a reply telling all the others apart cannot be beaten
+        return best
+    costs = np.zeros(len(table.guess_index.words), dtype=np.float64)
+    if m <= _PAIRWISE_MAX_CANDIDATES:
+        patterns = table.columns(bucket_ids)
+        sizes = (patterns[:, :, None] == patterns[:, None, :]).sum(axis=2)
+        costs[:] = (size_cost[sizes] / sizes).sum(axis=1)
+    else:
+        for start, counts in _bucket_count_blocks(table, bucket_ids):
+            costs[start:start + counts.shape[0]] = size_cost[counts].sum(axis=1)
+    costs[answer_guess_ids] -= 1
+    return min(best, m + costs.min())
+
+def _lookahead_search(candidates, pool_bits=None):   #returns (guess, second-ply evaluations) for get_lookahead_guess
+    start = time.perf_counter()
+    table = get_pattern_table(candidates.index)
+    table.precompute()
+    ids = np.fromiter(candidates.ids(), dtype=np.int64)
+    answer_guess_ids = table.answer_guess_ids()[ids]
+    order_scores = -guess_entropies(table, ids)
+    order_scores[answer_guess_ids] -= 1e-9   # equally informative: a possible answer first
+    if pool_bits is not None:
+        in_pool = np.zeros(len(order_scores), dtype=bool)
+        in_pool[list(table.guess_index.ids(pool_bits))] = True
+        in_pool[answer_guess_ids] = True
+        order_scores[~in_pool] = np.inf
+    first_ply = np.argsort(order_scores, kind="stable")[:LOOKAHEAD_WIDTH]
+    rows = np.take(table.rows(first_ply), ids, axis=1)
+    solved_code = 3 ** table.word_length - 1
+    hard_mode = pool_bits is not None
+
+    best, best_guess = math.inf, int(first_ply[0])
+    evaluations = 0
+    for i, (guess_id, codes) in enumerate(zip(first_ply.tolist(), rows)):
+        if i > 0 and (evaluations >= LOOKAHEAD_MAX_EVALUATIONS or time.perf_counter() - start >= LOOKAHEAD_MAX_SECONDS):
+            break
+        order = np.argsort(codes, kind="stable")
+        splits = np.flatnonzero(np.diff(codes[order])) + 1
+        buckets = [ids[part] for part in np.split(order, splits) if codes[part[0]] != solved_code]
+        buckets.sort(key=len, reverse=True)
+        remaining_bound = sum(2 * len(bucket) - 1 for bucket in buckets)   # every bucket solved as fast as possible
+        total = 0.0
+        for bucket in buckets:
+            remaining_bound -= 2 * len(bucket) - 1
+            key = (candidates.index, bucket.tobytes(), hard_mode)
+            cost = _lookahead_buckets.get(key)
+            if _stats_enabled:
+                _stats_counters["lookahead bucket hits" if cost is not None else "lookahead bucket misses"] += 1
+            if cost is None:
+                if len(_lookahead_buckets) >= _LOOKAHEAD_CACHE_SIZE:
+                    _lookahead_buckets.clear()
+                cost = _lookahead_buckets[key] = _reply_cost(table, bucket, hard_mode)
+                evaluations += 1
+            total += cost
+            if total + remaining_bound >= best - 1e-9:
+                break
+        else:
+            best, best_guess = total, guess_id
+    return table.guess_index.words[best_guess], evaluations
+
+def get_lookahead_guess(wordList, hard_mode_guesses=None):
+    """
+    AI STRATEGY: LOOKAHEAD
+    Two-ply search: the LOOKAHEAD_WIDTH most informative guesses are each scored by the
+    guesses still needed after the best reply in every feedback bucket (estimated from the
+    sizes of the parts the reply leaves), and the lowest total wins. A guess is dropped once its
+    buckets so far plus a lower bound for the rest cannot beat the best, and the search stops
+    at the node or time budget. Bucket results and picks are cached across moves and games;
+    lookahead_stats keeps the measured cost.
+    """
+    if not wordList:
+         return default_opener() # Fallback
+    if len(wordList) <= 2:
+        return wordList[0]
+    if isinstance(wordList, CandidateSet):
+        candidates = wordList
+    else:
+        index = get_word_index(GLOBAL_PERMANENT_ANSWERS)
+        if not all(word in index.word_ids for word in wordList):
+            index = get_word_index(wordList)
+        candidates = CandidateSet(index, index.bits_of(wordList))
+
+    start = time.perf_counter()
+    pool_bits = hard_mode_guesses.bits if hard_mode_guesses is not None else None
+    key = (candidates.index, candidates.bits, pool_bits)
+    guess = _lookahead_picks.get(key)
+    if _stats_enabled:
+        _stats_counters["lookahead pick hits" if guess is not None else "lookahead pick misses"] += 1
+    if guess is not None:
+        lookahead_stats["cached_moves"] += 1
+    elif not NUMPY_AVAILABLE:   # pure Python: two plies over the remaining answers only
+        words = candidates.words()
+        def parts(guess, answers):   #answers grouped by feedback, without the one the guess solves
+            groups = collections.defaultdict(list)
+            for answer in answers:
+                if answer != guess:
+                    groups[get_guess_colors(guess, answer)].append(answer)
+            return groups.values()
+        def entropy(guess):
+            return -sum(len(part) * math.log2(len(part) / len(words)) for part in parts(guess, words)) - (guess in words)
+        def reply_cost(bucket):
+            return len(bucket) + min(sum(len(part) * _estimated_guesses(len(part)) for part in parts(reply, bucket))
+                                     for reply in bucket)
+        first_ply = sorted(words, key=lambda word: -entropy(word))[:LOOKAHEAD_WIDTH]
+        guess = min(first_ply, key=lambda guess: sum(reply_cost(bucket) for bucket in parts(guess, words)))
+    else:
+        guess, evaluations = _lookahead_search(candidates, pool_bits)
+        lookahead_stats["evaluations"] += evaluations
+    if len(_lookahead_picks) >= _LOOKAHEAD_CACHE_SIZE:
+        _lookahead_picks.clear()
+    _lookahead_picks[key] = guess
+    lookahead_stats["moves"] += 1
+    lookahead_stats["seconds"] += time.perf_counter() - start
+    return guess
+
+def lookahead_cost():   #one line on the lookahead strategy's measured cost per move so far
+    moves = lookahead_stats["moves"]
+    if not moves:
+        return "Lookahead: no moves yet."
+    return (f"Lookahead: {lookahead_stats['seconds'] / moves * 1000:.1f} ms per move over {moves} moves, "
+            f"{lookahead_stats['evaluations'] / moves:.1f} second-ply searches per move, "
+            f"{lookahead_stats['cached_moves'] / moves * 100:.0f}% answered from cache")
+
+def _pick_hard_game_guess(candidates, hard_mode_guesses=None):   #returns (guess, "blimp" or "frequency") for Hard games
+    if isBlimp(candidates):
+        return blimpSearch(candidates, hard_mode_guesses), "blimp"
+    return getMaxValue1(candidates), "frequency"
+
+# Strategies that play whole games: name -> function(candidates, hard_mode_guesses) -> guess.
+# Mode 5 and the tournament in analysis.py play these; use_decision_tree adds "optimal".
+GAME_STRATEGIES = {
+    "easy": lambda candidates, hard_mode_guesses=None: get_random_guess(candidates),
+    "medium": lambda candidates, hard_mode_guesses=None: get_medium_guess(candidates),
+    "hard": lambda candidates, hard_mode_guesses=None: _pick_hard_game_guess(candidates, hard_mode_guesses)[0],
+    "expert": lambda candidates, hard_mode_guesses=None: get_expert_guess(candidates, hard_mode_guesses),
+    "lookahead": lambda candidates, hard_mode_guesses=None: get_lookahead_guess(candidates, hard_mode_guesses),
+}
+
+def latency_percentiles(seconds, percentiles=(50, 90, 99)):
+    """Nearest-rank percentiles of a list of durations, in milliseconds: {50: ..., 90: ..., 99: ..., "max": ...}."""
+    ordered = sorted(seconds)
+    if not ordered:
+        return {**{p: 0.0 for p in percentiles}, "max": 0.0}
+    result = {p: ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] * 1000 for p in percentiles}
+    result["max"] = ordered[-1] * 1000
+    return result
+
 # --- MODE 3: Human VS AI Wordle ---
 
 def play_human_vs_ai():
@@ -638,20 +1960,23 @@ def play_human_vs_ai():
     
     # --- New Difficulty Prompt ---
     while True:
-        difficulty = input("Choose difficulty (easy/medium/hard): ").lower().strip()
-        if difficulty in ['easy', 'medium', 'hard']:
+        difficulty = input("Choose difficulty (easy/medium/hard/expert/lookahead): ").lower().strip()
+        if difficulty in ['easy', 'medium', 'hard', 'expert', 'lookahead']:
             break
         else:
-            print("Invalid input. Please type 'easy', 'medium', or 'hard'.")
+            print("Invalid input. Please type 'easy', 'medium', 'hard', 'expert', or 'lookahead'.")
+    hard_mode = input("Play with hard mode rules (revealed hints must be used)? (y/n): ").lower().strip().startswith("y")
 
     target_word = random.choice(permanent_answers)
     print("\n--- Human vs AI Wordle ---")
-    print(f"Difficulty: {difficulty.capitalize()}")
+    print(f"Difficulty: {difficulty.capitalize()}" + (" (hard mode)" if hard_mode else ""))
     # print(f"(DEBUG: The word is {target_word})")
 
     human_guesses_history = []
     ai_guesses_history = []
-    ai_available_words = permanent_answers[:]
+    ai_available_words = CandidateSet(get_word_index(permanent_answers))
+    human_hard_guesses = HardModeGuesses()
+    ai_hard_guesses = HardModeGuesses() if hard_mode else None
 
     # --- Game Loop ---
     for turn in range(1, 7):
@@ -660,14 +1985,17 @@ def play_human_vs_ai():
         # --- Human Turn ---
         while True:
             human_guess = input(f"Your guess ({turn}/6): ").lower().strip()
-            if len(human_guess) != 5:
-                print("Guess must be 5 letters long.")
+            if len(human_guess) != get_word_length():
+                print(f"Guess must be {get_word_length()} letters long.")
             elif human_guess not in wordsAllowed and human_guess not in permanent_answers:
                  print(f"'{human_guess}' is not in the list of allowed words.")
+            elif hard_mode and human_hard_guesses.violation(human_guess):
+                 print(human_hard_guesses.violation(human_guess))
             else:
                 break
 
         human_colors = get_guess_colors(human_guess, target_word)
+        human_hard_guesses.add(human_guess, human_colors)
         human_emoji = format_colors_to_emoji(human_colors)
         human_guesses_history.append(f"{human_guess} -> {human_emoji}")
         print(f"Your result: {human_emoji}")
@@ -680,17 +2008,17 @@ def play_human_vs_ai():
         # --- AI Turn ---
         print("AI is thinking...")
         if turn == 1:
-            ai_guess = "salet"
+            ai_guess = default_opener()
         else:
             if ai_guesses_history:
                  last_ai_guess = ai_guesses_history[-1].split(" ")[0]
                  # Filter AI list based on its *own* last guess
-                 ai_available_words = filter_words(ai_available_words[:], last_ai_guess, target_word)
+                 ai_available_words.narrow_by_guess(last_ai_guess, target_word)
                  # print(f"(AI Debug: Remaining words: {len(ai_available_words)})")
 
             if not ai_available_words:
                  print("AI Error: No possible words left for AI!")
-                 ai_guess = "salet" # Use fallback
+                 ai_guess = default_opener() # Use fallback
             
             # --- AI Difficulty Logic ---
             # Call the correct function based on the chosen difficulty
@@ -699,13 +2027,21 @@ def play_human_vs_ai():
             elif difficulty == 'medium':
                 ai_guess = get_medium_guess(ai_available_words)
             elif difficulty == 'hard':
-                ai_guess = get_hard_guess(ai_available_words)
+                ai_guess = get_hard_guess(ai_available_words, ai_hard_guesses)
+            elif difficulty == 'expert':
+                ai_guess = get_expert_guess(ai_available_words, ai_hard_guesses)
+            elif difficulty == 'lookahead':
+                move_start = time.perf_counter()
+                ai_guess = get_lookahead_guess(ai_available_words, ai_hard_guesses)
+                print(f"(AI lookahead search took {(time.perf_counter() - move_start) * 1000:.0f} ms)")
             # --- End AI Difficulty Logic ---
 
 
         ai_colors = get_guess_colors(ai_guess, target_word)
         ai_emoji = format_colors_to_emoji(ai_colors)
         ai_guesses_history.append(f"{ai_guess} -> {ai_emoji}")
+        if ai_hard_guesses is not None:
+            ai_hard_guesses.add(ai_guess, ai_colors)
 
         # Removed the 'easy'/'hard' check for hiding the guess.
         # Now it always shows the AI's guess.
@@ -730,6 +2066,337 @@ def play_human_vs_ai():
 
 # --- MODE 4: Wordle Helper AI ---
 
+# --- Stateless Helper API ---
+
+HelperResult = collections.namedtuple("HelperResult", ["candidates", "suggestion", "strategy"])
+
+def _pick_helper_guess(candidates):   #returns (guess, strategy branch) for the helper's Hard strategy
+    if not candidates:
+        return None, "none"
+    if len(candidates) == 1:
+        return candidates[0], "single"
+    if isBlimp(candidates):
+        return blimpSearch(candidates), "blimp"
+    return getMaxValue1(candidates), "frequency"
+
+def _pick_expert_guess(candidates):   #returns (guess, strategy branch) for the helper's Expert strategy
+    if not candidates:
+        return None, "none"
+    if len(candidates) == 1:
+        return candidates[0], "single"
+    return get_expert_guess(candidates), "entropy"
+
+def _pick_lookahead_guess(candidates):   #returns (guess, strategy branch) for the helper's Lookahead strategy
+    if not candidates:
+        return None, "none"
+    if len(candidates) == 1:
+        return candidates[0], "single"
+    return get_lookahead_guess(candidates), "lookahead"
+
+HELPER_STRATEGIES = {"hard": _pick_helper_guess, "expert": _pick_expert_guess, "lookahead": _pick_lookahead_guess}
+
+class _HistoryNode:
+    __slots__ = ("bits", "suggestion", "strategy", "children", "parent", "key", "last_used")
+
+    def __init__(self, bits, parent=None, key=None):
+        self.bits = bits
+        self.suggestion = None
+        self.strategy = None
+        self.children = {}
+        self.parent = parent
+        self.key = key
+        self.last_used = 0
+
+class HistoryCache:
+    """
+    Trie over (guess, word_state) histories for one word store. Each node keeps the
+    candidate bitset after its prefix and, once asked for, the suggested guess, so a
+    query only computes the part of its history that no earlier query has seen.
+    Least recently used branches are evicted once the trie holds max_nodes nodes.
+    """
+
+    def __init__(self, index, opener=None, max_nodes=20000, picker=_pick_helper_guess):
+        self.index = index
+        self.picker = picker
+        self.opener = opener or default_opener(index)
+        self.max_nodes = max_nodes
+        self.root = _HistoryNode(index.all_bits)
+        self.root.suggestion = self.opener
+        self.root.strategy = "opener"
+        self.node_count = 1
+        self.hits = 0
+        self.misses = 0
+        self._clock = 0
+        self._lock = threading.RLock()
+
+    def _node(self, history):
+        self._clock += 1
+        node = self.root
+        node.last_used = self._clock
+        for guess, feedback in history:
+            word_state = normalize_feedback(feedback)
+            key = (guess, word_state)
+            child = node.children.get(key)
+            if _stats_enabled:
+                _stats_counters["history hits" if child is not None else "history misses"] += 1
+            if child is None:
+                self.misses += 1
+                child = _HistoryNode(node.bits & self.index.feedback_mask(guess, feedback), node, key)
+                node.children[key] = child
+                self.node_count += 1
+            else:
+                self.hits += 1
+            child.last_used = self._clock
+            node = child
+        return node
+
+    def candidates(self, history):
+        with self._lock:
+            node = self._node(history)
+            words = self.index.words_of(node.bits)
+            if self.node_count > self.max_nodes:
+                self._evict()
+            return words
+
+    def suggest(self, history):
+        with self._lock:
+            node = self._node(history)
+            if node.strategy is None:
+                node.suggestion, node.strategy = self.picker(CandidateSet(self.index, node.bits))
+            result = HelperResult(self.index.words_of(node.bits), node.suggestion, node.strategy)
+            if self.node_count > self.max_nodes:
+                self._evict()
+            return result
+
+    def _evict(self):   #drops the coldest nodes (and their subtrees) until the trie is back to 90% of max_nodes
+        nodes = []
+        stack = list(self.root.children.values())
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(node.children.values())
+        nodes.sort(key=lambda node: node.last_used)
+        target = int(self.max_nodes * 0.9)
+        for node in nodes:
+            if self.node_count <= target:
+                break
+            if node.parent is None:
+                continue   # already removed together with an ancestor
+            self.node_count -= self._detach(node)
+
+    def _detach(self, node):   #unlinks node from the trie and returns the size of its subtree
+        del node.parent.children[node.key]
+        size = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            node.parent = None
+            size += 1
+            stack.extend(node.children.values())
+        return size
+
+    def clear(self):
+        with self._lock:
+            self.root.children = {}
+            self.node_count = 1
+
+_history_caches = {}
+
+def suggest_for_history(history, word_list=None, strategy="hard"):
+    """
+    Stateless helper API: given a list of (guess, feedback) pairs, with feedback as 'BYG'
+    colors or '012' states, returns HelperResult(candidates, suggestion, strategy).
+    strategy picks the AI ('hard', 'expert' or 'lookahead'). Results are shared between callers
+    through a HistoryCache per word store and strategy.
+    """
+    check_memory_budget()
+    return _history_cache_for(word_list, strategy).suggest(history)
+
+def candidates_for_history(history, word_list=None):   #same as suggest_for_history(...).candidates, without picking a guess
+    check_memory_budget()
+    return _history_cache_for(word_list).candidates(history)
+
+def suggest_batch(histories, word_list=None, include_candidates=False, strategy="hard"):
+    """
+    Batched suggest_for_history: answers many helper states in one call. Identical histories
+    are computed once, every history prefix is filtered once per depth with one vectorized
+    comparison against the pattern table, and frequency picks for all states share one
+    matrix product. Returns one HelperResult per history, in order; candidates is None
+    unless include_candidates is set.
+    """
+    check_memory_budget()
+    index = get_word_index(GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+    if strategy not in HELPER_STRATEGIES:
+        raise ValueError(f"Unknown helper strategy '{strategy}'. Use one of: {', '.join(HELPER_STRATEGIES)}.")
+    keys = [tuple((guess, normalize_feedback(feedback)) for guess, feedback in history) for history in histories]
+    if not NUMPY_AVAILABLE:
+        results = {}
+        for key in keys:
+            if key not in results:
+                result = suggest_for_history(key, index, strategy)
+                results[key] = result if include_candidates else result._replace(candidates=None)
+        return [results[key] for key in keys]
+
+    table = get_pattern_table(index)
+    guess_ids = table.guess_index.word_ids
+    unique_keys = list(dict.fromkeys(keys))
+
+    # --- feedback filtering, one vectorized step per history depth ---
+    masks = {(): np.ones(len(index.words), dtype=bool)}
+    for depth in range(1, max((len(key) for key in unique_keys), default=0) + 1):
+        prefixes = list(dict.fromkeys(key[:depth] for key in unique_keys if len(key) >= depth))
+        for guess, word_state in (prefix[-1] for prefix in prefixes):
+            FeedbackConstraint.from_feedback(guess, word_state)   # validates the history entry
+        guesses = [prefix[-1][0] for prefix in prefixes]
+        rows = table.rows([guess_ids.get(guess, 0) for guess in guesses])
+        for i, guess in enumerate(guesses):
+            if guess not in guess_ids:   # accepted by suggest_for_history too; its row is computed directly
+                rows[i] = feedback_code_matrix([guess], index.words, index.word_length)[0]
+        codes = np.array([feedback_to_code(prefix[-1][1]) for prefix in prefixes], dtype=rows.dtype)
+        parents = np.stack([masks[prefix[:-1]] for prefix in prefixes])
+        for prefix, mask in zip(prefixes, parents & (rows == codes[:, None])):
+            masks[prefix] = mask
+
+    # --- suggestions: single / blimp per state, frequency for all remaining states at once ---
+    suggestions = {}
+    frequency_keys = []
+    for key in unique_keys:
+        candidate_ids = np.flatnonzero(masks[key])
+        if not key:
+            suggestions[key] = (default_opener(index), "opener")
+        elif len(candidate_ids) == 0:
+            suggestions[key] = (None, "none")
+        elif len(candidate_ids) == 1:
+            suggestions[key] = (index.words[candidate_ids[0]], "single")
+        elif strategy != "hard":
+            suggestions[key] = HELPER_STRATEGIES[strategy](CandidateSet(index, _ids_to_bits(candidate_ids.tolist(), len(index.words))))
+        elif len(candidate_ids) <= BLIMP_PARAMS["max_size"] and isBlimp([index.words[i] for i in candidate_ids]):
+            suggestions[key] = (table.guess_index.words[blimp_search_choice(table, candidate_ids)], "blimp")
+        else:
+            frequency_keys.append(key)
+    if frequency_keys:
+        choices = max_value_choice(table, np.stack([masks[key] for key in frequency_keys]))
+        for key, answer_id in zip(frequency_keys, choices):
+            suggestions[key] = (index.words[answer_id], "frequency")
+
+    results = {}
+    for key in unique_keys:
+        candidates = index.words_of(index.bits_of(index.words[i] for i in np.flatnonzero(masks[key]))) if include_candidates else None
+        results[key] = HelperResult(candidates, *suggestions[key])
+    return [results[key] for key in keys]
+
+def _history_cache_for(word_list, strategy="hard"):
+    index = get_word_index(GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+    if strategy not in HELPER_STRATEGIES:
+        raise ValueError(f"Unknown helper strategy '{strategy}'. Use one of: {', '.join(HELPER_STRATEGIES)}.")
+    cache = _history_caches.get((index, strategy))
+    if cache is None:
+        opener = _decision_tree.opener if strategy == "optimal" and _decision_tree.index is index else None
+        cache = _history_caches.setdefault((index, strategy), HistoryCache(index, opener, picker=HELPER_STRATEGIES[strategy]))
+    return cache
+
+# --- Decision Trees (a complete strategy, e.g. from the exact solver in analysis.py) ---
+
+DECISION_TREE_VERSION = 1
+
+class DecisionTree:
+    """
+    A fixed strategy stored as a tree. A node is either the word to guess when it is the only
+    candidate left, or [guess, {feedback: child node}] with 'BYG' feedback keys (the all-green
+    branch is left out). Every node is also indexed by its candidate bitset, so the tree can
+    answer helper queries and be played without replaying its history.
+    """
+
+    def __init__(self, root, word_list=None, max_guesses=6, exact=False):
+        self.index = get_word_index(GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+        self.root = root
+        self.opener = root if isinstance(root, str) else root[0]
+        self.max_guesses = max_guesses
+        self.exact = exact
+        self.picks = {}
+        self._same_store = {self.index: True}   # WordIndex -> whether it holds the tree's answers, in order
+        self.total_guesses = 0
+        self.worst_case = 0
+        solved = 0
+        stack = [(root, self.index.all_bits, 1)]
+        while stack:
+            node, bits, depth = stack.pop()
+            guess, children = (node, {}) if isinstance(node, str) else node
+            self.picks[bits] = guess
+            guess_id = self.index.word_ids.get(guess)
+            if guess_id is not None and bits >> guess_id & 1:
+                solved += 1
+                self.total_guesses += depth
+                self.worst_case = max(self.worst_case, depth)
+            for colors, child in children.items():
+                stack.append((child, bits & self.index.feedback_mask(guess, colors), depth + 1))
+        if solved != len(self.index.words):
+            raise ValueError(f"The decision tree solves {solved} of {len(self.index.words)} answers.")
+
+    def average_guesses(self):
+        return self.total_guesses / len(self.index.words)
+
+    def pick(self, candidates):   #helper strategy: the tree's guess, or the Hard strategy once play has left the tree
+        index = candidates.index
+        same_store = self._same_store.get(index)
+        if same_store is None:   # e.g. an equal store rebuilt in another process: the bitsets line up
+            same_store = self._same_store[index] = word_list_hash(index.words) == word_list_hash(self.index.words)
+        guess = self.picks.get(candidates.bits) if same_store else None
+        if guess is None:
+            return _pick_helper_guess(candidates)
+        return guess, "tree"
+
+    def play(self, answer):   #the guesses the tree makes when the answer is 'answer', ending with it
+        guesses = []
+        node = self.root
+        while True:
+            guess, children = (node, {}) if isinstance(node, str) else node
+            guesses.append(guess)
+            if guess == answer:
+                return guesses
+            node = children.get(get_guess_colors(guess, answer))
+            if node is None:
+                raise ValueError(f"'{answer}' is not solved by this decision tree.")
+
+    def save(self, path):
+        data = {
+            "version": DECISION_TREE_VERSION,
+            "answers_hash": word_list_hash(self.index.words),
+            "max_guesses": self.max_guesses,
+            "exact": self.exact,
+            "total_guesses": self.total_guesses,
+            "tree": self.root,
+        }
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+def load_decision_tree(path, word_list=None):   #reads a tree written by DecisionTree.save; the answer list must match
+    with open(path, "r") as f:
+        data = json.load(f)
+    if data.get("version") != DECISION_TREE_VERSION:
+        raise ValueError(f"Unsupported decision tree version {data.get('version')}.")
+    index = get_word_index(GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+    if data["answers_hash"] != word_list_hash(index.words):
+        raise ValueError("Decision tree was written for a different answer list.")
+    return DecisionTree(data["tree"], index, data["max_guesses"], data["exact"])
+
+_decision_tree = None
+
+def use_decision_tree(tree):
+    """Adds the helper and game strategy 'optimal', which plays from tree (None removes it again)."""
+    global _decision_tree
+    for key in [key for key in _history_caches if key[1] == "optimal"]:
+        del _history_caches[key]
+    _decision_tree = tree
+    if tree is None:
+        HELPER_STRATEGIES.pop("optimal", None)
+        GAME_STRATEGIES.pop("optimal", None)
+    else:
+        HELPER_STRATEGIES["optimal"] = tree.pick
+        GAME_STRATEGIES["optimal"] = lambda candidates, hard_mode_guesses=None: tree.pick(candidates)[0]
+
 def play_ai_helper_mode():
     try:
         _initialize_word_lists()
@@ -738,51 +2405,54 @@ def play_ai_helper_mode():
         return
         
     global available_words, permanent_answers, wordsAllowed
-    ai_available_words = permanent_answers[:]
+    strategy = input("Helper strategy (hard/expert/lookahead) [hard]: ").lower().strip() or "hard"
+    if strategy not in HELPER_STRATEGIES:
+        print(f"Unknown strategy '{strategy}', using 'hard'.")
+        strategy = "hard"
+    feedback_history = []   # (guess, word_state) pairs; the only state this mode keeps
+    move_start = time.perf_counter()
+    helper_result = suggest_for_history(feedback_history, permanent_answers, strategy)
+    ai_available_words = helper_result.candidates
     guess_history = []
 
     print("\n--- Wordle AI Helper ---")
     print("Instructions:")
     print("1. AI suggests a word.")
     print("2. Enter that word into your Wordle game.")
-    print("3. Enter the 5-letter color result back here.")
+    word_length = get_word_length()
+    print(f"3. Enter the {word_length}-letter color result back here.")
     print("   Use 'B' for Black/Gray, 'Y' for Yellow, 'G' for Green (e.g., 'BGYBB').")
 
     # --- Game Loop ---
     for turn in range(1, 7):
         print(f"\n--- Turn {turn} ---")
 
-        if turn == 1:
-            ai_guess = "salet"
-        else:
-            if not ai_available_words:
-                print("Error: No possible words left based on feedback!")
-                return
-            elif len(ai_available_words) == 1:
-                ai_guess = ai_available_words[0] 
-            elif isBlimp(ai_available_words):
-                print("(AI detected blimp condition, choosing differentiating word...)")
-                ai_guess = blimpSearch(ai_available_words)
-            else:
-                ai_guess = getMaxValue1(ai_available_words) 
+        if not ai_available_words:
+            print("Error: No possible words left based on feedback!")
+            return
+        if helper_result.strategy == "blimp":
+            print("(AI detected blimp condition, choosing differentiating word...)")
+        ai_guess = helper_result.suggestion
 
         print(f"AI suggests guessing: {ai_guess.upper()}")
+        if helper_result.strategy == "lookahead":
+            print(f"(lookahead search took {(time.perf_counter() - move_start) * 1000:.0f} ms)")
 
         color_feedback_byg = ""
         color_feedback_numeric = ""
         while True:
-            color_feedback_byg = input("Enter the 5-letter color result (B/Y/G): ").upper().strip()
-            if len(color_feedback_byg) == 5 and re.match("^[BGY]{5}$", color_feedback_byg):
+            color_feedback_byg = input(f"Enter the {word_length}-letter color result (B/Y/G): ").upper().strip()
+            if len(color_feedback_byg) == word_length and re.match("^[BGY]+$", color_feedback_byg):
                  # Convert BGY to 012 for gameFilter
                  color_feedback_numeric = color_feedback_byg.replace('B', '0').replace('Y', '1').replace('G', '2')
                  break
             else:
-                 print("Invalid input. Please enter exactly 5 letters using only B, Y, or G.")
+                 print(f"Invalid input. Please enter exactly {word_length} letters using only B, Y, or G.")
 
         emoji_feedback = format_colors_to_emoji(color_feedback_byg)
         guess_history.append(f"{ai_guess} -> {emoji_feedback}")
 
-        if color_feedback_byg == "GGGGG":
+        if color_feedback_byg == "G" * word_length:
             print(f"\nCongratulations! You found the word in {turn} turns!")
             print("History:")
             for entry in guess_history:
@@ -790,8 +2460,11 @@ def play_ai_helper_mode():
             return # End game
 
         # --- AI Filters List ---
-        # Note: This mode uses the older gameFilter logic.
-        ai_available_words = gameFilter(ai_guess, color_feedback_numeric, ai_available_words)
+        # The whole history is handed to the stateless API; shared prefixes come from its cache.
+        feedback_history.append((ai_guess, color_feedback_numeric))
+        move_start = time.perf_counter()
+        helper_result = suggest_for_history(feedback_history, permanent_answers, strategy)
+        ai_available_words = helper_result.candidates
         remaining_count = len(ai_available_words)
 
         print(f"Possible words remaining: {remaining_count}")
@@ -818,15 +2491,28 @@ def play_ai_helper_mode():
 
 # --- MODE 5: Full Simulation & Histogram ---
 
-def _solve_specific_word_for_stats(target_word, game_engine, initial_word_list):
-    available_words = initial_word_list[:]
+def _solve_specific_word_for_stats(target_word, game_engine, initial_word_list, hard_mode=False, strategy="hard", move_times=None,
+                                   move_log=None):
+    # initial_word_list may be a word list or its WordIndex; the game only narrows a bitset.
+    # strategy is a key of GAME_STRATEGIES; move_times, if given, gets the seconds spent picking each guess,
+    # and move_log gets (branch, candidates, seconds) per pick, branch being "single", "blimp" or
+    # "frequency" for Hard and the strategy's name otherwise.
+    game_engine.check_memory_budget()
+    pick_guess = game_engine.GAME_STRATEGIES[strategy]
+    available_words = game_engine.CandidateSet(game_engine.get_word_index(initial_word_list))
+    hard_mode_guesses = game_engine.HardModeGuesses() if hard_mode else None
     steps = 0
 
-    guess = "salet"
+    if strategy == "optimal":
+        guess = game_engine._decision_tree.opener
+    else:
+        guess = game_engine.default_opener(initial_word_list)
     steps = 1
     if guess == target_word:
         return steps
-    available_words = game_engine.filter_words(available_words, guess, target_word)
+    available_words.narrow_by_guess(guess, target_word)
+    if hard_mode_guesses is not None:
+        hard_mode_guesses.add(guess, game_engine.get_guess_colors(guess, target_word))
     if target_word not in available_words and len(available_words) > 0:
          pass # print(f"Warning: Target {target_word} filtered out by {guess}")
 
@@ -834,24 +2520,54 @@ def _solve_specific_word_for_stats(target_word, game_engine, initial_word_list):
         if not available_words:
              return 7 # DNF
 
+        move_start = time.perf_counter()
         if len(available_words) == 1:
-            guess = available_words[0]
-        elif game_engine.isBlimp(available_words):
-            guess = game_engine.blimpSearch(available_words)
+            guess, branch = available_words[0], "single"
+        elif strategy == "hard":
+            guess, branch = game_engine._pick_hard_game_guess(available_words, hard_mode_guesses)
         else:
-            guess = game_engine.getMaxValue1(available_words)
+            guess, branch = pick_guess(available_words, hard_mode_guesses), strategy
+        seconds = time.perf_counter() - move_start
+        if move_times is not None:
+            move_times.append(seconds)
+        if move_log is not None:
+            move_log.append((branch, len(available_words), seconds))
 
         steps += 1
         if guess == target_word:
             return steps
 
-        available_words = game_engine.filter_words(available_words, guess, target_word)
+        available_words.narrow_by_guess(guess, target_word)
+        if hard_mode_guesses is not None:
+            hard_mode_guesses.add(guess, game_engine.get_guess_colors(guess, target_word))
         if target_word not in available_words and len(available_words) > 0:
             pass # print(f"Warning: Target {target_word} filtered out by {guess}")
 
     return 7 # DNF if loop finishes
 
-def run_full_simulation_and_plot():
+def _print_latency_report(move_logs, game_seconds, words, slowest=10):   #decision latency by branch and the slowest target words
+    by_branch = collections.defaultdict(list)
+    for log in move_logs:
+        for branch, _, seconds in log:
+            by_branch[branch].append(seconds)
+    by_branch["all"] = [seconds for log in move_logs for _, _, seconds in log]
+    print("\n--- Decision Latency (ms) ---")
+    print(f"{'branch':12}{'moves':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}{'total s':>10}")
+    for branch, seconds in sorted(by_branch.items(), key=lambda item: (item[0] == "all", -sum(item[1]))):
+        latency = latency_percentiles(seconds, (50, 95, 99))
+        print(f"{branch:12}{len(seconds):>8}{latency[50]:>10.3f}{latency[95]:>10.3f}{latency[99]:>10.3f}"
+              f"{latency['max']:>10.3f}{sum(seconds):>10.2f}")
+    print(f"\n--- Slowest {slowest} Target Words ---")
+    for rank, i in enumerate(sorted(range(len(words)), key=lambda i: -game_seconds[i])[:slowest], 1):
+        sizes = " -> ".join(f"{count} ({branch})" for branch, count, _ in move_logs[i])
+        print(f"{rank:3}. {words[i]}  {game_seconds[i] * 1000:9.1f} ms  candidates per move: {sizes or '-'}")
+
+def run_full_simulation_and_plot(strategy="hard", slowest=10, profile=False):
+    # profile: write pstats and collapsed stacks of the run under PROFILE_DIR (see profile_run)
+    if profile:
+        opener = _decision_tree.opener if strategy == "optimal" and _decision_tree is not None else default_opener()
+        return profile_run(run_full_simulation_and_plot, strategy, slowest, label="mode5",
+                           metadata={"strategy": strategy, "opener": opener})[0]
     if not MATPLOTLIB_AVAILABLE:
         print("\nError: Matplotlib and/or NumPy not installed.")
         print("Please install them (e.g., 'pip install matplotlib numpy') to run the full simulation.")
@@ -864,21 +2580,32 @@ def run_full_simulation_and_plot():
         return
         
     global available_words, permanent_answers, wordsAllowed
+    if strategy == "optimal" and _decision_tree is None:
+        print("\nError: no decision tree loaded (see use_decision_tree / analysis.py exact).")
+        return
     
-    print("Starting full simulation for all words in words.txt...")
+    print(f"Starting full simulation for all words in words.txt ({strategy} strategy)...")
     print(f"This may take several minutes. ({len(permanent_answers)} words)")
 
     results = []
     dnf_words = [] 
+    move_logs = []
+    game_seconds = []
+    lookahead_stats.update(moves=0, seconds=0.0, evaluations=0, cached_moves=0)
     start_time = time.time()
     total_words = len(permanent_answers)
+    answer_index = get_word_index(permanent_answers)
 
     for i, word in enumerate(permanent_answers):
         if (i+1) % 200 == 0:
             print(f"... processed {i+1}/{total_words} words ...")
         
         # Pass 'this' module as the game_engine
-        steps = _solve_specific_word_for_stats(word, this_module, permanent_answers)
+        move_log = []
+        game_start = time.perf_counter()
+        steps = _solve_specific_word_for_stats(word, this_module, answer_index, strategy=strategy, move_log=move_log)
+        game_seconds.append(time.perf_counter() - game_start)
+        move_logs.append(move_log)
         results.append(steps)
         
         if steps == 7:
@@ -909,12 +2636,27 @@ def run_full_simulation_and_plot():
             count = np.count_nonzero(results_array == i)
             label = f"DNF (7)" if i == 7 else f"{i} Steps"
             print(f"  {label}: {count} games")
+        print(f"Worst Case (slowest answer word): {results_array.max() if results_array.max() <= 6 else 'DNF'} steps")
+        if strategy == "optimal":   # the tree's worst case is the best any host can force
+            adversarial_steps = _decision_tree.worst_case
+        else:
+            adversarial_steps = solve_adversarial(strategy, answer_index)
+        print(f"Worst Case (vs. adversarial host): {adversarial_steps if adversarial_steps <= ADVERSARIAL_MAX_TURNS else 'DNF'} steps")
+        if strategy == "lookahead":
+            print(lookahead_cost())
+        _print_latency_report(move_logs, game_seconds, permanent_answers, slowest)
+        if _stats_enabled:
+            print("\n" + format_stats())
+        if _memory_budget is not None or tracemalloc.is_tracing():
+            print("\n" + format_memory_report())
 
     # Create the histogram
     bins = np.arange(1, 9)
     plt.figure(figsize=(10, 6))
     plt.hist(results_array, bins=bins, align='left', edgecolor='black', rwidth=0.8, color='skyblue')
-    plt.title('Wordle Solver Performance (Highest Frequency Strategy)')
+    strategy_names = {"easy": "Random Strategy", "medium": "Letter Frequency Strategy", "hard": "Highest Frequency Strategy", "expert": "Expert Entropy Strategy",
+                      "lookahead": "Two-Ply Lookahead Strategy", "optimal": "Decision Tree"}
+    plt.title(f'Wordle Solver Performance ({strategy_names.get(strategy, strategy)})')
     plt.xlabel('Steps to Solve')
     plt.ylabel('Number of Games')
     tick_labels = [str(i) for i in range(1, 7)] + ['DNF (7+)']
@@ -922,4 +2664,429 @@ def run_full_simulation_and_plot():
     plt.grid(axis='y', linestyle='--', alpha=0.7)
     
     print("\nDisplaying plot...")
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+# --- MODE 6: Multi-Board (Dordle / Quordle / Octordle) ---
+
+MULTI_BOARD_NAMES = {2: "Dordle", 4: "Quordle", 8: "Octordle"}
+
+def multi_board_max_guesses(num_boards):   #Dordle 7, Quordle 9, Octordle 13
+    return num_boards + 5
+
+def pick_multi_board_guess(boards, table=None):
+    """
+    Chooses one guess for several boards at once. A board down to one word is finished first;
+    otherwise every guess is scored by the candidates it is expected to leave summed over all
+    unsolved boards (guessing a board's answer leaves 0 there), and the lowest score wins.
+    """
+    boards = [board for board in boards if len(board) > 0]
+    if not boards:
+        return default_opener()
+    for board in sorted(boards, key=len):
+        if len(board) == 1:
+            return board[0]
+
+    if not NUMPY_AVAILABLE:   # pure Python: score only the words still possible on some board
+        pool = list(dict.fromkeys(word for board in boards for word in board))
+        def expected_left(guess):
+            total = 0.0
+            for board in boards:
+                bucket_sizes = collections.Counter(get_guess_colors(guess, answer) for answer in board)
+                total += (sum(size * size for size in bucket_sizes.values()) - (guess in board)) / len(board)
+            return total
+        return min(pool, key=expected_left)
+
+    table = table or get_pattern_table(boards[0].index)
+    guess_ids = table.guess_index.word_ids
+    scores = np.zeros(len(table.guess_index.words), dtype=np.float64)
+    for board in boards:
+        candidate_ids = np.fromiter(board.ids(), dtype=np.int64)
+        solves = np.zeros(len(scores), dtype=np.float64)
+        for word in board:
+            if word in guess_ids:
+                solves[guess_ids[word]] = 1
+        scores += (partition_sizes(table, candidate_ids) - solves) / len(candidate_ids)
+    return table.guess_index.words[int(scores.argmin())]
+
+def play_multi_board(answers, word_list=None, max_guesses=None, verbose=False):
+    """
+    Plays one multi-board game against the given answers (one per board).
+    Returns the turn each board was solved on (None if it was not solved in time).
+    """
+    index = get_word_index(GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+    table = get_pattern_table(index) if NUMPY_AVAILABLE else None
+    max_guesses = max_guesses or multi_board_max_guesses(len(answers))
+    boards = [CandidateSet(index) for _ in answers]
+    solved_at = [None] * len(answers)
+
+    guess = default_opener(index)
+    for turn in range(1, max_guesses + 1):
+        row = []
+        for b, answer in enumerate(answers):
+            if solved_at[b] is not None:
+                row.append("  " * index.word_length)
+                continue
+            colors = get_guess_colors(guess, answer)
+            row.append(format_colors_to_emoji(colors))
+            if guess == answer:
+                solved_at[b] = turn
+            else:
+                boards[b].narrow_by_guess(guess, answer)
+        if verbose:
+            print(f"Guess {turn}: {guess}  " + " | ".join(row))
+        if all(turn_solved is not None for turn_solved in solved_at):
+            break
+        guess = pick_multi_board_guess([boards[b] for b in range(len(answers)) if solved_at[b] is None], table)
+    return solved_at
+
+def simulate_multi_board(num_boards=4, num_games=100, seed=None, word_list=None):
+    """Plays num_games games on randomly sampled board tuples; returns a stats dict."""
+    index = get_word_index(GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+    rng = random.Random(seed)
+    max_guesses = multi_board_max_guesses(num_boards)
+    wins = 0
+    guesses_on_win = []
+    board_turns = []
+    start_time = time.perf_counter()
+    if NUMPY_AVAILABLE:
+        get_pattern_table(index).precompute()   # every turn of every game slices this one table
+    for _ in range(num_games):
+        check_memory_budget()
+        solved_at = play_multi_board(rng.sample(index.words, num_boards), index, max_guesses)
+        board_turns += [turn for turn in solved_at if turn is not None]
+        if all(turn is not None for turn in solved_at):
+            wins += 1
+            guesses_on_win.append(max(solved_at))
+    elapsed = time.perf_counter() - start_time
+    return {"boards": num_boards, "games": num_games, "wins": wins,
+            "win_rate": wins / num_games if num_games else 0,
+            "avg_guesses_on_win": sum(guesses_on_win) / len(guesses_on_win) if guesses_on_win else 0,
+            "avg_board_turn": sum(board_turns) / len(board_turns) if board_turns else 0,
+            "seconds": elapsed, "games_per_sec": num_games / elapsed if elapsed else 0}
+
+def run_multi_board_simulation(n, num_boards=4):
+    try:
+        _initialize_word_lists()
+    except FileNotFoundError as e:
+        print(e)
+        return
+
+    name = MULTI_BOARD_NAMES.get(num_boards, f"{num_boards}-board")
+    max_guesses = multi_board_max_guesses(num_boards)
+    print(f"\n--- Starting {name} Simulation ({n} games, {max_guesses} guesses each) ---")
+    wins = 0
+    for i in range(n):
+        answers = random.sample(permanent_answers, num_boards)
+        print(f"\n--- Game {i+1} ---")
+        print(f"Target Words: {', '.join(answers)}")
+        solved_at = play_multi_board(answers, permanent_answers, max_guesses, verbose=True)
+        if all(turn is not None for turn in solved_at):
+            wins += 1
+            print(f"All boards solved in {max(solved_at)} guesses!")
+        else:
+            missed = [answer for answer, turn in zip(answers, solved_at) if turn is None]
+            print(f"Failed to solve: {', '.join(missed)}")
+
+    print("\n--- Overall Results ---")
+    print(f"Games Won: {wins}/{n} ({wins / n * 100 if n else 0:.2f}%)")
+
+
+# --- MODE 7: Adversarial (Absurdle-style) Host ---
+
+ADVERSARIAL_MAX_TURNS = 20   # safety cap for AI games; a real Absurdle game has no turn limit
+
+def adversarial_bucket(guess, candidates):
+    """
+    The host's reply to guess: splits the remaining candidates (a CandidateSet) by feedback
+    pattern and keeps the biggest bucket, ties going to the lowest code (the most gray).
+    Returns (colors, bits of the kept bucket).
+    """
+    index = candidates.index
+    if len(candidates) == 0:
+        raise ValueError("The host has no candidates left.")
+    if NUMPY_AVAILABLE:
+        table = get_pattern_table(index)
+        guess_id = table.guess_index.word_ids.get(guess)
+        if guess_id is None:
+            raise ValueError(f"'{guess}' is not in the list of allowed words.")
+        candidate_ids = np.fromiter(candidates.ids(), dtype=np.int64)
+        codes = table.row(guess_id)[candidate_ids]
+        code = int(np.bincount(codes, minlength=3 ** index.word_length).argmax())
+        kept = candidate_ids[codes == code]
+        return code_to_feedback(code, index.word_length).translate(_STATE_TO_COLORS), _ids_to_bits(kept.tolist(), len(index.words))
+
+    buckets = {}
+    for word_id, word in zip(candidates.ids(), candidates):
+        buckets.setdefault(get_feedback_code(guess, word), []).append(word_id)
+    code = max(buckets, key=lambda code: (len(buckets[code]), -code))
+    return code_to_feedback(code, index.word_length).translate(_STATE_TO_COLORS), _ids_to_bits(buckets[code], len(index.words))
+
+_STATE_TO_COLORS = str.maketrans("012", "BYG")
+
+class AdversarialHost:
+    """A host with no fixed target: every reply keeps as many candidates alive as possible."""
+
+    def __init__(self, word_list=None):
+        self.candidates = CandidateSet(get_word_index(GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list))
+        self.history = []   # (guess, colors)
+
+    def respond(self, guess):
+        colors, bits = adversarial_bucket(guess, self.candidates)
+        self.candidates.bits = bits
+        self.history.append((guess, colors))
+        return colors
+
+    def solved(self):
+        return bool(self.history) and self.history[-1][1] == "G" * self.candidates.index.word_length
+
+ADVERSARIAL_STRATEGIES = {
+    "easy": lambda candidates: get_random_guess(candidates),
+    "medium": lambda candidates: get_medium_guess(candidates),
+    "hard": lambda candidates: _pick_helper_guess(candidates)[0],
+    "expert": lambda candidates: _pick_expert_guess(candidates)[0],
+    "lookahead": lambda candidates: _pick_lookahead_guess(candidates)[0],
+}
+
+def solve_adversarial(difficulty="hard", word_list=None, verbose=False):
+    """Plays an AI strategy against the adversarial host. Returns the steps it needed (worst case)."""
+    host = AdversarialHost(word_list)
+    strategy = ADVERSARIAL_STRATEGIES[difficulty]
+    ai_candidates = host.candidates.copy()
+    guess = default_opener(host.candidates.index)
+    for steps in range(1, ADVERSARIAL_MAX_TURNS + 1):
+        colors = host.respond(guess)
+        if verbose:
+            print(f"Guess {steps}: {guess} -> {format_colors_to_emoji(colors)}  ({len(host.candidates)} words left)")
+        if host.solved():
+            return steps
+        ai_candidates.narrow(FeedbackConstraint.from_feedback(guess, colors))
+        guess = strategy(ai_candidates)
+    return ADVERSARIAL_MAX_TURNS + 1
+
+def play_adversarial_mode():
+    try:
+        _initialize_word_lists()
+    except FileNotFoundError as e:
+        print(e)
+        return
+
+    host = AdversarialHost(permanent_answers)
+    word_length = get_word_length()
+    allowed_words = get_guess_index().word_ids   # every allowed word and answer, without another set of them
+    print("\n--- Adversarial Wordle (Absurdle) ---")
+    print("There is no fixed answer: after every guess the host picks the feedback")
+    print("that keeps the most words possible. Pin it down to one word to win.")
+
+    turn = 0
+    while not host.solved():
+        turn += 1
+        while True:
+            guess = input(f"Your guess ({turn}): ").lower().strip()
+            if len(guess) != word_length:
+                print(f"Guess must be {word_length} letters long.")
+            elif guess not in allowed_words:
+                print(f"'{guess}' is not in the list of allowed words.")
+            else:
+                break
+        colors = host.respond(guess)
+        print(f"Result: {format_colors_to_emoji(colors)}  ({len(host.candidates)} words still possible)")
+
+    print(f"\nYou beat the adversarial host in {turn} guesses!")
+    print(f"For comparison, the Hard AI needs {solve_adversarial('hard', permanent_answers)} guesses.")
+
+def run_adversarial_simulation():
+    try:
+        _initialize_word_lists()
+    except FileNotFoundError as e:
+        print(e)
+        return
+
+    print("\n--- AI vs. Adversarial Host (worst case) ---")
+    for difficulty in ADVERSARIAL_STRATEGIES:
+        print(f"\n{difficulty.capitalize()} strategy:")
+        steps = solve_adversarial(difficulty, permanent_answers, verbose=True)
+        print(f"Worst-case steps ({difficulty}): {steps if steps <= ADVERSARIAL_MAX_TURNS else 'DNF'}")
+
+
+# --- Reverse Solver (shared emoji grids) ---
+
+# share grids use ⬛ (dark theme) or ⬜ (light theme) for gray; high-contrast mode uses 🟧 for green and 🟦 for yellow
+_EMOJI_TO_COLORS = {GRAY: "B", "⬜": "B", YELLOW: "Y", "🟦": "Y", GREEN: "G", "🟧": "G"}
+
+ReverseSolution = collections.namedtuple("ReverseSolution", ["answers", "row_guesses", "grids", "consistent_grids", "skipped_grids"])
+
+def parse_share_grid(text):   #emoji rows of one share grid as 'BYG' strings; header and other lines are skipped
+    rows = []
+    for line in text.splitlines():
+        tiles = "".join(line.split()).replace("\ufe0f", "")   # some platforms add emoji variation selectors
+        if tiles and all(char in _EMOJI_TO_COLORS for char in tiles):
+            rows.append("".join(_EMOJI_TO_COLORS[char] for char in tiles))
+    return rows
+
+def split_shares(text):   #splits a paste of many shares into grids (runs of consecutive emoji rows)
+    grids = []
+    current = []
+    for line in text.splitlines():
+        row = parse_share_grid(line)
+        if row:
+            current.append(row[0])
+        elif current:
+            grids.append(current)
+            current = []
+    if current:
+        grids.append(current)
+    return grids
+
+class ReverseIndex:
+    """
+    Inverse index from feedback patterns to answers: pattern_bits[code] is the bitset of
+    answers that at least one allowed guess colors with that pattern. A grid's possible
+    answers are the AND of its rows' bitsets, so a whole day of shares costs a few big-int
+    ANDs per distinct row pattern. pattern_counts[answer][code] (how many guesses give the
+    pattern) ranks the consistent answers by how likely they make the observed rows.
+    """
+
+    def __init__(self, answer_index=None, guess_index=None):
+        self.table = get_pattern_table(answer_index, guess_index)
+        self.answer_index = self.table.answer_index
+        self.word_length = self.answer_index.word_length
+        pattern_count = 3 ** self.word_length
+        size = len(self.answer_index.words)
+        if NUMPY_AVAILABLE:
+            guesses = self.table.guess_index.words
+            matrix = self.table.matrix if self.table.precompute() else None   # else each block is computed and dropped
+            offsets = np.arange(size, dtype=np.int64)[None, :] * pattern_count
+            counts = np.zeros(size * pattern_count, dtype=np.int64)
+            for start in range(0, len(guesses), _PATTERN_CHUNK_ROWS):
+                if matrix is not None:
+                    block = matrix[start:start + _PATTERN_CHUNK_ROWS]
+                else:
+                    block = feedback_code_matrix(guesses[start:start + _PATTERN_CHUNK_ROWS], self.answer_index.words, self.word_length)
+                block = block.astype(np.int64) + offsets
+                counts += np.bincount(block.ravel(), minlength=size * pattern_count)
+            self.pattern_counts = counts.reshape(size, pattern_count)
+            self.pattern_bits = [_ids_to_bits(np.flatnonzero(column).tolist(), size) for column in self.pattern_counts.T]
+        else:
+            self.pattern_counts = [collections.Counter(get_feedback_code(guess, answer) for guess in self.table.guess_index.words)
+                                   for answer in self.answer_index.words]
+            ids = [[] for _ in range(pattern_count)]
+            for answer_id, counts in enumerate(self.pattern_counts):
+                for code in counts:
+                    ids[code].append(answer_id)
+            self.pattern_bits = [_ids_to_bits(answer_ids, size) for answer_ids in ids]
+        self._grid_bits = {}
+
+    def grid_bits(self, rows):   #answers consistent with every row of one grid
+        key = tuple(rows)
+        bits = self._grid_bits.get(key)
+        if bits is None:
+            bits = self.answer_index.all_bits
+            for colors in set(key):
+                if len(colors) != self.word_length:
+                    raise ValueError(f"Grid row '{colors}' is not {self.word_length} tiles wide.")
+                bits &= self.pattern_bits[feedback_to_code(colors)]
+            self._grid_bits[key] = bits
+        return bits
+
+    def guesses_for_row(self, colors, answers):   #allowed guesses that give 'colors' against any of the answers
+        code = feedback_to_code(colors)
+        guess_words = self.table.guess_index.words
+        answer_ids = [self.answer_index.word_ids[answer] for answer in answers]
+        if NUMPY_AVAILABLE:
+            hits = (self.table.columns(answer_ids) == code).any(axis=1)
+            return [guess_words[guess_id] for guess_id in np.flatnonzero(hits)]
+        answers = [self.answer_index.words[answer_id] for answer_id in answer_ids]
+        return [guess for guess in guess_words if any(get_feedback_code(guess, answer) == code for answer in answers)]
+
+    def rank(self, answer_ids, row_counts):   #answer ids, most likely first, for rows seen row_counts[code] times
+        codes = list(row_counts)
+        if NUMPY_AVAILABLE:
+            answer_ids = np.asarray(answer_ids, dtype=np.int64)
+            log_counts = np.log(self.pattern_counts[np.ix_(answer_ids, codes)].astype(np.float64))
+            scores = log_counts @ np.array([row_counts[code] for code in codes], dtype=np.float64)
+            return answer_ids[np.argsort(-scores, kind="stable")].tolist()
+        scores = {answer_id: sum(count * math.log(self.pattern_counts[answer_id][code]) for code, count in row_counts.items())
+                  for answer_id in answer_ids}
+        return sorted(answer_ids, key=lambda answer_id: -scores[answer_id])
+
+    def solve(self, grids, list_guesses=True):
+        """
+        Intersects a batch of grids (each a list of 'BYG' rows) to find the answers consistent
+        with all of them, most likely first (the one under which random guesses would produce
+        the observed rows most often). If some grids contradict the rest (another day's puzzle,
+        typos), the answers consistent with the most grids are returned instead. row_guesses
+        maps every distinct row pattern to the guesses that produce it for the top answer.
+        Empty grids and grids with a row that is not word_length tiles wide (a garbled paste)
+        are left out and returned in skipped_grids.
+        """
+        skipped = [grid for grid in grids if not grid or any(len(colors) != self.word_length for colors in grid)]
+        grids = [grid for grid in grids if grid and not any(len(colors) != self.word_length for colors in grid)]
+        grid_bits = collections.Counter(self.grid_bits(grid) for grid in grids)
+        bits = self.answer_index.all_bits
+        for grid_mask in grid_bits:
+            bits &= grid_mask
+        consistent = len(grids)
+        if not bits and grids:   # vote: count, per answer, the grids it satisfies
+            votes = collections.Counter()
+            for grid_mask, count in grid_bits.items():
+                for answer_id in self.answer_index.ids(grid_mask):
+                    votes[answer_id] += count
+            consistent = max(votes.values(), default=0)
+            bits = _ids_to_bits([answer_id for answer_id, count in votes.items() if count == consistent],
+                                len(self.answer_index.words))
+        solved = "G" * self.word_length
+        row_counts = collections.Counter(feedback_to_code(colors) for grid in grids for colors in grid if colors != solved)
+        answers = [self.answer_index.words[answer_id] for answer_id in self.rank(list(self.answer_index.ids(bits)), row_counts)]
+        row_guesses = {}
+        if list_guesses and answers:
+            for colors in {colors for grid in grids for colors in grid}:
+                row_guesses[colors] = self.guesses_for_row(colors, answers[:1])
+        return ReverseSolution(answers, row_guesses, len(grids), consistent, skipped)
+
+_reverse_indexes = {}
+
+def get_reverse_index(word_list=None):
+    index = get_word_index(GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+    reverse_index = _reverse_indexes.get(index)
+    if reverse_index is None:
+        reverse_index = _reverse_indexes.setdefault(index, ReverseIndex(index))
+    return reverse_index
+
+def reverse_solve(shares, word_list=None, list_guesses=True):
+    """
+    Reverse solver entry point. shares is pasted text holding any number of share grids,
+    or a list of grids (each pasted text or a list of 'BYG' rows). Returns a ReverseSolution.
+    """
+    if isinstance(shares, str):
+        grids = split_shares(shares)
+    else:
+        grids = [parse_share_grid(grid) if isinstance(grid, str) else list(grid) for grid in shares]
+    return get_reverse_index(word_list).solve(grids, list_guesses)
+
+def run_reverse_solver(shares):
+    try:
+        _initialize_word_lists()
+    except FileNotFoundError as e:
+        print(e)
+        return
+
+    solution = reverse_solve(shares, permanent_answers)
+    print(f"\n--- Reverse Solver ({solution.grids} grids) ---")
+    if solution.skipped_grids:
+        print(f"Skipped {len(solution.skipped_grids)} malformed grid(s), e.g. {solution.skipped_grids[0]}.")
+    if solution.consistent_grids < solution.grids:
+        print(f"Grids disagree: best answers fit {solution.consistent_grids} of {solution.grids} grids.")
+    if not solution.answers:
+        print("No answer is consistent with these grids.")
+        return
+    print(f"Possible answers ({len(solution.answers)}, most likely first): {', '.join(solution.answers[:20])}")
+    print(f"Guesses that could have produced each row, if the answer is '{solution.answers[0]}':")
+    for colors, guesses in sorted(solution.row_guesses.items(), key=lambda item: len(item[1])):
+        shown = ", ".join(guesses[:10]) + (f", ... ({len(guesses)} total)" if len(guesses) > 10 else "")
+        print(f"  {format_colors_to_emoji(colors)}: {shown}")
+
+if os.environ.get("WORDLE_STATS", "").strip() not in ("", "0"):   # e.g. WORDLE_STATS=1 python main.py
+    enable_stats()
+
+if os.environ.get("WORDLE_MEMORY_BUDGET", "").strip():   # e.g. WORDLE_MEMORY_BUDGET=64MB python server.py
+    set_memory_budget(os.environ["WORDLE_MEMORY_BUDGET"])
@@ -0,0 +1,292 @@
+import asyncio
+import argparse
+import json
+import os
+import concurrent.futures
+
+import main as gameEngine
+import sessions
+
+# Local suggestion server for the Mode 4 helper.
+# Standard library only: asyncio streams + a minimal HTTP/1.1 parser, JSON in and out.
+#
+#   POST /suggest   {"history": [["salet", "BBYGB"], ...], "limit": 20, "strategy": "hard" | "expert"}
+#   POST /filter    {"history": [...], "limit": 20}
+#   POST /validate  {"guess": "crane", "feedback": "BYGBB"}
+#   POST /session/new       {"opener": "salet"}
+#   POST /session/feedback  {"session": "<id>", "guess": "salet", "feedback": "BBYGB"}
+#   POST /session/end       {"session": "<id>"}
+#   GET  /stats
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+DEFAULT_CANDIDATE_LIMIT = 100
+MAX_BODY_BYTES = 64 * 1024
+SESSION_EVICTION_INTERVAL = 60   # seconds between idle-session sweeps
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class SuggestionServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS,
+                 session_store=None, session_file=None):
+        self.host = host
+        self.port = port
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self.in_flight = {}   # request key -> future shared by identical concurrent requests
+        self.server = None
+        self.request_count = 0
+        self.coalesced_count = 0
+
+        gameEngine._initialize_word_lists()
+        self.answer_index = gameEngine.get_word_index(gameEngine.permanent_answers)
+        self.allowed_words = gameEngine.get_guess_index().word_ids
+        self.word_length = self.answer_index.word_length
+        self.sessions = session_store if session_store is not None else sessions.SessionStore(self.answer_index)   # an empty store is falsy
+        self.session_file = session_file
+        self.eviction_task = None
+
+    async def start(self):
+        if self.session_file and os.path.exists(self.session_file):
+            restored = self.sessions.restore(self.session_file)
+            print(f"Restored {restored} helper sessions from {self.session_file}")
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.eviction_task = asyncio.create_task(self.evict_sessions_periodically())
+        return self
+
+    async def evict_sessions_periodically(self):
+        while True:
+            await asyncio.sleep(SESSION_EVICTION_INTERVAL)
+            self.sessions.evict_idle()
+            gameEngine.enforce_memory_budget()   # no-op unless a budget is set
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        print(f"Wordle helper server listening on http://{self.host}:{self.port}")
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self.eviction_task is not None:
+            self.eviction_task.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.session_file:
+            self.sessions.snapshot(self.session_file)
+        self.executor.shutdown(wait=False)
+
+    # --- HTTP handling ---
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.write_response(writer, 400, {"error": "Malformed request line."}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    await self.write_response(writer, 400, {"error": "Invalid Content-Length."}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.write_response(writer, 413, {"error": "Request body too large."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.route(method, path.split("?", 1)[0], body)
+                await self.write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass   # client went away or the server is shutting down
+        finally:
+            writer.close()
+
+    async def write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def route(self, method, path, body):
+        self.request_count += 1
+        routes = {"/suggest": self.handle_suggest, "/filter": self.handle_filter,
+                  "/validate": self.handle_validate, "/stats": self.handle_stats,
+                  "/session/new": self.handle_session_new, "/session/feedback": self.handle_session_feedback,
+                  "/session/end": self.handle_session_end}
+        handler = routes.get(path)
+        if handler is None:
+            return 404, {"error": f"Unknown endpoint '{path}'."}
+        if (path == "/stats") != (method == "GET") or method not in ("GET", "POST"):
+            return 405, {"error": f"{method} is not allowed on {path}."}
+        try:
+            request = json.loads(body) if body else {}
+            if not isinstance(request, dict):
+                raise ValueError("Request body must be a JSON object.")
+            return 200, await handler(request)
+        except KeyError as e:   # unknown or expired session
+            return 404, {"error": e.args[0] if e.args else "Not found."}
+        except ValueError as e:   # also covers json.JSONDecodeError
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"An error occurred: {e}"}
+
+    # --- Endpoints ---
+
+    async def handle_suggest(self, request):
+        history = parse_history(request.get("history", []), self.word_length)
+        strategy = request.get("strategy", "hard")
+        if strategy not in gameEngine.HELPER_STRATEGIES:
+            raise ValueError(f"'strategy' must be one of: {', '.join(gameEngine.HELPER_STRATEGIES)}.")
+        result = await self.run_coalesced(("suggest", history, strategy), gameEngine.suggest_for_history,
+                                          history, self.answer_index, strategy)
+        limit = parse_limit(request)
+        return {"suggestion": result.suggestion, "strategy": result.strategy,
+                "count": len(result.candidates), "candidates": result.candidates[:limit]}
+
+    async def handle_filter(self, request):
+        history = parse_history(request.get("history", []), self.word_length)
+        candidates = await self.run_coalesced(("filter", history), gameEngine.candidates_for_history,
+                                              history, self.answer_index)
+        return {"count": len(candidates), "candidates": candidates[:parse_limit(request)]}
+
+    async def handle_validate(self, request):
+        guess = request.get("guess")
+        feedback = request.get("feedback")
+        if not isinstance(guess, str):
+            raise ValueError("'guess' must be a string.")
+        guess = guess.lower().strip()
+        if len(guess) != self.word_length:
+            return {"valid": False, "error": f"Guess must be {self.word_length} letters long."}
+        if guess not in self.allowed_words:
+            return {"valid": False, "error": f"'{guess}' is not in the list of allowed words."}
+        if feedback is not None:
+            if not isinstance(feedback, str):
+                raise ValueError("'feedback' must be a string.")
+            try:
+                gameEngine.FeedbackConstraint.from_feedback(guess, feedback.upper().strip())
+            except ValueError as e:
+                return {"valid": False, "error": str(e)}
+        return {"valid": True}
+
+    async def handle_session_new(self, request):
+        opener = request.get("opener")
+        if opener is not None and not isinstance(opener, str):
+            raise ValueError("'opener' must be a string.")
+        session_id = self.sessions.create(opener.lower().strip() if opener else None)
+        return {"session": str(session_id), "suggestion": self.sessions.opener_of(session_id),
+                "strategy": "opener", "count": len(self.answer_index.words)}
+
+    async def handle_session_feedback(self, request):
+        session_id = parse_session_id(request)
+        (guess, word_state), = parse_history([[request.get("guess"), request.get("feedback")]], self.word_length)
+        result = await asyncio.get_running_loop().run_in_executor(
+            self.executor, self.sessions.add_feedback, session_id, guess, word_state)
+        return {"session": str(session_id), "suggestion": result.suggestion, "strategy": result.strategy,
+                "count": len(result.candidates), "candidates": result.candidates[:parse_limit(request)]}
+
+    async def handle_session_end(self, request):
+        return {"ended": self.sessions.end(parse_session_id(request))}
+
+    async def handle_stats(self, request):
+        cache = gameEngine._history_caches.get((self.answer_index, "hard"))
+        engine_memory = await asyncio.get_running_loop().run_in_executor(self.executor, gameEngine.memory_usage)
+        return {"requests": self.request_count, "coalesced": self.coalesced_count,
+                "in_flight": len(self.in_flight),
+                "sessions": len(self.sessions), "session_memory_bytes": self.sessions.memory_usage(),
+                "engine_memory_bytes": engine_memory,
+                "cache_nodes": cache.node_count if cache else 0,
+                "cache_hits": cache.hits if cache else 0,
+                "cache_misses": cache.misses if cache else 0}
+
+    async def run_coalesced(self, key, function, *args):
+        """Runs function(*args) in the executor; identical requests already in flight share its result."""
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.coalesced_count += 1
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda done: self.in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+
+def parse_history(raw_history, word_length=5):   #validates a JSON history and returns it as a hashable tuple of (guess, word_state)
+    if not isinstance(raw_history, list):
+        raise ValueError("'history' must be a list of [guess, feedback] pairs.")
+    history = []
+    for entry in raw_history:
+        if not (isinstance(entry, (list, tuple)) and len(entry) == 2
+                and isinstance(entry[0], str) and isinstance(entry[1], str)):
+            raise ValueError("Each history entry must be a [guess, feedback] pair of strings.")
+        guess = entry[0].lower().strip()
+        word_state = gameEngine.normalize_feedback(entry[1].upper().strip())
+        if len(guess) != word_length or len(word_state) != word_length or any(state not in "012" for state in word_state):
+            raise ValueError(f"Invalid history entry {entry}: use a {word_length}-letter guess and B/Y/G or 0/1/2 feedback.")
+        history.append((guess, word_state))
+    return tuple(history)
+
+def parse_session_id(request):
+    try:
+        return int(request.get("session"))
+    except (TypeError, ValueError):
+        raise ValueError("'session' must be a session id returned by /session/new.")
+
+def parse_limit(request):
+    limit = request.get("limit", DEFAULT_CANDIDATE_LIMIT)
+    if not isinstance(limit, int) or limit < 0:
+        raise ValueError("'limit' must be a non-negative integer.")
+    return limit
+
+
+def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS,
+               session_file=None, session_budget_mb=4, session_idle_minutes=30, memory_budget_mb=None):
+    if memory_budget_mb is not None:
+        gameEngine.set_memory_budget(int(memory_budget_mb * 1024 * 1024))
+    session_store = sessions.SessionStore(memory_budget=int(session_budget_mb * 1024 * 1024),
+                                          idle_timeout=session_idle_minutes * 60)
+    server = SuggestionServer(host, port, workers, session_store, session_file)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local JSON suggestion server for the Wordle AI helper.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="executor threads for searches")
+    parser.add_argument("--session-file", help="snapshot sessions here on shutdown and restore them on start")
+    parser.add_argument("--session-budget-mb", type=float, default=4, help="memory budget for helper sessions")
+    parser.add_argument("--session-idle-minutes", type=float, default=30, help="evict sessions idle this long")
+    parser.add_argument("--memory-budget-mb", type=float, help="memory budget for the engine's tables and caches (sessions included)")
+    args = parser.parse_args()
+    run_server(args.host, args.port, args.workers, args.session_file, args.session_budget_mb, args.session_idle_minutes,
+               args.memory_budget_mb)
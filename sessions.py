@@ -0,0 +1,228 @@
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+
+import main as gameEngine
+
+# Compact session store for many concurrent helper games.
+# A session is only an opener id, its feedback history packed into bytes
+# (3 bytes per turn for standard Wordle: 2 for the guess id, 1 for the feedback
+# code; more for large dictionaries or long words) and, when
+# there is room, the cached candidate bitset. Candidates and suggestions are
+# recomputed from the history through the shared stateless helper API.
+
+SNAPSHOT_VERSION = 1
+DEFAULT_IDLE_TIMEOUT = 30 * 60         # seconds
+DEFAULT_MEMORY_BUDGET = 4 * 1024 * 1024  # bytes
+_DICT_ENTRY_BYTES = 100                # rough per-entry overhead of the session dict
+
+
+class Session:
+    __slots__ = ("opener_id", "history", "last_used", "bits")
+
+    def __init__(self, opener_id, history=b"", last_used=0.0, bits=None):
+        self.opener_id = opener_id
+        self.history = history
+        self.last_used = last_used
+        self.bits = bits
+
+    def size(self):
+        size = sys.getsizeof(self) + sys.getsizeof(self.history) + sys.getsizeof(self.last_used)
+        if self.bits is not None:
+            size += sys.getsizeof(self.bits)
+        return size
+
+
+class SessionStore:
+    """
+    Holds helper sessions as tiny records keyed by random integer ids, with idle-session
+    eviction, a memory budget and snapshot/restore to disk.
+    """
+
+    def __init__(self, word_list=None, opener=None, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 memory_budget=DEFAULT_MEMORY_BUDGET, keep_bits=True):
+        self.answer_index = gameEngine.get_word_index(gameEngine.GLOBAL_PERMANENT_ANSWERS if word_list is None else word_list)
+        self.guess_index = gameEngine.get_guess_index()
+        self.word_length = self.answer_index.word_length
+        self.id_bytes = max(2, (len(self.guess_index.words).bit_length() + 7) // 8)
+        self.code_bytes = ((3 ** self.word_length - 1).bit_length() + 7) // 8
+        self._opener = opener   # None: follow gameEngine.default_opener, even after set_opener()
+        self.idle_timeout = idle_timeout
+        self.memory_budget = memory_budget
+        self.keep_bits = keep_bits
+        self.sessions = {}
+        self.evicted_count = 0
+        self._memory = 0
+        self._lock = threading.RLock()
+        gameEngine.register_session_store(self)   # counted in the engine's memory report
+
+    @property
+    def opener(self):
+        return self._opener or gameEngine.default_opener(self.answer_index)
+
+    # --- Session lifecycle ---
+
+    def create(self, opener=None):
+        opener = opener or self.opener
+        if opener not in self.guess_index.word_ids:
+            raise ValueError(f"'{opener}' is not in the list of allowed words.")
+        with self._lock:
+            session_id = secrets.randbits(48)
+            while session_id in self.sessions:
+                session_id = secrets.randbits(48)
+            session = Session(self.guess_index.word_ids[opener], b"", time.monotonic())
+            self.sessions[session_id] = session
+            self._memory += session.size() + _DICT_ENTRY_BYTES
+            self.enforce_budget(keep=session_id)
+            return session_id
+
+    def end(self, session_id):
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+            if session is not None:
+                self._memory -= session.size() + _DICT_ENTRY_BYTES
+            return session is not None
+
+    def _get(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"Unknown or expired session {session_id}.")
+        session.last_used = time.monotonic()
+        return session
+
+    def add_feedback(self, session_id, guess, feedback):
+        """Records one turn and returns the updated HelperResult."""
+        guess_id = self.guess_index.word_ids.get(guess)
+        if guess_id is None:
+            raise ValueError(f"'{guess}' is not in the list of allowed words.")
+        word_state = gameEngine.normalize_feedback(feedback)
+        gameEngine.FeedbackConstraint.from_feedback(guess, word_state)   # validates the feedback
+        code = gameEngine.feedback_to_code(word_state)
+        with self._lock:
+            session = self._get(session_id)
+            old_size = session.size()
+            session.history += guess_id.to_bytes(self.id_bytes, "big") + code.to_bytes(self.code_bytes, "big")
+            if session.bits is not None:
+                session.bits &= self.answer_index.feedback_mask(guess, word_state)
+            self._memory += session.size() - old_size
+        return self.suggest(session_id)
+
+    def history(self, session_id):
+        with self._lock:
+            packed = self._get(session_id).history
+        words = self.guess_index.words
+        id_bytes, turn_bytes = self.id_bytes, self.id_bytes + self.code_bytes
+        return [(words[int.from_bytes(packed[i:i + id_bytes], "big")],
+                 gameEngine.code_to_feedback(int.from_bytes(packed[i + id_bytes:i + turn_bytes], "big"), self.word_length))
+                for i in range(0, len(packed), turn_bytes)]
+
+    def opener_of(self, session_id):
+        with self._lock:
+            return self.guess_index.words[self._get(session_id).opener_id]
+
+    def suggest(self, session_id):
+        history = self.history(session_id)
+        if not history:
+            result = gameEngine.HelperResult(list(self.answer_index.words), self.opener_of(session_id), "opener")
+        else:
+            result = gameEngine.suggest_for_history(history, self.answer_index)
+        if self.keep_bits:
+            with self._lock:
+                session = self.sessions.get(session_id)
+                if session is not None and session.bits is None:
+                    old_size = session.size()
+                    session.bits = self.answer_index.bits_of(result.candidates)
+                    self._memory += session.size() - old_size
+                    self.enforce_budget(keep=session_id)
+        return result
+
+    def candidate_count(self, session_id):
+        with self._lock:
+            session = self._get(session_id)
+            if session.bits is not None:
+                return session.bits.bit_count()
+        return len(gameEngine.candidates_for_history(self.history(session_id), self.answer_index))
+
+    # --- Eviction and memory budget ---
+
+    def evict_idle(self, now=None):
+        """Drops every session unused for idle_timeout seconds. Returns how many were dropped."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [session_id for session_id, session in self.sessions.items()
+                       if now - session.last_used > self.idle_timeout]
+            for session_id in expired:
+                self.end(session_id)
+            self.evicted_count += len(expired)
+            return len(expired)
+
+    def memory_usage(self):
+        return self._memory + sys.getsizeof(self.sessions)
+
+    def enforce_budget(self, keep=None):
+        """
+        Frees cached bitsets, then evicts sessions, least recently used first, until under budget.
+        Both stop at 90% of the budget, so the next few requests do not trigger another sweep.
+        The session `keep` (the one being served) is left alone, even if that leaves the store over budget.
+        """
+        with self._lock:
+            if self.memory_budget is None or self.memory_usage() <= self.memory_budget:
+                return
+            by_age = sorted((session_id for session_id in self.sessions if session_id != keep),
+                            key=lambda key: self.sessions[key].last_used)
+            for session_id in by_age:
+                if self.memory_usage() <= self.memory_budget * 0.9:
+                    return
+                session = self.sessions[session_id]
+                if session.bits is not None:
+                    self._memory -= sys.getsizeof(session.bits)
+                    session.bits = None
+            for session_id in by_age:
+                if self.memory_usage() <= self.memory_budget * 0.9:
+                    break
+                self.end(session_id)
+                self.evicted_count += 1
+
+    def __len__(self):
+        return len(self.sessions)
+
+    # --- Snapshot / restore ---
+
+    def snapshot(self, path):
+        """Writes every session to path (JSON, atomically). Cached bitsets are not saved."""
+        now = time.monotonic()
+        with self._lock:
+            data = {
+                "version": SNAPSHOT_VERSION,
+                "answers_hash": gameEngine.word_list_hash(self.answer_index.words),
+                "guesses_hash": gameEngine.word_list_hash(self.guess_index.words),
+                "sessions": {str(session_id): [session.opener_id, session.history.hex(), round(now - session.last_used, 1)]
+                             for session_id, session in self.sessions.items()},
+            }
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+        return len(data["sessions"])
+
+    def restore(self, path):
+        """Loads sessions saved by snapshot(); raises ValueError if the word lists changed since."""
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported session snapshot version {data.get('version')}.")
+        if (data["answers_hash"] != gameEngine.word_list_hash(self.answer_index.words)
+                or data["guesses_hash"] != gameEngine.word_list_hash(self.guess_index.words)):
+            raise ValueError("Session snapshot was written for different word lists.")
+        now = time.monotonic()
+        with self._lock:
+            for session_id, (opener_id, history_hex, idle_seconds) in data["sessions"].items():
+                session = Session(opener_id, bytes.fromhex(history_hex), now - idle_seconds)
+                self.end(int(session_id))
+                self.sessions[int(session_id)] = session
+                self._memory += session.size() + _DICT_ENTRY_BYTES
+            self.enforce_budget()
+        return len(data["sessions"])
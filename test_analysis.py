@@ -0,0 +1,17 @@
+import analysis
+import main as gameEngine
+
+
+def _fresh_sweep(opener, answers, strategy):
+    analysis._follow_up_guesses.clear()
+    return analysis._sweep_opener(opener, answers, strategy)
+
+
+def test_sweeps_of_two_answer_lists_in_one_process():
+    answers = gameEngine.GLOBAL_PERMANENT_ANSWERS
+    first, second = answers[:300], answers[300:600]   # the same bit positions name different words
+    expected = _fresh_sweep("salet", second, "hard")
+
+    analysis._follow_up_guesses.clear()
+    analysis._sweep_opener("salet", first, "hard")
+    assert analysis._sweep_opener("salet", second, "hard") == expected